@@ -1,70 +1,128 @@
+import time
 import tkinter as tk
+from collections import OrderedDict
 from tkinter import messagebox
-import ttkbootstrap as ttkb
-import pandas as pd
-import sympy as sp
-import numpy as np
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from perezoso import import_all
+from cache_resultados import lookup, result_key, store
+from expresiones import compile_expression, normalize_equation
+from grafica import PlotController, sample_function
+from metodos import scan_sign_changes
+from historial import History
+from tabla_virtual import VirtualTable
+from tareas import BackgroundTask
+
+# La ventana se crea en crear_interfaz() (no al importar): así `biseccion` se
+# puede usar sin pantalla. sympy y matplotlib se cargan en segundo plano.
+MODULOS_PRECARGA = ('numpy', 'sympy', 'matplotlib.figure', 'matplotlib.backends.backend_tkagg')
 
 # --- búsqueda automática de intervalo con cambio de signo ---
 _interval_after_id = None
-
-def find_sign_change_interval(expr_str, samples=400):
+# intervalos ya detectados por ecuación normalizada: volver a escribir o
+# deshacer muestra el resultado al instante
+_intervalos_cache = OrderedDict()
+INTERVALOS_CACHE_MAX = 128
+# costo medido de una detección (segundos, promedio móvil): decide cuánto
+# esperar después de la última tecla
+_costo_deteccion = 0.05
+# texto de la última detección programada o en curso
+_texto_pendiente = None
+# tareas en segundo plano en curso (detección de intervalo y cálculo)
+_tarea_intervalo = None
+_tarea_calculo = None
+
+def find_sign_change_interval(expr_str, samples=400, check=None):
     """
     Intento robusto de encontrar un subintervalo [a,b] donde f(a)*f(b) < 0.
     Prueba rangos crecientes por defecto: (-1,1), (-10,10), (-100,100), (-1000,1000).
     Devuelve la primera pareja (a,b) encontrada o None si no hay cambio de signo.
+    check: función opcional que se llama entre rangos (la tarea en segundo
+    plano la usa para cancelar la búsqueda cuando el usuario sigue escribiendo).
     """
     if not expr_str or expr_str.strip() == '':
         return None
 
-    # normalizar expresión como en la función bisección
-    txt = expr_str
-    if '=' in txt:
-        left, right = txt.split('=', 1)
-        txt = f"({left}) - ({right})"
-    txt = txt.replace('^', '**')
-
-    x = sp.Symbol('x')
+    # normalizar y compilar (con caché) como en la función bisección
     try:
-        sym_f = sp.sympify(txt)
-        f_num = sp.lambdify(x, sym_f, modules=['numpy'])
+        f_num = compile_expression(expr_str).f
     except Exception:
         return None
 
     ranges = [(-1, 1), (-10, 10), (-100, 100), (-1000, 1000)]
     for low, high in ranges:
-        xs = np.linspace(low, high, samples)
+        if check is not None:
+            check()
         try:
-            ys = f_num(xs)
-            ys = np.array(ys, dtype=float)
+            # una evaluación vectorizada por rango; sin refinamiento para
+            # devolver el mismo intervalo de la malla de `samples` puntos
+            cells = scan_sign_changes(f_num, low, high, n=samples - 1, levels=0)
         except Exception:
             # si la evaluación falla en este rango, intentar el siguiente
             continue
-
-        finite = np.isfinite(ys)
-        for i in range(len(xs) - 1):
-            if not (finite[i] and finite[i + 1]):
-                continue
-            yi, yj = ys[i], ys[i + 1]
-            if yi == 0:
-                return float(xs[i]), float(xs[i])
-            if yi * yj < 0:
-                return float(xs[i]), float(xs[i + 1])
+        if cells:
+            return cells[0]
     return None
 
+def _a_b_por_defecto():
+    """True si el usuario no cambió a/b (valores por defecto)."""
+    return (entrada_a.get().strip() in ('', '0')
+            and entrada_b.get().strip() in ('', '1'))
+
+def _clave_intervalo(expr):
+    try:
+        return normalize_equation(expr)
+    except ValueError:
+        return None
+
+def _retardo_debounce():
+    """Milisegundos de espera tras la última tecla: poco si detectar es barato,
+    más si es caro (así no se lanzan búsquedas que la próxima tecla cancela)."""
+    return int(min(1000, max(120, 120 + 3 * _costo_deteccion * 1000)))
+
+def _cancelar_deteccion():
+    global _tarea_intervalo
+    if _tarea_intervalo is not None:
+        _tarea_intervalo.cancel()
+        _tarea_intervalo = None
+
 def _try_set_interval():
     """Intentar fijar a y b automáticamente si están en valores por defecto."""
-    global _interval_after_id
+    global _interval_after_id, _tarea_intervalo
     _interval_after_id = None
     expr = entrada_ecuacion.get().strip()
+    clave = _clave_intervalo(expr)
     # solo sobrescribimos si el usuario no cambió a/b (valores por defecto)
-    cur_a = entrada_a.get().strip()
-    cur_b = entrada_b.get().strip()
-    if cur_a not in ('', '0') or cur_b not in ('', '1'):
+    if clave is None or not _a_b_por_defecto():
+        return
+    if clave in _intervalos_cache:
+        _intervalos_cache.move_to_end(clave)
+        _aplicar_intervalo(_intervalos_cache[clave])
+        return
+
+    # el escaneo corre en un hilo y se puede cancelar entre rangos
+    def trabajo(task):
+        t0 = time.perf_counter()
+        res = find_sign_change_interval(expr, check=task.check)
+        return res, time.perf_counter() - t0
+
+    def terminado(resultado):
+        global _costo_deteccion
+        res, costo = resultado
+        _costo_deteccion = 0.7 * _costo_deteccion + 0.3 * costo
+        _intervalos_cache[clave] = res
+        if len(_intervalos_cache) > INTERVALOS_CACHE_MAX:
+            _intervalos_cache.popitem(last=False)
+        _aplicar_intervalo(res)
+
+    _cancelar_deteccion()
+    _tarea_intervalo = BackgroundTask(ventana, trabajo, terminado)
+    _tarea_intervalo.start()
+
+def _aplicar_intervalo(res):
+    """Mostrar en la interfaz el intervalo detectado (hilo de Tk)."""
+    # el usuario pudo cambiar a/b mientras se buscaba
+    if not _a_b_por_defecto():
         return
-    res = find_sign_change_interval(expr)
     if res:
         a_guess, b_guess = res
         entrada_a.delete(0, tk.END); entrada_a.insert(0, f"{a_guess:.6g}")
@@ -81,19 +139,35 @@ def _try_set_interval():
 
 def _on_equation_change(event=None):
     """Debounce: programar intento de detectar intervalo cuando el usuario escribe."""
-    global _interval_after_id
+    global _interval_after_id, _texto_pendiente
+    texto = entrada_ecuacion.get().strip()
+    en_curso = _tarea_intervalo is not None and _tarea_intervalo.running()
+    if texto == _texto_pendiente and (_interval_after_id is not None or en_curso):
+        return  # teclas que no cambian el texto (flechas, Shift) o pérdida de foco
+    _texto_pendiente = texto
     try:
         if _interval_after_id is not None:
             ventana.after_cancel(_interval_after_id)
     except Exception:
         pass
-    _interval_after_id = ventana.after(500, _try_set_interval)
+    _interval_after_id = None
+    # cada tecla descarta la búsqueda en curso: su resultado ya no sirve
+    _cancelar_deteccion()
+    if _clave_intervalo(texto) in _intervalos_cache:
+        # ya detectado (p. ej. al deshacer): sin esperar
+        _try_set_interval()
+        return
+    _interval_after_id = ventana.after(_retardo_debounce(), _try_set_interval)
 
 
 # -----------------------
 # Método de Bisección
 # -----------------------
-def biseccion(expr_str, a, b, tol, max_iter=100):
+# columnas de la tabla de iteraciones (mismos nombres que en la interfaz)
+TABLA_CAMPOS = [('Iteración', 'i4'), ('a', 'f8'), ('b', 'f8'), ('c', 'f8'),
+                ('f(a)', 'f8'), ('f(b)', 'f8'), ('f(c)', 'f8'), ('f(a)*f(c)', 'f8')]
+
+def biseccion(expr_str, a, b, tol, max_iter=100, progress=None):
     """
     Método de bisección (versión con comentarios simples).
 
@@ -102,14 +176,17 @@ def biseccion(expr_str, a, b, tol, max_iter=100):
     - a, b: extremos del intervalo donde buscar la raíz
     - tol: tolerancia para el criterio de parada
     - max_iter: número máximo de iteraciones
+    - progress: función opcional llamada con el número de iteración en cada
+      vuelta (la interfaz la usa para mostrar el avance y para cancelar)
 
     Devuelve:
-    - tabla: DataFrame con las iteraciones
+    - tabla: historial (arreglo estructurado) con las iteraciones
     - raiz: aproximación final de la raíz
     - error_final: |f(c)| en la última evaluación
 
     Explicación simple del algoritmo (para explicar en clase):
-    1) Convertimos la cadena a una expresión simbólica con sympy.
+    1) Convertimos la cadena a una expresión simbólica con sympy y la
+       compilamos a una función numérica.
     2) Evaluamos f(a) y f(b) y comprobamos que tengan signos opuestos.
     3) Repetimos: calculamos el punto medio c=(a+b)/2, evaluamos f(c).
        - Si f(c) es cercano a 0 (o el intervalo es muy pequeño), paramos.
@@ -118,38 +195,37 @@ def biseccion(expr_str, a, b, tol, max_iter=100):
     4) Guardamos cada iteración en una tabla para mostrarla.
     """
 
-    x = sp.Symbol('x')
-
-    # Si el usuario escribió una ecuación con '=' la convertimos a f(x)=0
-    if '=' in expr_str:
-        lado_izq, lado_der = expr_str.split('=')
-        expr_str = f"({lado_izq}) - ({lado_der})"
-
-    # Permitir usar '^' para potencias (lo convertimos a '**' para sympy)
-    f = sp.sympify(expr_str.replace('^', '**'))
+    # Convertimos la ecuación a f(x)=0 ('=' y '^' se normalizan) y tomamos
+    # de la caché su versión compilada con el módulo math: mucho más rápida
+    # que evaluar con sympy (subs) en cada iteración
+    f = compile_expression(expr_str).kernel('math')
 
     # Evaluaciones iniciales en los extremos (como floats para comparaciones)
-    fa = float(f.subs(x, a))
-    fb = float(f.subs(x, b))
+    fa = f(a)
+    fb = f(b)
 
     # Necesitamos que f(a) y f(b) tengan signos distintos para aplicar el método
     if fa * fb > 0:
         raise ValueError("f(a) y f(b) deben tener signos opuestos.")
 
-    data = []  # lista para almacenar las filas que luego convertimos a DataFrame
+    # historial compacto: arreglo reservado de antemano, sin una lista por fila
+    data = History(TABLA_CAMPOS, max_iter)
 
     for i in range(max_iter):
+        if progress is not None:
+            progress(i)
+
         # Punto medio del intervalo
         c = (a + b) / 2
 
-        # Evaluar f en c y convertir a float para poder usarlo en cálculos/condiciones
-        fc = float(f.subs(x, c))
+        # Evaluar f en c (el núcleo compilado ya devuelve float)
+        fc = f(c)
 
         # Producto para saber si f(a) y f(c) tienen signos opuestos
         producto = fa * fc
 
         # Guardamos la iteración (índice, intervalo, punto medio y valores de f)
-        data.append([i, a, b, c, fa, fb, fc, producto])
+        data.append((i, a, b, c, fa, fb, fc, producto))
 
         # Criterio de parada simple:
         # - si f(c) está cerca de 0 (|f(c)| < tol)
@@ -168,13 +244,13 @@ def biseccion(expr_str, a, b, tol, max_iter=100):
             fa = fc
 
     raiz = (a + b) / 2
-    tabla = pd.DataFrame(data, columns=['Iteración', 'a', 'b', 'c', 'f(a)', 'f(b)', 'f(c)', 'f(a)*f(c)'])
-    return tabla, raiz, abs(fc)
+    return data, raiz, abs(fc)
 
 # -----------------------
 # Función de cálculo
 # -----------------------
 def calcular():
+    global _tarea_calculo
     try:
         expr = entrada_ecuacion.get()
         a = float(entrada_a.get())
@@ -198,26 +274,31 @@ def calcular():
         else:
             tol = float(tol_str)
 
-        # --- Ejecutar método ---
-        tabla, raiz, error = biseccion(expr, a, b, tol)
-
-        # Limpiar tabla previa
-        for row in tabla_iteraciones.get_children():
-            tabla_iteraciones.delete(row)
-
-        # Insertar resultados
-        for _, row in tabla.iterrows():
-            valores = [
-                int(row['Iteración']),
-                f"{row['a']:.6f}",
-                f"{row['b']:.6f}",
-                f"{row['c']:.6f}",
-                f"{row['f(a)']:.6f}",
-                f"{row['f(b)']:.6f}",
-                f"{row['f(c)']:.6f}",
-                f"{row['f(a)*f(c)']:.6f}"
-            ]
-            tabla_iteraciones.insert("", "end", values=valores)
+    except Exception as e:
+        messagebox.showerror("Error", str(e))
+        return
+
+    # --- Ejecutar método en segundo plano (la ventana sigue respondiendo) ---
+    def trabajo(task):
+        # si ya se resolvió este mismo problema, la tabla sale de la caché
+        clave = result_key(expr, 'a.biseccion', a, b, tol=tol, max_iter=100)
+        guardado = lookup(clave, history=True)
+        if guardado is not None:
+            resultado = guardado.history, guardado.root, guardado.error
+        else:
+            resultado = biseccion(expr, a, b, tol, progress=task.check)
+            tabla, raiz, error = resultado
+            store(clave, {'root': raiz, 'error': error, 'iterations': len(tabla),
+                          'f_root': tabla[-1][6]}, tabla)
+        compile_expression(expr).f  # dejar lista la versión NumPy para graficar
+        return resultado
+
+    def terminado(resultado):
+        tabla, raiz, error = resultado
+
+        # Mostrar resultados: la tabla virtual lee directamente el arreglo
+        # y sólo formatea las filas visibles
+        tabla_iteraciones.set_rows(tabla)
 
         # Actualizar la gráfica con la función y la raíz encontrada
         try:
@@ -230,8 +311,29 @@ def calcular():
             text=f"Raíz aproximada: x = {raiz:.6f}   |   Error final = {error:.6f}   |   Tolerancia = {tol:.6f}"
         )
 
-    except Exception as e:
-        messagebox.showerror("Error", str(e))
+    def avance(i):
+        if i is not None:
+            etiqueta_resultado.config(text=f"Calculando… iteración {i + 1}")
+
+    def fin():
+        if _tarea_calculo is tarea:
+            barra_progreso.stop()
+            if tarea.cancelled:
+                etiqueta_resultado.config(text="Cálculo cancelado")
+
+    if _tarea_calculo is not None:
+        _tarea_calculo.cancel()
+    tarea = BackgroundTask(ventana, trabajo, terminado,
+                           on_error=lambda e: messagebox.showerror("Error", str(e)),
+                           on_progress=avance, on_finish=fin)
+    _tarea_calculo = tarea
+    etiqueta_resultado.config(text="Calculando…")
+    barra_progreso.start(10)
+    tarea.start()
+
+def cancelar():
+    if _tarea_calculo is not None:
+        _tarea_calculo.cancel()
 
 # -----------------------
 # Insertar texto del teclado
@@ -242,146 +344,167 @@ def insertar_texto(simbolo):
 # -----------------------
 # Crear interfaz gráfica
 # -----------------------
-ventana = ttkb.Window(themename="cosmo")
-ventana.title("Método de Bisección")
-ventana.geometry("980x740")
-
-# --- Título ---
-ttkb.Label(ventana, text="Método de Bisección", font=("Segoe UI", 18, "bold")).pack(pady=10)
-
-# --- Frame de entrada ---
-frame_inputs = ttkb.Frame(ventana)
-frame_inputs.pack(pady=5)
-
-ttkb.Label(frame_inputs, text="Ecuación f(x):").grid(row=0, column=0, padx=5)
-entrada_ecuacion = ttkb.Entry(frame_inputs, width=45, font=("Consolas", 11))
-entrada_ecuacion.grid(row=0, column=1, columnspan=4, padx=5)
-entrada_ecuacion.insert(0, "cos(x) = x")
-# Conectar el evento para detectar intervalos por defecto cuando se modifica la ecuación
-entrada_ecuacion.bind('<KeyRelease>', _on_equation_change)
-entrada_ecuacion.bind('<FocusOut>', _on_equation_change)
-
-ttkb.Label(frame_inputs, text="a:").grid(row=1, column=0, padx=5)
-entrada_a = ttkb.Entry(frame_inputs, width=10)
-entrada_a.grid(row=1, column=1, padx=5)
-entrada_a.insert(0, "0")
-
-ttkb.Label(frame_inputs, text="b:").grid(row=1, column=2, padx=5)
-entrada_b = ttkb.Entry(frame_inputs, width=10)
-entrada_b.grid(row=1, column=3, padx=5)
-entrada_b.insert(0, "1")
-
-
-ttkb.Label(frame_inputs, text="Tolerancia:").grid(row=2, column=0, padx=5)
-entrada_tol = ttkb.Entry(frame_inputs, width=10)
-entrada_tol.grid(row=2, column=1, padx=5)
-entrada_tol.insert(0, "1e-4")
-
-ttkb.Button(frame_inputs, text="Detectar intervalo", command=_try_set_interval, bootstyle="info").grid(row=3, column=0, padx=5, pady=10)
-ttkb.Button(frame_inputs, text="Calcular", command=calcular, bootstyle="success").grid(row=3, column=1, columnspan=4, pady=10)
-
-# etiqueta que muestra el intervalo detectado (si aplica)
-etiqueta_intervalo = ttkb.Label(frame_inputs, text="", bootstyle="secondary")
-etiqueta_intervalo.grid(row=4, column=0, columnspan=5, pady=(0,8))
-
-# programar una detección inicial poco después de crear la interfaz
-try:
-    ventana.after(100, _try_set_interval)
-except Exception:
-    pass
-
-# --- Teclado matemático ---
-frame_teclado = ttkb.Labelframe(ventana, text="Teclado Matemático")
-frame_teclado.pack(pady=10)
-
-botones = [
-    ['x', 'π', 'e', '^', '√()', '(', ')', '='],
-    ['sin(', 'cos(', 'tan(', 'log(', 'ln(', 'exp(', '| |', '÷'],
-    ['+', '-', '*', '/', '.', '0', '1', '2'],
-    ['3', '4', '5', '6', '7', '8', '9', 'DEL']
-]
-
-for i, fila in enumerate(botones):
-    for j, texto in enumerate(fila):
-        def cmd(t=texto):
-            if t == 'DEL':
-                entrada_ecuacion.delete(len(entrada_ecuacion.get())-1, tk.END)
-            elif t == '√()':
-                insertar_texto('sqrt(')
-            elif t == '| |':
-                insertar_texto('abs(')
-            elif t == '÷':
-                insertar_texto('/')
-            elif t == 'π':
-                insertar_texto('pi')
-            else:
-                insertar_texto(t)
-        ttkb.Button(frame_teclado, text=texto, width=6, command=cmd, bootstyle="secondary").grid(row=i, column=j, padx=2, pady=2)
-
-# --- Tabla de resultados ---
-cols = ['Iteración', 'a', 'b', 'c', 'f(a)', 'f(b)', 'f(c)', 'f(a)*f(c)']
-tabla_iteraciones = ttkb.Treeview(ventana, columns=cols, show='headings', height=10)
-for col in cols:
-    tabla_iteraciones.heading(col, text=col)
-    tabla_iteraciones.column(col, width=110, anchor="center")
-tabla_iteraciones.pack(pady=10, fill="x", padx=20)
-
-# --- Área de gráfica ---
-frame_grafica = ttkb.Frame(ventana)
-frame_grafica.pack(pady=10, fill="both", expand=True, padx=20)
-
-# crear figura matplotlib y canvas para Tk
-fig = Figure(figsize=(6, 3.5), dpi=100)
-ax = fig.add_subplot(111)
-canvas = FigureCanvasTkAgg(fig, master=frame_grafica)
-canvas.get_tk_widget().pack(fill="both", expand=True)
-
-# --- Resultado final ---
-etiqueta_resultado = ttkb.Label(ventana, text="", font=("Segoe UI", 12, "bold"))
-etiqueta_resultado.pack(pady=10)
+ventana = None
+controlador_grafica = None
+_grafica_pendiente = None
+
+def crear_interfaz():
+    """Construye la ventana (los widgets quedan como variables globales del módulo)."""
+    global ventana, entrada_ecuacion, entrada_a, entrada_b, entrada_tol
+    global etiqueta_intervalo, barra_progreso, tabla_iteraciones, frame_grafica
+    global etiqueta_resultado
+    import ttkbootstrap as ttkb
+
+    ventana = ttkb.Window(themename="cosmo")
+    ventana.title("Método de Bisección")
+    ventana.geometry("980x740")
+
+    # --- Título ---
+    ttkb.Label(ventana, text="Método de Bisección", font=("Segoe UI", 18, "bold")).pack(pady=10)
+
+    # --- Frame de entrada ---
+    frame_inputs = ttkb.Frame(ventana)
+    frame_inputs.pack(pady=5)
+
+    ttkb.Label(frame_inputs, text="Ecuación f(x):").grid(row=0, column=0, padx=5)
+    entrada_ecuacion = ttkb.Entry(frame_inputs, width=45, font=("Consolas", 11))
+    entrada_ecuacion.grid(row=0, column=1, columnspan=4, padx=5)
+    entrada_ecuacion.insert(0, "cos(x) = x")
+    # Conectar el evento para detectar intervalos por defecto cuando se modifica la ecuación
+    entrada_ecuacion.bind('<KeyRelease>', _on_equation_change)
+    entrada_ecuacion.bind('<FocusOut>', _on_equation_change)
+
+    ttkb.Label(frame_inputs, text="a:").grid(row=1, column=0, padx=5)
+    entrada_a = ttkb.Entry(frame_inputs, width=10)
+    entrada_a.grid(row=1, column=1, padx=5)
+    entrada_a.insert(0, "0")
+
+    ttkb.Label(frame_inputs, text="b:").grid(row=1, column=2, padx=5)
+    entrada_b = ttkb.Entry(frame_inputs, width=10)
+    entrada_b.grid(row=1, column=3, padx=5)
+    entrada_b.insert(0, "1")
+
+
+    ttkb.Label(frame_inputs, text="Tolerancia:").grid(row=2, column=0, padx=5)
+    entrada_tol = ttkb.Entry(frame_inputs, width=10)
+    entrada_tol.grid(row=2, column=1, padx=5)
+    entrada_tol.insert(0, "1e-4")
+
+    ttkb.Button(frame_inputs, text="Detectar intervalo", command=_try_set_interval, bootstyle="info").grid(row=3, column=0, padx=5, pady=10)
+    ttkb.Button(frame_inputs, text="Calcular", command=calcular, bootstyle="success").grid(row=3, column=1, columnspan=4, pady=10)
+    ttkb.Button(frame_inputs, text="Cancelar", command=cancelar, bootstyle="danger-outline").grid(row=3, column=5, padx=5, pady=10)
+
+    # etiqueta que muestra el intervalo detectado (si aplica)
+    etiqueta_intervalo = ttkb.Label(frame_inputs, text="", bootstyle="secondary")
+    etiqueta_intervalo.grid(row=4, column=0, columnspan=5, pady=(0,8))
+
+    # barra de actividad mientras se calcula en segundo plano
+    barra_progreso = ttkb.Progressbar(frame_inputs, mode='indeterminate', bootstyle="success-striped")
+    barra_progreso.grid(row=5, column=0, columnspan=6, sticky='we', pady=(0, 6))
+
+    # programar una detección inicial poco después de crear la interfaz
+    try:
+        ventana.after(100, _try_set_interval)
+    except Exception:
+        pass
+
+    # --- Teclado matemático ---
+    frame_teclado = ttkb.Labelframe(ventana, text="Teclado Matemático")
+    frame_teclado.pack(pady=10)
+
+    botones = [
+        ['x', 'π', 'e', '^', '√()', '(', ')', '='],
+        ['sin(', 'cos(', 'tan(', 'log(', 'ln(', 'exp(', '| |', '÷'],
+        ['+', '-', '*', '/', '.', '0', '1', '2'],
+        ['3', '4', '5', '6', '7', '8', '9', 'DEL']
+    ]
+
+    for i, fila in enumerate(botones):
+        for j, texto in enumerate(fila):
+            def cmd(t=texto):
+                if t == 'DEL':
+                    entrada_ecuacion.delete(len(entrada_ecuacion.get())-1, tk.END)
+                elif t == '√()':
+                    insertar_texto('sqrt(')
+                elif t == '| |':
+                    insertar_texto('abs(')
+                elif t == '÷':
+                    insertar_texto('/')
+                elif t == 'π':
+                    insertar_texto('pi')
+                else:
+                    insertar_texto(t)
+            ttkb.Button(frame_teclado, text=texto, width=6, command=cmd, bootstyle="secondary").grid(row=i, column=j, padx=2, pady=2)
+
+    # --- Tabla de resultados ---
+    cols = ['Iteración', 'a', 'b', 'c', 'f(a)', 'f(b)', 'f(c)', 'f(a)*f(c)']
+    tabla_iteraciones = VirtualTable(ventana, cols, height=10, col_width=110,
+                                     format_row=_formatear_fila)
+    tabla_iteraciones.pack(pady=10, fill="x", padx=20)
+
+    # --- Área de gráfica ---
+    # la figura se crea cuando matplotlib termina de cargar (ver _construir_grafica)
+    frame_grafica = ttkb.Frame(ventana)
+    frame_grafica.pack(pady=10, fill="both", expand=True, padx=20)
+    ttkb.Label(frame_grafica, text="Cargando gráfica…", bootstyle="secondary").pack(expand=True)
+
+    # --- Resultado final ---
+    etiqueta_resultado = ttkb.Label(ventana, text="", font=("Segoe UI", 12, "bold"))
+    etiqueta_resultado.pack(pady=10)
+
+    # sympy y matplotlib en un hilo: la ventana ya se puede usar mientras cargan
+    BackgroundTask(ventana, lambda task: import_all(*MODULOS_PRECARGA),
+                   lambda cargados: _construir_grafica()).start()
+    return ventana
+
+def _formatear_fila(fila):
+    return [int(fila[0])] + [f"{v:.6f}" for v in fila[1:]]
+
+def _construir_grafica():
+    """Crea la figura matplotlib y el canvas para Tk (hilo de Tk, tras la precarga)."""
+    global controlador_grafica, _grafica_pendiente
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+    for hijo in frame_grafica.winfo_children():
+        hijo.destroy()
+    fig = Figure(figsize=(6, 3.5), dpi=100)
+    ax = fig.add_subplot(111)
+    canvas = FigureCanvasTkAgg(fig, master=frame_grafica)
+    canvas.get_tk_widget().pack(fill="both", expand=True)
+    # los artistas (curva, raíz, línea vertical) se crean una vez y se reutilizan
+    controlador_grafica = PlotController(ax, canvas, root_label='raíz ≈ {root:.6g}',
+                                         root_vline=True, grid=True, zero_color='gray')
+    if _grafica_pendiente is not None:
+        _grafica_pendiente()
+        _grafica_pendiente = None
 
 
 def plot_function_and_root(expr_str, a, b, root):
     """Dibuja la función definida por expr_str en el intervalo [a,b] y marca la raíz."""
+    global _grafica_pendiente
+    if controlador_grafica is None:
+        # matplotlib todavía está cargando: se dibuja al terminar
+        _grafica_pendiente = lambda: plot_function_and_root(expr_str, a, b, root)
+        return
     try:
         # Preparar expresión (igual que en bisección): permitir '=' y '^'
-        if '=' in expr_str:
-            left, right = expr_str.split('=')
-            expr_plot = f"({left}) - ({right})"
-        else:
-            expr_plot = expr_str
-        expr_plot = expr_plot.replace('^', '**')
+        f_num = compile_expression(expr_str).f
 
-        x = sp.Symbol('x')
-        sym_f = sp.sympify(expr_plot)
-        f_num = sp.lambdify(x, sym_f, modules=['numpy'])
+        xs, ys = sample_function(f_num, a, b)
 
-        xs = np.linspace(a, b, 400)
-        ys = f_num(xs)
-
-        ax.clear()
-        ax.plot(xs, ys, label='f(x)')
-        # marcar el eje x
-        ax.axhline(0, color='gray', linewidth=0.8)
         # marcar la raíz encontrada
         try:
             yroot = float(f_num(root))
-            ax.plot(root, yroot, 'ro', label=f'raíz ≈ {root:.6g}')
-            ax.axvline(root, color='red', linestyle='--', linewidth=0.8)
         except Exception:
             # si la evaluación falla, marcamos sólo la vertical
-            ax.axvline(root, color='red', linestyle='--', linewidth=0.8)
-
-        ax.set_xlim(a, b)
-        ax.set_xlabel('x')
-        ax.set_ylabel('f(x)')
-        ax.legend()
-        ax.grid(True, linestyle=':', linewidth=0.6)
-        canvas.draw()
+            yroot = None
+
+        controlador_grafica.plot(xs, ys, root=root, root_y=yroot, xlim=(a, b))
     except Exception as e:
         # Mostrar una advertencia si no se puede graficar
         messagebox.showwarning('Gráfica', f'No se pudo graficar la función:\n{e}')
 
 
 if __name__ == '__main__':
-    ventana.mainloop()
+    crear_interfaz().mainloop()
@@ -1,14 +1,26 @@
 import sys
-import numpy as np
-import sympy as sp
-import pandas as pd
+from decimal import Decimal
 import tkinter as tk
 from tkinter import messagebox, filedialog
-from ttkbootstrap import Style
-from ttkbootstrap.constants import *
 from tkinter import ttk
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from perezoso import import_all
+from cache_resultados import cache_stats, lookup, result_key, store
+from expresiones import compile_expression, compile_kernel, evaluate_number, normalize_equation
+from exportar import HAS_PYARROW, export_history
+from grafica import PlotController, sample_function
+from historial import headers_for
+from instrumentacion import SolveStats, format_stats
+from tabla_virtual import VirtualTable
+from tareas import BackgroundTask
+from metodos import (bisection, bisection_batch, brent, false_position, itp,
+                     newton, required_digits, scan_sign_changes)
+
+# dependencias pesadas: se cargan en segundo plano al abrir la ventana
+WARM_UP_MODULES = ('numpy', 'sympy', 'matplotlib.figure', 'matplotlib.backends.backend_tkagg')
+# nombre de cada método en la caché de resultados (el mismo que usa lotes.METHODS)
+METHOD_IDS = {"Bisección": 'bisection', "Falsa Posición": 'false_position', "Brent": 'brent',
+              "ITP": 'itp', "Newton-Raphson": 'newton'}
 
 # =======================
 # 🔹 Clase Teclado Matemático Mejorado
@@ -68,88 +80,18 @@ class MathKeyboard(tk.Toplevel):
 # 🔹 Funciones matemáticas
 # =======================
 def parse_equation(eq_text: str):
-    if not eq_text.strip():
-        raise ValueError("La ecuación está vacía")
-    eq_norm = eq_text.replace('^', '**')
-    if '=' in eq_norm:
-        parts = eq_norm.split('=')
-        if len(parts) != 2:
-            raise ValueError("Ecuación con formato inválido")
-        left, right = parts
-        expr_text = f"({left})-({right})"
-    else:
-        expr_text = eq_norm
-
-    x = sp.symbols('x')
-    expr = sp.sympify(expr_text, convert_xor=True)
-    f_num = sp.lambdify(x, expr, modules=["numpy", {"sin": np.sin, "cos": np.cos,
-                                                     "tan": np.tan, "exp": np.exp,
-                                                     "log": np.log, "sqrt": np.sqrt,
-                                                     "Abs": np.abs}])
-    return expr, f_num
+    compiled = compile_expression(eq_text)
+    return compiled.expr, compiled.f
 
 def parse_tolerance(tol_text: str) -> float:
     if not tol_text.strip():
         raise ValueError("La tolerancia está vacía")
     txt = tol_text.strip().replace('^', '**').replace(',', '.')
-    return float(sp.N(sp.sympify(txt)))
+    return evaluate_number(txt)
 
-# =======================
-# 🔹 Métodos Numéricos
-# =======================
-def bisection(f, a, b, tol, max_iter=1000):
-    fa, fb = f(a), f(b)
-    if fa * fb > 0:
-        raise ValueError("f(a) y f(b) deben tener signos opuestos.")
-    rows = []
-    for it in range(1, max_iter + 1):
-        c = (a + b) / 2
-        fc = f(c)
-        error = abs(b - a) / 2
-        rows.append((it, a, b, c, fa, fb, fc, error))
-        if abs(fc) < tol or error < tol:
-            break
-        if fa * fc < 0:
-            b = c
-            fb = fc
-        else:
-            a = c
-            fa = fc
-    return rows, {'root': c, 'error': error, 'iterations': it, 'f_root': fc}
-
-def false_position(f, a, b, tol, max_iter=1000):
-    fa, fb = f(a), f(b)
-    if fa * fb > 0:
-        raise ValueError("f(a) y f(b) deben tener signos opuestos.")
-    rows = []
-    for it in range(1, max_iter + 1):
-        c = (a * fb - b * fa) / (fb - fa)
-        fc = f(c)
-        error = abs(fc)
-        rows.append((it, a, b, c, fa, fb, fc, error))
-        if abs(fc) < tol or error < tol:
-            break
-        if fa * fc < 0:
-            b, fb = c, fc
-        else:
-            a, fa = c, fc
-    return rows, {'root': c, 'error': error, 'iterations': it, 'f_root': fc}
-
-def newton(f, df, x0, tol, max_iter=1000):
-    rows = []
-    x = x0
-    for it in range(1, max_iter + 1):
-        fx = f(x)
-        dfx = df(x)
-        if dfx == 0:
-            raise ValueError("Derivada cero, no se puede continuar")
-        x_new = x - fx / dfx
-        error = abs(x_new - x)
-        rows.append((it, x, fx, dfx, x_new, error))
-        if error < tol:
-            break
-        x = x_new
-    return rows, {'root': x, 'error': error, 'iterations': it, 'f_root': f(x)}
+def format_number(v):
+    # los resultados de precisión extendida (Decimal) se muestran con todos sus dígitos
+    return str(v) if isinstance(v, Decimal) else f"{v:.12g}"
 
 # =======================
 # 🔹 Aplicación Principal
@@ -191,9 +133,15 @@ class RootFinderApp:
         self.entry_tol = tk.Entry(self.frm_top, textvariable=self.var_tol, width=12)
         self.entry_tol.grid(row=1, column=5, sticky='w')
 
+        # Dígitos de precisión (mpmath); vacío = automático según la tolerancia
+        tk.Label(self.frm_top, text="Dígitos:", foreground="white", background="#2c2c2c").grid(row=2, column=4, sticky='w')
+        self.var_digits = tk.StringVar(value='')
+        self.entry_digits = tk.Entry(self.frm_top, textvariable=self.var_digits, width=12)
+        self.entry_digits.grid(row=2, column=5, sticky='w')
+
         # Método
         tk.Label(self.frm_top, text="Método:", foreground="white", background="#2c2c2c").grid(row=0, column=5, sticky='e')
-        self.method_choice = ttk.Combobox(self.frm_top, values=["Bisección", "Falsa Posición", "Newton-Raphson"], width=18)
+        self.method_choice = ttk.Combobox(self.frm_top, values=["Bisección", "Falsa Posición", "Brent", "ITP", "Newton-Raphson"], width=18)
         self.method_choice.current(0)
         self.method_choice.grid(row=0, column=6, sticky='w')
 
@@ -202,17 +150,19 @@ class RootFinderApp:
         ttk.Button(self.frm_top, text="Graficar", command=self.on_plot, style="primary.TButton").grid(row=0, column=8, padx=3)
         ttk.Button(self.frm_top, text="Calcular", command=self.on_calculate, style="success.TButton").grid(row=0, column=9, padx=3)
         ttk.Button(self.frm_top, text="Reiniciar", command=self.on_reset, style="danger.TButton").grid(row=1, column=7, padx=3)
-        ttk.Button(self.frm_top, text="Exportar CSV", command=self.on_export_csv, style="secondary.TButton").grid(row=1, column=8, padx=3)
+        ttk.Button(self.frm_top, text="Exportar", command=self.on_export_csv, style="secondary.TButton").grid(row=1, column=8, padx=3)
         ttk.Button(self.frm_top, text="Intervalos [-100,100]", command=self.on_scan_intervals, style="warning.TButton").grid(row=1, column=9, padx=3)
+        ttk.Button(self.frm_top, text="Cancelar", command=self.on_cancel, style="danger.Outline.TButton").grid(row=0, column=10, padx=3)
+        self.progress = ttk.Progressbar(self.frm_top, mode='indeterminate', length=110)
+        self.progress.grid(row=1, column=10, padx=3)
 
         # Tabla de iteraciones
         self.frm_table = tk.LabelFrame(self.frm_left, text="Iteraciones")
         self.frm_table.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        self.tree = ttk.Treeview(self.frm_table, columns=[], show='headings', height=20)
-        self.tree.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
-        self.scrollbar = tk.Scrollbar(self.frm_table, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscroll=self.scrollbar.set)
-        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # sólo se crean/formatean las filas visibles
+        self.table = VirtualTable(self.frm_table, height=20)
+        self.table.pack(fill=tk.BOTH, expand=True)
+        self.tree = self.table.tree
 
         # Resultados
         self.frm_results = tk.LabelFrame(self.frm_left, text="Resultados")
@@ -220,18 +170,47 @@ class RootFinderApp:
         self.lbl_root = tk.Label(self.frm_results, text="Raíz aproximada: -"); self.lbl_root.pack(anchor='w')
         self.lbl_error = tk.Label(self.frm_results, text="Error final: -"); self.lbl_error.pack(anchor='w')
         self.lbl_iters = tk.Label(self.frm_results, text="Iteraciones: -"); self.lbl_iters.pack(anchor='w')
+        self.lbl_stats = tk.Label(self.frm_results, text="", justify='left', wraplength=560); self.lbl_stats.pack(anchor='w')
+        self.lbl_status = tk.Label(self.frm_results, text=""); self.lbl_status.pack(anchor='w')
 
         # Gráfica
         self.frm_plot = tk.LabelFrame(self.frm_right, text="Gráfica")
         self.frm_plot.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # la figura se crea cuando matplotlib termina de cargar (ver _warm_up)
+        self.lbl_plot_loading = tk.Label(self.frm_plot, text="Cargando gráfica…")
+        self.lbl_plot_loading.pack(expand=True)
+        self.fig = self.ax = self.canvas = self.plotter = None
+        self._pending_plot = None
+
+        # Guardar últimas iteraciones
+        self.last_rows = []
+        # Tarea en segundo plano en curso (sólo una a la vez)
+        self.task = None
+        # última resolución por (ecuación, método): si sólo cambia la tolerancia,
+        # max_iter o el intervalo se achica, se continúa desde ahí
+        self.last_solves = {}
+
+        self._warm_up()
+
+    def _warm_up(self):
+        """Importa sympy y matplotlib en un hilo; la ventana ya está visible mientras tanto."""
+        BackgroundTask(self.master, lambda task: import_all(*WARM_UP_MODULES),
+                       lambda loaded: self._build_plot()).start()
+
+    def _build_plot(self):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        self.lbl_plot_loading.destroy()
         self.fig = Figure(figsize=(6,5), dpi=100)
         self.ax = self.fig.add_subplot(111)
         self.ax.set_xlabel('x'); self.ax.set_ylabel('f(x)')
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.frm_plot)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-        # Guardar últimas iteraciones
-        self.last_rows = []
+        # curva, raíz e intervalos se crean una vez y se actualizan con set_data
+        self.plotter = PlotController(self.ax, self.canvas)
+        if self._pending_plot is not None:
+            self._pending_plot()
+            self._pending_plot = None
 
     # --------------------------
     # Métodos GUI
@@ -239,130 +218,215 @@ class RootFinderApp:
     def open_math_keyboard(self):
         MathKeyboard(self.master, self.entry_eq)
 
+    def run_in_background(self, work, on_done):
+        """Ejecuta work(task) fuera del hilo de Tk y entrega el resultado a on_done."""
+        if self.task is not None:
+            self.task.cancel()
+        task = BackgroundTask(self.master, work, on_done,
+                              on_error=lambda e: messagebox.showerror("Error", str(e)),
+                              on_progress=self._show_progress,
+                              on_finish=lambda: self._task_finished(task))
+        self.task = task
+        self.lbl_status.config(text="Calculando…")
+        self.progress.start(10)
+        task.start()
+
+    def _show_progress(self, it):
+        if it:
+            self.lbl_status.config(text=f"Calculando… iteración {it}")
+
+    def _task_finished(self, task):
+        # una tarea cancelada puede terminar después de que empezó otra
+        if self.task is task:
+            self.task = None
+            self.progress.stop()
+            self.lbl_status.config(text="Cancelado" if task.cancelled else "")
+
+    def on_cancel(self):
+        if self.task is not None:
+            self.task.cancel()
+
     def clear_table(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.table.clear()
 
     def update_table(self, rows):
         self.clear_table()
         if not rows: return
-        # Ajustar columnas según método
-        method = self.method_choice.get()
-        if method in ["Bisección","Falsa Posición"]:
-            cols = ('Iter', 'a', 'b', 'c', 'f(a)', 'f(b)', 'f(c)', 'Error')
-        else:
-            cols = ('Iter', 'x', 'f(x)', "f'(x)", 'x_new', 'Error')
-        self.tree.config(columns=cols)
-        for c in cols:
-            self.tree.heading(c, text=c)
-            self.tree.column(c, anchor='center', width=100)
-
-        for r in rows:
-            vals = tuple(f"{v:.6g}" if isinstance(v, (int,float)) else str(v) for v in r)
-            self.tree.insert('', 'end', values=vals)
+        # Ajustar columnas según método (las del historial: intervalo o Newton)
+        cols = tuple(headers_for(rows.columns))
+        self.table.set_columns(cols)
+        self.table.set_rows(rows)
         self.last_rows = rows
 
     def update_results(self, final):
-        self.lbl_root.config(text=f"Raíz aproximada: {final['root']:.12g}")
-        self.lbl_error.config(text=f"Error final: {final['error']:.12g}")
+        self.lbl_root.config(text=f"Raíz aproximada: {format_number(final['root'])}")
+        self.lbl_error.config(text=f"Error final: {format_number(final['error'])}")
         self.lbl_iters.config(text=f"Iteraciones: {final['iterations']}")
+        if final.get('cached'):
+            stats = cache_stats()
+            self.lbl_stats.config(text="Resultado desde la caché" + (
+                f" (aciertos: {stats['hit_rate']:.0%})" if stats else ""))
+        else:
+            self.lbl_stats.config(text=format_stats(final['stats']) if 'stats' in final else "")
 
     def plot_function(self, f, a=-10, b=10, root=None, intervals=None):
-        self.ax.clear()
-        xs = np.linspace(a, b, 400)
-        ys = np.array([f(x) if not np.isnan(f(x)) else np.nan for x in xs])
-        self.ax.plot(xs, ys, label='f(x)')
-        self.ax.axhline(0, color='black', linewidth=0.7)
-        if intervals:
-            for (start, end) in intervals:
-                self.ax.axvspan(start, end, color='orange', alpha=0.3)
-        if root is not None:
-            self.ax.plot(root, f(root), 'ro', label="Raíz")
-        self.ax.legend()
-        self.canvas.draw()
+        if self.plotter is None:
+            # matplotlib todavía está cargando: se dibuja al terminar
+            self._pending_plot = lambda: self.plot_function(f, a, b, root, intervals)
+            return
+        xs, ys = sample_function(f, a, b)
+        root_y = f(root) if root is not None else None
+        self.plotter.plot(xs, ys, root=root, root_y=root_y, intervals=intervals or ())
 
     def on_reset(self):
         self.var_eq.set(''); self.var_a.set(''); self.var_b.set(''); self.var_tol.set('1e-6')
+        self.var_digits.set('')
         self.clear_table()
         self.lbl_root.config(text="Raíz aproximada: -")
         self.lbl_error.config(text="Error final: -")
         self.lbl_iters.config(text="Iteraciones: -")
-        self.ax.clear(); self.ax.set_xlabel('x'); self.ax.set_ylabel('f(x)')
-        self.canvas.draw()
+        self.lbl_stats.config(text="")
+        self.last_solves.clear()
+        self._pending_plot = None
+        if self.plotter is not None:
+            self.plotter.reset()
 
     def on_plot(self):
-        try:
-            expr, f = parse_equation(self.var_eq.get())
-            self.plot_function(f, -10, 10)
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        eq_text = self.var_eq.get()
+        self.run_in_background(lambda task: compile_kernel(eq_text),
+                               lambda f: self.plot_function(f, -10, 10))
 
     def find_sign_change_intervals(self, f, xmin=-100, xmax=100, step=1.0):
-        points = np.arange(xmin, xmax + step, step)
-        sign_changes = []
-        prev_x, prev_y = points[0], f(points[0])
-        for x in points[1:]:
-            y = f(x)
-            if not (np.isnan(prev_y) or np.isnan(y)):
-                if prev_y * y < 0:
-                    sign_changes.append((prev_x, x))
-            prev_x, prev_y = x, y
-        return sign_changes
+        # malla gruesa de paso `step`, refinada sólo donde hay cambio de signo
+        return scan_sign_changes(f, xmin, xmax, n=round((xmax - xmin) / step))
 
     def on_scan_intervals(self):
         eq_text = self.var_eq.get().strip()
         if not eq_text:
             messagebox.showerror('Error', 'Ingrese una ecuación antes de buscar intervalos.')
             return
-        expr, f = parse_equation(eq_text)
-        sign_changes = self.find_sign_change_intervals(f, -100, 100, 1.0)
-        if not sign_changes:
-            messagebox.showinfo('Sin resultados', 'No se encontraron intervalos con cambio de signo.')
-            return
-        text = "Posibles intervalos donde f(x) cambia de signo:\n\n" + "\n".join(
-            [f"[{a:.2f}, {b:.2f}]" for a, b in sign_changes])
-        messagebox.showinfo('Intervalos detectados', text)
-        self.plot_function(f, -100, 100, intervals=sign_changes)
+        tol_text = self.var_tol.get()
+
+        def work(task):
+            f = compile_kernel(eq_text)
+            sign_changes = self.find_sign_change_intervals(f, -100, 100, 1.0)
+            task.check()
+            roots = []
+            if sign_changes:
+                # refinar todos los intervalos de una sola vez
+                starts, ends = zip(*sign_changes)
+                roots = bisection_batch(f, starts, ends, parse_tolerance(tol_text))['root']
+            return f, sign_changes, roots
+
+        def done(result):
+            f, sign_changes, roots = result
+            if not sign_changes:
+                messagebox.showinfo('Sin resultados', 'No se encontraron intervalos con cambio de signo.')
+                return
+            text = "Posibles intervalos donde f(x) cambia de signo:\n\n" + "\n".join(
+                [f"[{a:.6g}, {b:.6g}]  →  x ≈ {r:.10g}"
+                 for (a, b), r in zip(sign_changes, roots)])
+            messagebox.showinfo('Intervalos detectados', text)
+            self.plot_function(f, -100, 100, intervals=sign_changes)
+
+        self.run_in_background(work, done)
 
     def on_calculate(self):
-        try:
-            expr, f = parse_equation(self.var_eq.get())
-            tol = parse_tolerance(self.var_tol.get())
-            method = self.method_choice.get()
-            if method == "Bisección":
-                a, b = float(self.var_a.get()), float(self.var_b.get())
-                rows, final = bisection(f, a, b, tol)
-            elif method == "Falsa Posición":
-                a, b = float(self.var_a.get()), float(self.var_b.get())
-                rows, final = false_position(f, a, b, tol)
-            else:  # Newton-Raphson
-                x0 = float(self.var_a.get())
-                df = sp.lambdify(sp.symbols('x'), sp.diff(expr, sp.symbols('x')), modules=["numpy"])
-                rows, final = newton(f, df, x0, tol)
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
-            return
+        # leer los widgets aquí: el hilo de trabajo no debe tocar Tk
+        eq_text, tol_text = self.var_eq.get(), self.var_tol.get()
+        a_text, b_text = self.var_a.get(), self.var_b.get()
+        digits_text = self.var_digits.get().strip()
+        method = self.method_choice.get()
 
-        self.update_table(rows)
-        self.update_results(final)
-        self.plot_function(f, -10, 10, root=final['root'])
+        def work(task):
+            stats = SolveStats()
+            with stats.phase('parse'):
+                tol = parse_tolerance(tol_text)
+            # tolerancias por debajo de float64: las últimas iteraciones van con mpmath
+            digits = int(digits_text) if digits_text else required_digits(tol)
+            if method == "Newton-Raphson":
+                a, b, x0 = None, None, float(a_text)
+            else:
+                a, b, x0 = float(a_text), float(b_text), None
+            # ya resuelto (en esta sesión o en otra): tabla y resultado de la caché
+            key = result_key(eq_text, METHOD_IDS[method], a, b, x0, tol, digits=digits)
+            state_key = (normalize_equation(eq_text), method)
+            hit = lookup(key, history=True)
+            if hit is not None:
+                return (compile_expression(eq_text).f, hit.history,
+                        {**hit.final, 'cached': True}, (state_key, hit))
+            # en precisión extendida no se continúa (las filas mpmath no se reanudan)
+            resume = self.last_solves.get(state_key) if digits is None else None
+            with stats.phase('parse'):
+                compiled = compile_expression(eq_text)
+            with stats.phase('compile'):
+                # los bucles iterativos usan el núcleo escalar (math); f (NumPy) queda para graficar
+                f = compiled.f
+                f_scalar = compiled.kernel('math')
+                mp = {}
+                if digits is not None:
+                    mp = {'precision': digits, 'f_mp': compiled.kernel('mpmath')}
+                    if method == "Newton-Raphson":
+                        mp['df_mp'] = compiled.derivative(backend='mpmath')[1]
+                # f y f' fusionadas: una sola llamada por iteración
+                fdf = compiled.newton_kernel('math') if method == "Newton-Raphson" else None
+            f_scalar = stats.count('f', f_scalar, trace=True)
+            fdf = stats.count('fdf', fdf, trace=True)
+            mp = {k: stats.count(k, v, trace=k == 'f_mp') if k != 'precision' else v
+                  for k, v in mp.items()}
+            with stats.phase('solve'):
+                if method == "Bisección":
+                    result = bisection(f_scalar, a, b, tol, progress=task.check,
+                                       resume=resume, **mp)
+                elif method == "Falsa Posición":
+                    result = false_position(f_scalar, a, b, tol, progress=task.check,
+                                            resume=resume, **mp)
+                elif method in ("Brent", "ITP"):
+                    solver = brent if method == "Brent" else itp
+                    result = solver(f_scalar, a, b, tol, progress=task.check, resume=resume, **mp)
+                else:  # Newton-Raphson
+                    result = newton(None, None, x0, tol, progress=task.check, fdf=fdf,
+                                    resume=resume, **mp)
+            rows, final = stats.finish(result, tol)
+            store(key, final, rows)
+            return f, rows, final, (state_key, result)
+
+        def done(result):
+            f, rows, final, (state_key, state) = result
+            self.last_solves.pop(state_key, None)
+            self.last_solves[state_key] = state
+            if len(self.last_solves) > 32:
+                del self.last_solves[next(iter(self.last_solves))]
+            self.update_table(rows)
+            self.update_results(final)
+            self.plot_function(f, -10, 10, root=float(final['root']))
+
+        self.run_in_background(work, done)
 
     def on_export_csv(self):
         if not self.last_rows:
             messagebox.showinfo("Info", "No hay datos para exportar")
             return
-        file_path = filedialog.asksaveasfilename(defaultextension=".csv",
-                                                 filetypes=[("CSV files","*.csv")])
+        filetypes = [("CSV", "*.csv"), ("NumPy", "*.npy"), ("NumPy (por columnas)", "*.npz")]
+        if HAS_PYARROW:
+            filetypes += [("Parquet", "*.parquet"), ("Feather", "*.feather")]
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=filetypes)
         if not file_path:
             return
-        df = pd.DataFrame(self.last_rows)
-        df.to_csv(file_path, index=False)
+        # se escribe en bloques directamente desde el historial, con los encabezados de la tabla
+        try:
+            export_history(self.last_rows, file_path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", str(e))
+            return
         messagebox.showinfo("Éxito", f"Tabla exportada a {file_path}")
 
 # =======================
 # 🔹 Programa Principal
 # =======================
 def main():
+    # ttkbootstrap (y PIL) sólo al abrir la ventana: importar este módulo no los carga
+    from ttkbootstrap import Style
     style = Style(theme='cyborg')  # Tema azul oscuro moderno
     root = style.master
     app = RootFinderApp(root)
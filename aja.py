@@ -5,15 +5,19 @@ y teclado matemático virtual.
 """
 import sys
 import math
-import numpy as np
-import sympy as sp
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
-                               QHBoxLayout, QPushButton, QLabel, QTableWidget,
-                               QTableWidgetItem, QSplitter, QMessageBox, QFrame)
+                               QHBoxLayout, QPushButton, QLabel, QTableView,
+                               QSplitter, QMessageBox, QFrame)
 from PySide6.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtCore import Qt, QUrl
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+from PySide6.QtCore import Qt, QUrl, QAbstractTableModel, QModelIndex, QTimer
+
+from perezoso import preload
+from expresiones import compile_expression
+from grafica import PlotController, sample_function
+from historial import BRACKET_FIELDS, History, bisection_capacity
+
+# sympy y matplotlib se cargan en segundo plano después de mostrar la ventana
+WARM_UP_MODULES = ('numpy', 'sympy', 'matplotlib.figure', 'matplotlib.backends.backend_qt5agg')
 
 # ---------------------- BISECTION LOGIC ----------------------
 def bisection_method(f, a, b, tol=1e-6, max_iter=1000):
@@ -21,7 +25,7 @@ def bisection_method(f, a, b, tol=1e-6, max_iter=1000):
     fb = f(b)
     if fa * fb > 0:
         raise ValueError("f(a) y f(b) deben tener signos opuestos.")
-    rows = []
+    rows = History(BRACKET_FIELDS, bisection_capacity(a, b, tol, max_iter))
     for i in range(1, max_iter + 1):
         c = (a + b) / 2
         fc = f(c)
@@ -37,6 +41,41 @@ def bisection_method(f, a, b, tol=1e-6, max_iter=1000):
             fa = fc
     return rows, c, error
 
+# ---------------------- ITERATION TABLE MODEL ----------------------
+class IterationTableModel(QAbstractTableModel):
+    """
+    Modelo de la tabla de iteraciones leído directamente de `rows`.
+    QTableView sólo pide (y formatea) las celdas visibles, así que no se
+    crea un QTableWidgetItem por celda.
+    """
+    def __init__(self, headers, rows=()):
+        super().__init__()
+        self.headers = list(headers)
+        self.rows = rows
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return f"{self.rows[index.row()][index.column()]:.6g}"
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
 # ---------------------- MAIN APPLICATION ----------------------
 class BisectionApp(QMainWindow):
     def __init__(self):
@@ -93,21 +132,52 @@ class BisectionApp(QMainWindow):
 
         # ---------------------- DERECHA ----------------------
         right_splitter = QSplitter(Qt.Vertical)
+        self.right_splitter = right_splitter
 
-        # Gráfica
-        self.fig = Figure(figsize=(5,4))
-        self.canvas = FigureCanvas(self.fig)
-        right_splitter.addWidget(self.canvas)
+        # Gráfica: se crea cuando matplotlib termina de cargar (ver _warm_up)
+        self.fig = self.ax = self.canvas = self.plotter = None
+        self._pending_plot = None
+        self.plot_placeholder = QLabel("Cargando gráfica…")
+        self.plot_placeholder.setAlignment(Qt.AlignCenter)
+        right_splitter.addWidget(self.plot_placeholder)
 
         # Tabla de iteraciones
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels(["Iter","a","b","c","f(a)","f(b)","f(c)","Error"])
+        self.table_model = IterationTableModel(["Iter","a","b","c","f(a)","f(b)","f(c)","Error"])
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
+        # filas de alto fijo: la vista no mide cada fila al desplazarse
+        self.table.verticalHeader().setDefaultSectionSize(22)
         right_splitter.addWidget(self.table)
 
         main_layout.addLayout(left_frame, 3)
         main_layout.addWidget(right_splitter, 4)
 
+        self._warm_up()
+
+    def _warm_up(self):
+        """Importa sympy y matplotlib en un hilo; la ventana se muestra mientras tanto."""
+        self._preload = preload(*WARM_UP_MODULES)
+        self._warm_timer = QTimer(self)
+        self._warm_timer.timeout.connect(self._check_warm_up)
+        self._warm_timer.start(50)
+
+    def _check_warm_up(self):
+        if self._preload.is_alive():
+            return
+        self._warm_timer.stop()
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+        self.fig = Figure(figsize=(5,4))
+        self.canvas = FigureCanvas(self.fig)
+        self.ax = self.fig.add_subplot(111)
+        # la curva se crea una vez y se actualiza con set_data
+        self.plotter = PlotController(self.ax, self.canvas)
+        self.right_splitter.replaceWidget(0, self.canvas)
+        self.plot_placeholder.deleteLater()
+        if self._pending_plot is not None:
+            self._pending_plot()
+            self._pending_plot = None
+
     # ---------------------- METHODS ----------------------
     def html_template(self):
         # MathLive editable equation
@@ -136,13 +206,10 @@ class BisectionApp(QMainWindow):
         js = "document.getElementById('mf').getValue();"
         self.equation_input.page().runJavaScript(js, callback)
 
-    def parse_function(self, latex_str):
-        # Convierte latex a función numérica
-        x = sp.symbols('x')
+    def parse_function(self, latex_str, backend='numpy'):
+        # Convierte latex a función numérica (NumPy para graficar, math para iterar)
         try:
-            expr = sp.sympify(latex_str.replace('^','**'))
-            f = sp.lambdify(x, expr, modules=["numpy", {"sin": np.sin,"cos":np.cos,"tan":np.tan,"log":np.log,"exp":np.exp,"sqrt":np.sqrt}])
-            return f
+            return compile_expression(latex_str).kernel(backend)
         except Exception as e:
             QMessageBox.critical(self,"Error","No se pudo interpretar la ecuación:\n"+str(e))
             return None
@@ -154,25 +221,17 @@ class BisectionApp(QMainWindow):
                 return
             a = float(self.val_a.text())
             b = float(self.val_b.text())
-            xs = np.linspace(a,b,400)
-            ys = []
-            for xi in xs:
-                try:
-                    yi = f(xi)
-                except:
-                    yi = np.nan
-                ys.append(yi)
-            self.fig.clear()
-            ax = self.fig.add_subplot(111)
-            ax.plot(xs, ys, label="f(x)")
-            ax.axhline(0, color="black")
-            ax.legend()
-            self.canvas.draw()
+            if self.plotter is None:
+                # matplotlib todavía está cargando: se dibuja al terminar
+                self._pending_plot = lambda: self.plotter.plot(*sample_function(f, a, b))
+                return
+            xs, ys = sample_function(f, a, b)
+            self.plotter.plot(xs, ys)
         self.get_equation(callback)
 
     def calculate_bisection(self):
         def callback(latex_str):
-            f = self.parse_function(latex_str)
+            f = self.parse_function(latex_str, backend='math')
             if f is None:
                 return
             a = float(self.val_a.text())
@@ -183,11 +242,8 @@ class BisectionApp(QMainWindow):
             except Exception as e:
                 QMessageBox.critical(self,"Error","Bisección falló:\n"+str(e))
                 return
-            # Llenar tabla
-            self.table.setRowCount(len(rows))
-            for i, row in enumerate(rows):
-                for j, val in enumerate(row):
-                    self.table.setItem(i,j,QTableWidgetItem(f"{val:.6g}"))
+            # Llenar tabla (el modelo lee directamente las filas)
+            self.table_model.set_rows(rows)
             QMessageBox.information(self,"Resultado",
                                     f"Raíz aproximada: {root:.12g}\nError final: {error:.12g}\nTolerancia usada: {tol}")
 
@@ -0,0 +1,314 @@
+"""
+Analizador nativo de ecuaciones: tokenizador + parser de Pratt.
+
+Para las entradas habituales (`cos(x) = x`, `x^3-2*x-5`, `exp(-x)-x`) pasar
+por sympify cuesta decenas de milisegundos (más la importación de sympy).
+Este módulo reconoce la gramática que aceptan las interfaces y compila el
+árbol directamente a una función de Python sobre `math` o NumPy, en
+microsegundos:
+
+- números (`2`, `.5`, `1e-6`), x, parámetros de una letra (`k`, `a1`) y
+  las constantes pi, π y E (como en sympify, `e` es un parámetro)
+- + - * / % y ** (o ^), con la precedencia de Python; signo unario
+- √ como prefijo (`√x`, `√(x+1)`): toma el factor siguiente, como el signo
+- las funciones del teclado matemático (sin, cos, tan, exp, log, ln, log10,
+  sqrt, abs/Abs, floor, ceiling), sus inversas e hiperbólicas, atan2 y
+  log(x, base); también con el prefijo `sp.` que inserta el teclado
+
+Lo que no reconoce (multiplicación implícita, factorial, otras funciones o
+símbolos, errores de sintaxis) lanza `Unsupported`: `expresiones` vuelve
+entonces a sympify, que da el resultado (o el mensaje de error) de siempre.
+Los literales se compilan como float y las partes constantes se evalúan al
+compilar (`2**-1` vale 0.5, como en sympy); si una constante no tiene valor
+real finito (`1/0`, `sqrt(-1)`) o se divide por un cero literal, también se
+usa sympify.
+El árbol también se puede escribir como texto para sympify
+(`NativeExpression.sympy_text`), para derivar o mostrar la forma simbólica.
+"""
+import math
+import re
+
+from perezoso import lazy_import
+
+np = lazy_import('numpy')
+
+
+class Unsupported(ValueError):
+    """Construcción que el analizador nativo no maneja (se usa sympify)."""
+
+
+_TOKEN = re.compile(r"""
+    (?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>(?:sp\.)?[A-Za-z_]\w*|π)
+  | (?P<op>\*\*|[-+*/%^(),√!])
+  | (?P<space>\s+)
+""", re.VERBOSE)
+
+# nombre → (aridades, math, NumPy, sympy)
+_FUNCTIONS = {
+    'sin': ((1,), 'math.sin', 'np.sin', 'sin'),
+    'cos': ((1,), 'math.cos', 'np.cos', 'cos'),
+    'tan': ((1,), 'math.tan', 'np.tan', 'tan'),
+    'asin': ((1,), 'math.asin', 'np.arcsin', 'asin'),
+    'acos': ((1,), 'math.acos', 'np.arccos', 'acos'),
+    'atan': ((1,), 'math.atan', 'np.arctan', 'atan'),
+    'atan2': ((2,), 'math.atan2', 'np.arctan2', 'atan2'),
+    'sinh': ((1,), 'math.sinh', 'np.sinh', 'sinh'),
+    'cosh': ((1,), 'math.cosh', 'np.cosh', 'cosh'),
+    'tanh': ((1,), 'math.tanh', 'np.tanh', 'tanh'),
+    'asinh': ((1,), 'math.asinh', 'np.arcsinh', 'asinh'),
+    'acosh': ((1,), 'math.acosh', 'np.arccosh', 'acosh'),
+    'atanh': ((1,), 'math.atanh', 'np.arctanh', 'atanh'),
+    'exp': ((1,), 'math.exp', 'np.exp', 'exp'),
+    'sqrt': ((1,), 'math.sqrt', 'np.sqrt', 'sqrt'),
+    'log': ((1, 2), 'math.log', 'np.log', 'log'),
+    'ln': ((1,), 'math.log', 'np.log', 'log'),
+    'log10': ((1,), 'math.log10', 'np.log10', None),
+    'abs': ((1,), 'abs', 'np.abs', 'Abs'),
+    'Abs': ((1,), 'abs', 'np.abs', 'Abs'),
+    'floor': ((1,), 'math.floor', 'np.floor', 'floor'),
+    'ceiling': ((1,), 'math.ceil', 'np.ceil', 'ceiling'),
+}
+_CONSTANTS = {'pi': math.pi, 'π': math.pi, 'E': math.e}
+_SYMPY_CONSTANTS = {'pi': 'pi', 'π': 'pi', 'E': 'E'}
+# letras que sympify no convierte en símbolos (E es la constante)
+_RESERVED = {'I', 'N', 'O', 'Q', 'S'}
+_PARAMETER = re.compile(r'[A-Za-z](?:_?\d+)?')
+
+# potencias de enlace (las de Python)
+_INFIX = {'+': 10, '-': 10, '*': 20, '/': 20, '%': 20, '**': 40, '^': 40}
+_PREFIX = 30
+
+
+def tokenize(text):
+    """Lista de (tipo, valor) con tipo 'num', 'name' u 'op'; termina en ('end', None)."""
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if m is None:
+            raise Unsupported(f"Carácter no reconocido: {text[pos]!r}")
+        pos = m.end()
+        if m.lastgroup != 'space':
+            value = m.group()
+            if m.lastgroup == 'name' and value.startswith('sp.'):
+                value = value[3:]
+            tokens.append((m.lastgroup, value))
+    tokens.append(('end', None))
+    return tokens
+
+
+# =======================
+# 🔹 Parser de Pratt
+# =======================
+class _Parser:
+    """
+    Árbol de tuplas: ('num', texto), ('var', nombre), ('const', nombre),
+    ('neg', a), ('bin', op, a, b), ('call', función, [args]).
+    """
+
+    def __init__(self, text):
+        self.tokens = tokenize(text)
+        self.pos = 0
+        self.names = set()
+
+    def peek(self):
+        return self.tokens[self.pos]
+
+    def next(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def expect(self, value):
+        if self.next()[1] != value:
+            raise Unsupported(f"Se esperaba {value!r}")
+
+    def parse(self):
+        tree = self.expression(0)
+        if self.peek()[0] != 'end':
+            raise Unsupported("Texto sobrante al final de la expresión")
+        return tree
+
+    def expression(self, rbp):
+        left = self.prefix(*self.next())
+        while True:
+            kind, value = self.peek()
+            if kind in ('num', 'name') or value in ('(', '√'):
+                raise Unsupported("Multiplicación implícita")
+            lbp = _INFIX.get(value, 0) if kind == 'op' else 0
+            if lbp <= rbp:
+                return left
+            self.next()
+            op = '**' if value == '^' else value
+            # ** es asociativa a la derecha
+            right = self.expression(lbp - 1 if op == '**' else lbp)
+            left = ('bin', op, left, right)
+
+    def prefix(self, kind, value):
+        if kind == 'num':
+            return ('num', value)
+        if kind == 'name':
+            if self.peek()[1] == '(':
+                return self.call(value)
+            if value in _CONSTANTS:
+                return ('const', value)
+            if value == 'x' or (_PARAMETER.fullmatch(value) and value not in _RESERVED):
+                self.names.add(value)
+                return ('var', value)
+            raise Unsupported(f"Nombre desconocido: {value}")
+        if value == '(':
+            inner = self.expression(0)
+            self.expect(')')
+            return inner
+        if value == '-':
+            return ('neg', self.expression(_PREFIX))
+        if value == '+':
+            return self.expression(_PREFIX)
+        if value == '√':
+            return ('call', 'sqrt', [self.expression(_PREFIX)])
+        raise Unsupported(f"Token inesperado: {value!r}")
+
+    def call(self, name):
+        if name not in _FUNCTIONS:
+            raise Unsupported(f"Función desconocida: {name}")
+        self.expect('(')
+        args = [self.expression(0)]
+        while self.peek()[1] == ',':
+            self.next()
+            args.append(self.expression(0))
+        self.expect(')')
+        if len(args) not in _FUNCTIONS[name][0]:
+            raise Unsupported(f"{name} no acepta {len(args)} argumentos")
+        return ('call', name, args)
+
+
+# =======================
+# 🔹 Generación de código
+# =======================
+def _fold(node):
+    """
+    Árbol para math/NumPy: las subexpresiones constantes quedan evaluadas como
+    float. Lo que sympy resolvería de otra forma (división por cero, resultados
+    complejos o infinitos) lanza Unsupported para que la expresión use sympify.
+    """
+    kind = node[0]
+    if kind == 'var':
+        return node
+    if kind == 'const':
+        return ('num', _CONSTANTS[node[1]])
+    if kind == 'num':
+        if not math.isfinite(float(node[1])):
+            raise Unsupported("Literal infinito")
+        folded, children = ('num', float(node[1])), []
+    elif kind == 'neg':
+        children = [_fold(node[1])]
+        folded = ('neg', children[0])
+    elif kind == 'bin':
+        children = [_fold(node[2]), _fold(node[3])]
+        if node[1] in ('/', '%') and children[1] == ('num', 0.0):
+            raise Unsupported("División por cero")
+        folded = ('bin', node[1], *children)
+    else:
+        children = [_fold(arg) for arg in node[2]]
+        folded = ('call', node[1], children)
+    if any(child[0] != 'num' for child in children):
+        return folded
+    try:
+        value = eval(_emit(folded, 'math'), {'__builtins__': {'abs': abs}, 'math': math})
+    except (ArithmeticError, ValueError, TypeError):
+        raise Unsupported("Constante fuera del dominio") from None
+    if not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise Unsupported("Constante compleja o infinita")
+    return ('num', float(value))
+
+
+def _emit(node, dialect):
+    """Texto de Python del árbol para 'math', 'numpy' o 'sympy' (todo entre paréntesis)."""
+    kind = node[0]
+    if kind == 'num':
+        # en math/NumPy todo literal es float: 2**-1 es 0.5 y 1/x nunca es entera
+        if dialect == 'sympy':
+            return node[1]
+        # una constante plegada puede ser negativa: entre paréntesis para ** y -
+        value = float(node[1])
+        return f"({value!r})" if value < 0 else repr(value)
+    if kind == 'var':
+        return node[1]
+    if kind == 'const':
+        return _SYMPY_CONSTANTS[node[1]] if dialect == 'sympy' else repr(_CONSTANTS[node[1]])
+    if kind == 'neg':
+        return f"(-{_emit(node[1], dialect)})"
+    if kind == 'bin':
+        return f"({_emit(node[2], dialect)}{node[1]}{_emit(node[3], dialect)})"
+    name, args = node[1], [_emit(arg, dialect) for arg in node[2]]
+    _, f_math, f_np, f_sympy = _FUNCTIONS[name]
+    if dialect == 'sympy':
+        # sympify deja log10 como función sin definir (no se puede derivar): log(x, 10)
+        return f"log({args[0]}, 10)" if name == 'log10' else f"{f_sympy}({', '.join(args)})"
+    func = f_math if dialect == 'math' else f_np
+    if len(args) == 2 and name == 'log':
+        # log(x, base) = log(x)/log(base), como sympy
+        return f"({func}({args[0]})/{func}({args[1]}))"
+    return f"{func}({', '.join(args)})"
+
+
+class NativeExpression:
+    """Árbol de una expresión y sus funciones compiladas (en caché)."""
+
+    def __init__(self, text, tree, names):
+        self.text = text
+        self.tree = tree
+        self.numeric_tree = _fold(tree)
+        self.names = frozenset(names)
+        self._functions = {}
+
+    @property
+    def parameters(self):
+        """Nombres (ordenados) de los símbolos distintos de x."""
+        return tuple(sorted(self.names - {'x'}))
+
+    @property
+    def sympy_text(self):
+        """Texto equivalente que entiende sympify."""
+        return _emit(self.tree, 'sympy')
+
+    def function(self, backend='numpy', params=()):
+        """Función (x, *params) → valor sobre `math` (escalar) o NumPy (vectorizada)."""
+        key = (backend, tuple(params))
+        if key not in self._functions:
+            if backend not in ('math', 'numpy'):
+                raise ValueError(f"Backend no nativo: {backend!r}")
+            args = ', '.join(('x', *params))
+            namespace = {'__builtins__': {'abs': abs}, 'math': math, 'np': np}
+            self._functions[key] = eval(f"lambda {args}: {_emit(self.numeric_tree, backend)}", namespace)
+        return self._functions[key]
+
+
+def parse(text):
+    """NativeExpression de `text` (ya normalizado) o Unsupported."""
+    parser = _Parser(text)
+    try:
+        tree = parser.parse()
+    except RecursionError:
+        raise Unsupported("Expresión demasiado anidada") from None
+    return NativeExpression(text, tree, parser.names)
+
+
+def compile_native(text):
+    """Como `parse`, pero devuelve None si la expresión necesita sympify."""
+    try:
+        native = parse(text)
+        # compilar aquí: un fallo de Python (anidamiento extremo) también va a sympify
+        native.function('math', native.parameters)
+    except (Unsupported, RecursionError, SyntaxError):
+        return None
+    return native
+
+
+def evaluate(text):
+    """Valor (float) de una expresión sin variables, p. ej. una tolerancia '10^-6'."""
+    native = parse(text)
+    if native.names:
+        raise Unsupported("La expresión tiene variables")
+    return float(native.function('math')(0.0))
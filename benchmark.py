@@ -0,0 +1,330 @@
+"""
+Banco de pruebas de rendimiento de los métodos, sin interfaz gráfica.
+
+Resuelve un corpus de ecuaciones con raíz conocida (polinomios,
+trascendentes, rígidas y con raíces múltiples o casi múltiples) con cada
+variante del repositorio y mide, por método y ecuación: tiempo por
+resolución, evaluaciones de f (y f'), iteraciones, memoria pico y error
+respecto de la raíz conocida. También mide el tiempo de importación en frío
+del núcleo (metodos, expresiones, lotes) en un proceso nuevo. Los
+resultados se escriben en JSON para poder compararlos entre commits.
+
+    python benchmark.py -o bench.json
+    python benchmark.py --solvers metodos.brent metodos.itp --tol 1e-12
+    python benchmark.py --compare antes.json bench.json
+
+Las variantes de las interfaces (otro.py, a.py, aja.py) se importan si se
+puede; si falta una dependencia (PySide6, pantalla) se marcan 'skipped'.
+"""
+import argparse
+import importlib
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from expresiones import compile_expression
+
+# =======================
+# 🔹 Corpus de ecuaciones
+# =======================
+# root: raíz de referencia (mpmath, 30 dígitos) dentro de [a, b]; x0: inicio de Newton
+CORPUS = [
+    # polinomios
+    {'name': 'sqrt2', 'category': 'polinomio', 'equation': 'x^2 - 2',
+     'a': 0.0, 'b': 2.0, 'x0': 1.0, 'root': 1.4142135623730951},
+    {'name': 'wallis', 'category': 'polinomio', 'equation': 'x^3 - 2*x - 5',
+     'a': 2.0, 'b': 3.0, 'x0': 2.0, 'root': 2.0945514815423265},
+    {'name': 'quintic', 'category': 'polinomio', 'equation': 'x^5 - x - 1',
+     'a': 1.0, 'b': 2.0, 'x0': 1.0, 'root': 1.1673039782614187},
+    # trascendentes
+    {'name': 'dottie', 'category': 'trascendente', 'equation': 'cos(x) = x',
+     'a': 0.0, 'b': 1.0, 'x0': 1.0, 'root': 0.7390851332151607},
+    {'name': 'omega', 'category': 'trascendente', 'equation': 'exp(-x) - x',
+     'a': 0.0, 'b': 1.0, 'x0': 0.0, 'root': 0.5671432904097838},
+    {'name': 'lambert', 'category': 'trascendente', 'equation': 'x*exp(x) = 1',
+     'a': 0.0, 'b': 1.0, 'x0': 1.0, 'root': 0.5671432904097838},
+    {'name': 'euler', 'category': 'trascendente', 'equation': 'log(x) = 1',
+     'a': 1.0, 'b': 4.0, 'x0': 1.0, 'root': 2.718281828459045},
+    {'name': 'pi6', 'category': 'trascendente', 'equation': 'sin(x) = 0.5',
+     'a': 0.0, 'b': 1.5, 'x0': 0.0, 'root': 0.5235987755982989},
+    # rígidas: pendiente muy grande o muy chica lejos de la raíz
+    {'name': 'atan_step', 'category': 'rígida', 'equation': 'atan(50*(x - 0.3))',
+     'a': 0.0, 'b': 1.0, 'x0': 0.35, 'root': 0.3},
+    {'name': 'exp_wall', 'category': 'rígida', 'equation': 'exp(20*x) - 100000',
+     'a': 0.0, 'b': 1.0, 'x0': 1.0, 'root': 0.5756462732485115},
+    {'name': 'flat_power', 'category': 'rígida', 'equation': 'x^20 - 0.5',
+     'a': 0.0, 'b': 1.5, 'x0': 1.2, 'root': 0.9659363289248456},
+    # raíces múltiples o casi múltiples
+    {'name': 'triple', 'category': 'múltiple', 'equation': '(x - 1)^3',
+     'a': 0.0, 'b': 3.0, 'x0': 2.0, 'root': 1.0},
+    {'name': 'close_pair', 'category': 'múltiple', 'equation': '(x - 1)*(x - 1.001)',
+     'a': 0.5, 'b': 1.0005, 'x0': 0.5, 'root': 1.0},
+    {'name': 'tan_fixed', 'category': 'múltiple', 'equation': 'tan(x) = x',
+     'a': 4.4, 'b': 4.6, 'x0': 4.6, 'root': 4.493409457909064},
+]
+
+
+# =======================
+# 🔹 Variantes a medir
+# =======================
+class Counted:
+    """Envuelve una función y cuenta sus llamadas."""
+    __slots__ = ('func', 'calls')
+
+    def __init__(self, func):
+        self.func = func
+        self.calls = 0
+
+    def __call__(self, x):
+        self.calls += 1
+        return self.func(x)
+
+
+def _metodos(name):
+    def load():
+        solver = getattr(importlib.import_module('metodos'), name)
+
+        def run(case, tol, max_iter, funcs):
+            res = solver(funcs['f'], case['a'], case['b'], tol, max_iter)
+            return res.root, res.iterations
+        return run
+    return load
+
+
+def _newton(fused):
+    def load():
+        from metodos import newton
+
+        def run(case, tol, max_iter, funcs):
+            if fused:
+                res = newton(None, None, case['x0'], tol, max_iter, fdf=funcs['fdf'])
+            else:
+                res = newton(funcs['f'], funcs['df'], case['x0'], tol, max_iter)
+            return res.root, res.iterations
+        return run
+    return load
+
+
+def _otro():
+    from otro import bisection
+
+    def run(case, tol, max_iter, funcs):
+        res = bisection(funcs['f'], case['a'], case['b'], tol, max_iter)
+        return res.root, res.iterations
+    return run
+
+
+def _aja():
+    from aja import bisection_method
+
+    def run(case, tol, max_iter, funcs):
+        rows, root, _ = bisection_method(funcs['f'], case['a'], case['b'], tol, max_iter)
+        return root, len(rows)
+    return run
+
+
+def _a():
+    from a import biseccion
+
+    def run(case, tol, max_iter, funcs):
+        # biseccion recibe el texto y compila por su cuenta: sin conteo de evaluaciones
+        tabla, raiz, _ = biseccion(case['equation'], case['a'], case['b'], tol, max_iter)
+        return raiz, len(tabla)
+    return run
+
+
+SOLVERS = {
+    'metodos.bisection': _metodos('bisection'),
+    'metodos.false_position': _metodos('false_position'),
+    'metodos.brent': _metodos('brent'),
+    'metodos.itp': _metodos('itp'),
+    'metodos.newton': _newton(fused=False),
+    'metodos.newton_fused': _newton(fused=True),
+    'otro.bisection': _otro,
+    'aja.bisection_method': _aja,
+    'a.biseccion': _a,
+}
+
+
+# =======================
+# 🔹 Medición
+# =======================
+def _kernels(case):
+    compiled = compile_expression(case['equation'])
+    return {'f': compiled.kernel('math'),
+            'df': compiled.derivative(backend='math')[1],
+            'fdf': compiled.newton_kernel('math')}
+
+
+def measure(run, case, tol, max_iter, repeat):
+    """Mide una variante sobre un caso; devuelve el dict de resultados."""
+    kernels = _kernels(case)
+    # 1) corrida contada: evaluaciones, iteraciones y exactitud
+    counted = {k: Counted(v) for k, v in kernels.items()}
+    root, iterations = run(case, tol, max_iter, counted)
+    evals = counted['f'].calls + counted['fdf'].calls
+    d_evals = counted['df'].calls + counted['fdf'].calls
+    # 2) memoria pico de una resolución
+    tracemalloc.start()
+    run(case, tol, max_iter, kernels)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    # 3) tiempo: mejor de `repeat` tandas, cada una de al menos ~20 ms
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            run(case, tol, max_iter, kernels)
+        elapsed = time.perf_counter() - t0
+        if elapsed >= 0.02 or number >= 100_000:
+            break
+        number *= 4
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            run(case, tol, max_iter, kernels)
+        times.append((time.perf_counter() - t0) / number)
+    root = float(root)
+    return {'status': 'ok', 'time_us': min(times) * 1e6,
+            'time_median_us': float(np.median(times)) * 1e6,
+            'f_evals': evals, 'df_evals': d_evals, 'iterations': int(iterations),
+            'peak_kib': peak / 1024, 'root': root,
+            'abs_error': abs(root - case['root'])}
+
+
+def run_benchmark(solvers=None, cases=None, tol=1e-10, max_iter=1000, repeat=5,
+                  log=None):
+    """Corre las variantes pedidas (todas por defecto) sobre el corpus."""
+    results = []
+    for name in solvers or SOLVERS:
+        try:
+            run = SOLVERS[name]()
+        except Exception as e:  # dependencia ausente, sin pantalla, etc.
+            results.append({'solver': name, 'case': None, 'status': 'skipped',
+                            'message': f"{type(e).__name__}: {e}"})
+            if log:
+                log(f"{name}: omitido ({type(e).__name__}: {e})")
+            continue
+        for case in cases or CORPUS:
+            row = {'solver': name, 'case': case['name'], 'category': case['category']}
+            try:
+                row.update(measure(run, case, tol, max_iter, repeat))
+            except Exception as e:
+                row.update({'status': 'error', 'message': f"{type(e).__name__}: {e}"})
+            results.append(row)
+        if log:
+            log(_summary_line(name, [r for r in results if r['solver'] == name]))
+    return results
+
+
+def _summary_line(name, rows):
+    ok = [r for r in rows if r['status'] == 'ok']
+    if not ok:
+        return f"{name}: sin resultados"
+    return (f"{name:26s} casos={len(ok):2d}/{len(rows):2d}  "
+            f"tiempo_mediano={np.median([r['time_us'] for r in ok]):9.2f} µs  "
+            f"evaluaciones={sum(r['f_evals'] for r in ok):6d}  "
+            f"error_máx={max(r['abs_error'] for r in ok):.2e}")
+
+
+CORE_MODULES = ('metodos', 'expresiones', 'lotes')
+
+
+def import_times(modules=CORE_MODULES, repeat=3):
+    """Milisegundos de importar cada módulo en un intérprete nuevo (mejor de `repeat`)."""
+    times = {}
+    for name in modules:
+        code = ("import time; t = time.perf_counter(); import " + name +
+                "; print(time.perf_counter() - t)")
+        best = None
+        for _ in range(repeat):
+            out = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                                 text=True, timeout=120)
+            if out.returncode != 0:
+                break
+            t = float(out.stdout.strip().splitlines()[-1]) * 1e3
+            best = t if best is None else min(best, t)
+        times[name] = best
+    return times
+
+
+def _metadata(tol, max_iter, repeat):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {'commit': commit, 'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'numpy': np.__version__,
+            'platform': platform.platform(), 'tol': tol, 'max_iter': max_iter,
+            'repeat': repeat}
+
+
+# =======================
+# 🔹 Comparación entre corridas
+# =======================
+def compare(old_path, new_path, out=sys.stdout):
+    """Tabla de cambios (tiempo y evaluaciones) entre dos archivos de resultados."""
+    with open(old_path, encoding='utf-8') as fh:
+        old = json.load(fh)
+    with open(new_path, encoding='utf-8') as fh:
+        new = json.load(fh)
+    before = {(r['solver'], r['case']): r for r in old['results'] if r['status'] == 'ok'}
+    print(f"{old['meta'].get('commit')} → {new['meta'].get('commit')}", file=out)
+    print(f"{'método':26s} {'caso':12s} {'tiempo':>10s} {'evals':>12s}", file=out)
+    for r in new['results']:
+        prev = before.get((r['solver'], r['case']))
+        if r['status'] != 'ok' or prev is None:
+            continue
+        ratio = r['time_us'] / prev['time_us'] if prev['time_us'] else float('nan')
+        print(f"{r['solver']:26s} {r['case']:12s} {ratio:9.2f}x "
+              f"{prev['f_evals']:5d} → {r['f_evals']:<5d}", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Banco de pruebas de los métodos de raíces.')
+    parser.add_argument('-o', '--output', default='-',
+                        help="archivo JSON de resultados ('-' = salida estándar)")
+    parser.add_argument('--solvers', nargs='+', choices=sorted(SOLVERS),
+                        help='variantes a medir (todas por defecto)')
+    parser.add_argument('--cases', nargs='+', choices=[c['name'] for c in CORPUS],
+                        help='ecuaciones del corpus (todas por defecto)')
+    parser.add_argument('--tol', type=float, default=1e-10)
+    parser.add_argument('--max-iter', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='tandas de tiempo por caso (se informa la mejor)')
+    parser.add_argument('--compare', nargs=2, metavar=('ANTES', 'DESPUES'),
+                        help='comparar dos archivos de resultados y salir')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    cases = [c for c in CORPUS if not args.cases or c['name'] in args.cases]
+    log = lambda msg: print(msg, file=sys.stderr)
+    results = run_benchmark(args.solvers, cases, args.tol, args.max_iter,
+                            max(1, args.repeat), log=log)
+    meta = _metadata(args.tol, args.max_iter, args.repeat)
+    meta['import_ms'] = import_times()
+    log("importación en frío: " + ", ".join(
+        f"{k} {'-' if v is None else f'{v:.1f} ms'}" for k, v in meta['import_ms'].items()))
+    report = {'meta': meta, 'results': results}
+    text = json.dumps(report, ensure_ascii=False, indent=1)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            fh.write(text + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
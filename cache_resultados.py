@@ -0,0 +1,350 @@
+"""
+Caché persistente de resultados (SQLite).
+
+Las mismas combinaciones (ecuación, intervalo, tolerancia, método) se
+resuelven una y otra vez, entre sesiones y en los lotes. Antes de llamar a
+un método, las interfaces y `lotes` consultan esta caché con una clave
+(`result_key`) armada con el texto normalizado de la ecuación y los
+parámetros; si está, se devuelve sin resolver.
+
+Cada entrada guarda root, error, iterations y f_root y, opcionalmente, el
+historial de iteraciones (arreglo estructurado en formato .npy). El archivo
+tiene un tamaño máximo: al pasarlo se borran las entradas usadas hace más
+tiempo (LRU). Delante de SQLite hay un nivel en memoria con las últimas
+entradas, así que una consulta repetida no toca el disco.
+
+El nivel en disco es opcional: se activa con la variable de entorno
+METODOS_RESULT_CACHE (una ruta, o 'on' para ~/.cache/metodos/resultados.sqlite3).
+Sin ella la caché vive sólo en memoria durante la sesión; 'off' la desactiva.
+
+Las claves llevan `SOLVER_VERSION`, que se incrementa cada vez que cambian
+los resultados de los métodos (correcciones): al abrir un archivo de otra
+versión se vacía, así que nunca se sirven resultados de una versión anterior.
+"""
+import atexit
+import io
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from decimal import Decimal
+
+from expresiones import normalize_equation
+from historial import History
+from perezoso import lazy_import
+
+np = lazy_import('numpy')
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'metodos', 'resultados.sqlite3')
+FINAL_FIELDS = ('root', 'error', 'iterations', 'f_root')
+# incrementar cuando cambie lo que devuelve algún método para el mismo problema
+SOLVER_VERSION = 2
+
+# columnas sin tipo: SQLite guarda float como REAL y Decimal (como texto) tal cual
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    root, error, iterations INTEGER, f_root,
+    history BLOB,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value);
+"""
+
+
+def result_key(equation, method, a=None, b=None, x0=None, tol=1e-6, max_iter=1000,
+               digits=None, backend='math'):
+    """
+    Clave de un problema: mismo texto normalizado y mismos parámetros → misma
+    clave. `backend` es el núcleo con que se evaluó f ('math' en los métodos
+    escalares, 'numpy' en los lotes vectorizados): pueden diferir en el redondeo.
+    """
+    num = lambda v: None if v is None or v == '' else repr(float(v))
+    return '|'.join([f"v{SOLVER_VERSION}", normalize_equation(equation), method, str(num(a)), str(num(b)),
+                     str(num(x0)), num(tol), str(int(max_iter)),
+                     str(None if digits is None else int(digits)), backend])
+
+
+class CachedResult:
+    """Resultado guardado; se desempaqueta como SolveResult: `rows, final = ...`."""
+    __slots__ = ('history', 'final')
+    stats = None
+
+    def __init__(self, final, history=None):
+        self.final = final
+        self.history = history
+
+    root = property(lambda self: self.final['root'])
+    error = property(lambda self: self.final['error'])
+    iterations = property(lambda self: self.final['iterations'])
+    f_root = property(lambda self: self.final['f_root'])
+
+    def __iter__(self):
+        yield self.history
+        yield self.final
+
+
+def _dump_history(rows):
+    """Historial → bytes .npy, o None si no se puede (filas mpmath con objetos)."""
+    if rows is None:
+        return None
+    array = rows.array if isinstance(rows, History) else np.asarray(rows)
+    if array.dtype.hasobject:
+        return None
+    buf = io.BytesIO()
+    np.save(buf, array, allow_pickle=False)
+    return buf.getvalue()
+
+
+def _load_history(blob):
+    return History.from_array(np.load(io.BytesIO(blob), allow_pickle=False))
+
+
+def _to_db(v):
+    if isinstance(v, Decimal):
+        return str(v)
+    return v if v is None or isinstance(v, int) else float(v)
+
+
+def _from_db(v):
+    # precisión extendida: se guardó como texto
+    return Decimal(v) if isinstance(v, str) else v
+
+
+class ResultCache:
+    def __init__(self, path=DEFAULT_PATH, max_bytes=64 << 20, max_entries=100_000,
+                 memory_size=256):
+        """
+        - path: archivo SQLite (':memory:' para una caché sólo de esta sesión)
+        - max_bytes / max_entries: al pasarlos se borran las entradas menos usadas
+        - memory_size: entradas recientes que se sirven sin consultar SQLite
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+        # last_used pendientes de escribir (los aciertos en memoria no tocan el disco)
+        self._touched = {}
+        self._lock = threading.RLock()
+        self.hits = self.memory_hits = self.misses = self.puts = self.evictions = 0
+        # tamaño aproximado del archivo (otros procesos también escriben): se
+        # recalcula de verdad antes de desalojar
+        self._count = self._bytes = 0
+        self._db = self._open(path)
+
+    def _open(self, path):
+        try:
+            if path != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            db = sqlite3.connect(path, timeout=30, isolation_level=None,
+                                 check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.executescript(_SCHEMA)
+            row = db.execute("SELECT value FROM meta WHERE name = 'solver_version'").fetchone()
+            if row is None or row[0] != SOLVER_VERSION:
+                # archivo de otra versión de los métodos: sus resultados ya no valen
+                db.execute('DELETE FROM results')
+                db.execute("INSERT OR REPLACE INTO meta VALUES ('solver_version', ?)",
+                           (SOLVER_VERSION,))
+            self._count, self._bytes = db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results').fetchone()
+        except (OSError, sqlite3.Error):
+            # sin disco (sólo lectura, bloqueado): queda el nivel en memoria
+            return None
+        return db
+
+    # --------------------------
+    # Consulta y guardado
+    # --------------------------
+    def get(self, key, history=False):
+        """CachedResult de `key` o None; con history=True sólo si se guardó el historial."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and (entry.history is not None or not history):
+                self._memory.move_to_end(key)
+                self._touched[key] = time.time()
+                self.hits += 1
+                self.memory_hits += 1
+                return entry
+            row = None
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        'SELECT root, error, iterations, f_root, history FROM results '
+                        'WHERE key = ?', (key,)).fetchone()
+                except sqlite3.Error:
+                    row = None
+            if row is None or (history and row[4] is None):
+                self.misses += 1
+                return None
+            final = dict(zip(FINAL_FIELDS, map(_from_db, row[:4])))
+            entry = CachedResult(final, _load_history(row[4]) if row[4] is not None else None)
+            self._remember(key, entry)
+            self._touched[key] = time.time()
+            self.hits += 1
+            return entry
+
+    def put(self, key, final, rows=None):
+        """Guarda los campos de `final` (y el historial `rows`, si se da) bajo `key`."""
+        final = {k: final.get(k) for k in FINAL_FIELDS}
+        blob = _dump_history(rows)
+        entry = CachedResult(final, _load_history(blob) if blob is not None else None)
+        with self._lock:
+            self._remember(key, entry)
+            self.puts += 1
+            if self._db is None:
+                return entry
+            size = len(key) + 64 + (len(blob) if blob is not None else 0)
+            try:
+                old = self._db.execute('SELECT size FROM results WHERE key = ?',
+                                       (key,)).fetchone()
+                self._count += old is None
+                self._bytes += size - (old[0] if old else 0)
+                self._db.execute(
+                    'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (key, *(_to_db(final[k]) for k in FINAL_FIELDS), blob, size, time.time()))
+                self._touched.pop(key, None)
+                self.flush()
+                if self._count > self.max_entries or self._bytes > self.max_bytes:
+                    self._evict()
+            except sqlite3.Error:
+                pass
+        return entry
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    # --------------------------
+    # Mantenimiento
+    # --------------------------
+    def flush(self):
+        """Escribe los last_used pendientes de los aciertos."""
+        with self._lock:
+            if not self._touched or self._db is None:
+                self._touched.clear()
+                return
+            touched, self._touched = self._touched, {}
+            try:
+                with self._transaction():
+                    self._db.executemany('UPDATE results SET last_used = ? WHERE key = ?',
+                                         [(t, k) for k, t in touched.items()])
+            except sqlite3.Error:
+                pass
+
+    @contextmanager
+    def _transaction(self):
+        # una sola transacción para muchas filas (la conexión está en autocommit)
+        self._db.execute('BEGIN')
+        try:
+            yield
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+        self._db.execute('COMMIT')
+
+    def _evict(self):
+        """Borra las entradas menos usadas hasta quedar al 90 % de los límites."""
+        count, total = self._db.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results').fetchone()
+        self._count, self._bytes = count, total
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        want_count, want_bytes = int(0.9 * self.max_entries), int(0.9 * self.max_bytes)
+        doomed = []
+        for key, size in self._db.execute('SELECT key, size FROM results ORDER BY last_used'):
+            if count <= want_count and total <= want_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        with self._transaction():
+            self._db.executemany('DELETE FROM results WHERE key = ?', doomed)
+        self._count, self._bytes = count, total
+        for (key,) in doomed:
+            self._memory.pop(key, None)
+        self.evictions += len(doomed)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM results')
+            self._count = self._bytes = 0
+            self.hits = self.memory_hits = self.misses = self.puts = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            entries = size = 0
+            if self._db is not None:
+                entries, size = self._db.execute(
+                    'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results').fetchone()
+            lookups = self.hits + self.misses
+            return {'hits': self.hits, 'memory_hits': self.memory_hits,
+                    'misses': self.misses, 'hit_rate': self.hits / lookups if lookups else 0.0,
+                    'puts': self.puts, 'evictions': self.evictions,
+                    'entries': entries, 'bytes': size, 'path': self.path}
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+# =======================
+# 🔹 Caché compartida del proceso
+# =======================
+_cache = None
+_cache_pid = None
+
+
+def cache_path():
+    """Ruta según METODOS_RESULT_CACHE: ':memory:' si no está, None si está desactivada."""
+    path = os.environ.get('METODOS_RESULT_CACHE')
+    if path is None:
+        return ':memory:'
+    if path.strip().lower() in ('', 'off', '0', 'none'):
+        return None
+    if path.strip().lower() in ('on', '1', 'yes'):
+        return DEFAULT_PATH
+    return path
+
+
+def default_cache():
+    """Caché de este proceso (una conexión por proceso de los lotes); None si está desactivada."""
+    global _cache, _cache_pid
+    path = cache_path()
+    if path is None:
+        return None
+    if _cache is None or _cache_pid != os.getpid() or _cache.path != path:
+        _cache, _cache_pid = ResultCache(path), os.getpid()
+        atexit.register(_cache.flush)
+    return _cache
+
+
+def lookup(key, history=False):
+    """Resultado guardado de `key` o None (también si la caché está desactivada)."""
+    cache = default_cache()
+    return cache.get(key, history) if cache is not None else None
+
+
+def store(key, final, rows=None):
+    cache = default_cache()
+    if cache is not None:
+        cache.put(key, final, rows)
+
+
+def cache_stats():
+    cache = default_cache()
+    return cache.stats() if cache is not None else None
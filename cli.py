@@ -0,0 +1,203 @@
+"""
+Resolución por lotes desde la línea de comandos, sin interfaz gráfica.
+
+Lee problemas en CSV o JSONL (un problema por fila/línea, con los campos
+equation, a, b, x0, tol, method, max_iter y, opcionalmente, digits y stats) y escribe una línea de
+resultado por problema en cuanto se resuelve, en el mismo orden. Los
+problemas ya resueltos antes salen de la caché de resultados (--no-cache
+para resolver todo de nuevo); entre ejecuciones sólo si está activado el
+nivel en disco (METODOS_RESULT_CACHE=on o una ruta).
+
+    python cli.py problemas.jsonl -o resultados.csv --workers 4
+    cat problemas.csv | python cli.py - --input-format csv
+
+Con --sweep se resuelve una familia de ecuaciones con un parámetro en lugar
+de leer problemas:
+
+    python cli.py --sweep "x^3 - k*x - 5" --values 0:10:10000 -a 0 -b 10 -o barrido.csv
+    python cli.py --sweep "x^3 - k*x - c" --param k --set c=5 --values 1,2,3 --x0 2
+
+La salida también puede ser .npy, .npz, .parquet o .feather (los dos
+últimos con pyarrow): se escribe por bloques, sin juntar todos los
+resultados en memoria, y se lee con `exportar.read_table`. En los formatos
+binarios las columnas numéricas son float64: los resultados de problemas con
+digits (Decimal) se redondean a float; para conservar sus dígitos use .csv.
+"""
+import argparse
+import csv
+import json
+import sys
+from collections import deque
+
+from exportar import BINARY_FORMATS, FORMATS, HAS_PYARROW, TableWriter
+from instrumentacion import STATS_FIELDS
+from lotes import METHODS, solve_many, solve_sweep
+
+OUTPUT_FIELDS = ['equation', 'method', 'root', 'error', 'iterations', 'f_root',
+                 'status', 'message']
+SWEEP_FIELDS = ['root', 'error', 'iterations', 'f_root', 'converged']
+
+
+def _detect_format(path, explicit):
+    if explicit:
+        return explicit
+    ext = path[path.rfind('.'):].lower() if '.' in path else ''
+    return FORMATS.get(ext, 'jsonl')
+
+
+def read_problems(stream, fmt, defaults):
+    """Genera los problemas de uno en uno, completando con los valores por defecto."""
+    if fmt == 'csv':
+        rows = csv.DictReader(stream)
+    else:
+        rows = (json.loads(line) for line in stream if line.strip())
+    for row in rows:
+        problem = dict(defaults)
+        problem.update({k: v for k, v in row.items() if v not in (None, '')})
+        yield problem
+
+
+class ResultWriter:
+    def __init__(self, stream, fmt, fields=OUTPUT_FIELDS):
+        self.stream = stream
+        self.fmt = fmt
+        if fmt == 'csv':
+            self._csv = csv.DictWriter(stream, fieldnames=fields,
+                                       extrasaction='ignore')
+            self._csv.writeheader()
+
+    def write(self, result):
+        if self.fmt == 'csv':
+            self._csv.writerow(result)
+        else:
+            self.stream.write(json.dumps(result, ensure_ascii=False) + '\n')
+        self.stream.flush()
+
+    def close(self):
+        if self.stream is not sys.stdout:
+            self.stream.close()
+
+
+def open_writer(path, fmt, fields):
+    """ResultWriter (CSV/JSONL, también a la salida estándar) o TableWriter (binarios)."""
+    if fmt in BINARY_FORMATS:
+        if path == '-':
+            raise ValueError(f"El formato {fmt} necesita un archivo de salida (-o)")
+        return TableWriter(path, fields, fmt)
+    stream = sys.stdout if path == '-' else open(path, 'w', newline='', encoding='utf-8')
+    return ResultWriter(stream, fmt, fields)
+
+
+def parse_values(text):
+    """'inicio:fin:cantidad' (equiespaciados, con los extremos) o 'v1,v2,...'."""
+    if ':' in text:
+        start, stop, num = text.split(':')
+        num = int(num)
+        step = (float(stop) - float(start)) / (num - 1) if num > 1 else 0.0
+        return [float(start) + i * step for i in range(num)]
+    return [float(v) for v in text.split(',') if v.strip()]
+
+
+def run_sweep(args, out_fmt):
+    fixed = {}
+    for item in args.set:
+        name, _, value = item.partition('=')
+        fixed[name.strip()] = float(value)
+    values = parse_values(args.values)
+    res = solve_sweep(args.sweep, values, args.param, args.a, args.b, args.x0, args.tol,
+                      args.max_iter, fixed)
+    param = res['param']
+    writer = open_writer(args.output, out_fmt, [param] + SWEEP_FIELDS)
+    try:
+        for i, k in enumerate(values):
+            row = {name: res[name][i].item() for name in SWEEP_FIELDS}
+            writer.write({param: k, **row})
+    finally:
+        writer.close()
+    failed = len(values) - int(res['converged'].sum())
+    print(f"{len(values)} valores, {failed} sin converger, {res['cold']} resueltos en frío",
+          file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Buscador de raíces por lotes (sin interfaz).')
+    parser.add_argument('input', nargs='?', default='-',
+                        help="archivo CSV/JSONL de problemas ('-' = entrada estándar)")
+    parser.add_argument('-o', '--output', default='-',
+                        help="archivo de resultados ('-' = salida estándar)")
+    parser.add_argument('--input-format', choices=['csv', 'jsonl'])
+    parser.add_argument('--output-format', choices=['csv', 'jsonl', *BINARY_FORMATS])
+    parser.add_argument('--method', choices=sorted(METHODS), default='bisection',
+                        help='método si la fila no indica uno')
+    parser.add_argument('--tol', type=float, default=1e-6,
+                        help='tolerancia si la fila no indica una')
+    parser.add_argument('--max-iter', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=1,
+                        help='procesos en paralelo (1 = en este proceso)')
+    parser.add_argument('--chunksize', type=int, default=64)
+    parser.add_argument('--stats', action='store_true',
+                        help='agregar evaluaciones, tiempos y orden de convergencia')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='no consultar ni guardar en la caché de resultados')
+    sweep = parser.add_argument_group('barrido de un parámetro')
+    sweep.add_argument('--sweep', metavar='ECUACION',
+                       help='familia de ecuaciones con parámetros (p. ej. "x^3 - k*x - 5")')
+    sweep.add_argument('--param', help='parámetro que se barre (si hay más de uno)')
+    sweep.add_argument('--values', default='0:1:101',
+                       help="valores del parámetro: 'inicio:fin:cantidad' o 'v1,v2,...'")
+    sweep.add_argument('--set', action='append', default=[], metavar='NOMBRE=VALOR',
+                       help='valor fijo de otro parámetro (se puede repetir)')
+    sweep.add_argument('-a', type=float, help='extremo izquierdo (bisección)')
+    sweep.add_argument('-b', type=float, help='extremo derecho (bisección)')
+    sweep.add_argument('--x0', type=float, help='punto inicial (Newton)')
+    args = parser.parse_args(argv)
+
+    defaults = {'method': args.method, 'tol': args.tol, 'max_iter': args.max_iter}
+    if args.stats:
+        defaults['stats'] = True
+    if args.no_cache:
+        defaults['cache'] = False
+    in_fmt = _detect_format(args.input, args.input_format)
+    out_fmt = _detect_format(args.output, args.output_format)
+    if out_fmt in BINARY_FORMATS and args.output == '-':
+        parser.error(f'el formato {out_fmt} necesita un archivo de salida (-o)')
+    if out_fmt in ('parquet', 'feather') and not HAS_PYARROW:
+        parser.error(f'el formato {out_fmt} necesita pyarrow (pip install pyarrow)')
+    if args.sweep:
+        if args.x0 is None and (args.a is None or args.b is None):
+            parser.error('--sweep necesita -a y -b, o --x0')
+        return run_sweep(args, out_fmt)
+
+    fin = sys.stdin if args.input == '-' else open(args.input, newline='', encoding='utf-8')
+    fields = OUTPUT_FIELDS[:-2] + STATS_FIELDS + OUTPUT_FIELDS[-2:] if args.stats else OUTPUT_FIELDS
+    writer = None
+    solved = failed = cached = 0
+    try:
+        writer = open_writer(args.output, out_fmt, fields)
+        problems = read_problems(fin, in_fmt, defaults)
+        # se conservan equation/method de cada problema para la salida
+        echo = deque()
+
+        def tracked():
+            for p in problems:
+                echo.append((p.get('equation'), p.get('method')))
+                yield p
+
+        for result in solve_many(tracked(), workers=args.workers, chunksize=args.chunksize):
+            equation, method = echo.popleft()
+            solved += 1
+            failed += result['status'] != 'ok'
+            cached += bool(result.pop('cached', False))
+            writer.write({'equation': equation, 'method': method, **result})
+    finally:
+        if fin is not sys.stdin:
+            fin.close()
+        if writer is not None:
+            writer.close()
+    print(f"{solved} problemas, {failed} con error, {cached} desde la caché", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
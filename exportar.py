@@ -0,0 +1,285 @@
+"""
+Exportación en flujo de historiales de iteración y resultados por lotes.
+
+`TableWriter` escribe una tabla fila a fila (o por bloques de un arreglo)
+sin armarla entera en memoria. El formato sale de la extensión:
+
+- .csv             texto, con encabezados; cada bloque se escribe al llegar
+- .npy             arreglo estructurado (una columna por campo)
+- .npz             un arreglo .npy por columna, dentro de un zip
+- .parquet         Parquet, por grupos de filas (necesita pyarrow)
+- .feather/.arrow  Arrow IPC, por lotes (necesita pyarrow)
+
+Los formatos binarios se leen con `read_table` sin interpretar texto. En
+.npy/.npz el tamaño final no se conoce hasta cerrar: los bloques se guardan
+en un archivo temporal y al cerrar se copian uno por uno al destino (la
+memoria usada es la de un bloque). Las columnas numéricas quedan en float64
+aunque traigan Decimal (filas en precisión extendida): esos valores se
+redondean a float y sus dígitos extra solo se conservan en .csv. Las columnas
+de texto se guardan como cadenas de ancho fijo.
+
+`export_history` exporta un historial con los mismos encabezados que la
+tabla de la interfaz (`historial.headers_for`).
+"""
+import csv
+import os
+from decimal import Decimal
+import tempfile
+import zipfile
+from importlib.util import find_spec
+
+from historial import History, headers_for
+from perezoso import lazy_import
+
+np = lazy_import('numpy')
+
+HAS_PYARROW = find_spec('pyarrow') is not None
+
+FORMATS = {'.csv': 'csv', '.npy': 'npy', '.npz': 'npz', '.parquet': 'parquet',
+           '.feather': 'feather', '.arrow': 'feather'}
+BINARY_FORMATS = ('npy', 'npz', 'parquet', 'feather')
+CHUNK_ROWS = 65536
+
+
+def detect_format(path, explicit=None):
+    if explicit:
+        return explicit
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Extensión no reconocida: {path} (use {', '.join(FORMATS)})")
+    return fmt
+
+
+# =======================
+# 🔹 Bloques de filas → arreglos
+# =======================
+def _column(values):
+    """Arreglo de una columna: int, float (None → NaN, Decimal → float) o texto."""
+    numeric = (int, float, Decimal, np.number)
+    if all(v is None or (isinstance(v, numeric) and not isinstance(v, bool)) for v in values):
+        if all(isinstance(v, (int, np.integer)) for v in values):
+            return np.array(values, dtype='i8')
+        return np.array([np.nan if v is None else float(v) for v in values], dtype='f8')
+    if all(isinstance(v, (bool, np.bool_)) for v in values):
+        return np.array(values, dtype='?')
+    return np.array(['' if v is None else str(v) for v in values], dtype='U')
+
+
+def _chunk_from_rows(rows, fields):
+    """Lista de filas (dicts o tuplas) → arreglo estructurado con `fields`."""
+    if rows and isinstance(rows[0], dict):
+        cols = [_column([r.get(name) for r in rows]) for name in fields]
+    else:
+        cols = [_column(list(col)) for col in zip(*rows)]
+    out = np.empty(len(rows), dtype=[(name, c.dtype) for name, c in zip(fields, cols)])
+    for name, c in zip(fields, cols):
+        out[name] = c
+    return out
+
+
+def _as_plain(chunk):
+    """Bloque de un historial: columnas con objetos (Decimal) pasan a float64."""
+    if not chunk.dtype.hasobject:
+        return chunk
+    fields = chunk.dtype.names
+    if not len(chunk):
+        return chunk.astype([(name, 'f8' if chunk.dtype[name].hasobject else chunk.dtype[name])
+                             for name in fields])
+    return _chunk_from_rows([tuple(r) for r in chunk.tolist()], fields)
+
+
+def _unify(a, b):
+    """dtype común de una columna entre dos bloques."""
+    if a == b:
+        return a
+    if a.kind == 'U' or b.kind == 'U':
+        width = max(dt.itemsize // 4 if dt.kind == 'U' else 32 for dt in (a, b))
+        return np.dtype(f'U{width}')
+    return np.result_type(a, b)
+
+
+def _cast(col, dtype):
+    """Columna de un bloque al dtype final; los NaN de una columna de texto quedan vacíos."""
+    if dtype.kind == 'U' and col.dtype.kind == 'f':
+        return np.where(np.isnan(col), '', col.astype(dtype)).astype(dtype)
+    return col.astype(dtype)
+
+
+# =======================
+# 🔹 Escritor en flujo
+# =======================
+class TableWriter:
+    def __init__(self, path, fields, fmt=None, chunk_rows=CHUNK_ROWS):
+        """
+        - path: archivo de salida (el formato sale de la extensión si no se da fmt)
+        - fields: nombres de las columnas (encabezados)
+        - chunk_rows: filas por bloque (acotan la memoria)
+        """
+        self.path = path
+        self.fields = list(fields)
+        self.fmt = detect_format(path, fmt)
+        self.chunk_rows = chunk_rows
+        self.rows_written = 0
+        self._buffer = []
+        self._dtypes = None
+        if self.fmt == 'csv':
+            self._file = open(path, 'w', newline='', encoding='utf-8')
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(self.fields)
+        elif self.fmt in ('npy', 'npz'):
+            # bloques .npy uno detrás de otro; se copian al destino al cerrar
+            self._spool = tempfile.TemporaryFile()
+            self._chunks = 0
+        else:
+            if not HAS_PYARROW:
+                raise ValueError(f"El formato {self.fmt} necesita pyarrow (pip install pyarrow)")
+            self._arrow = None
+
+    # --------------------------
+    # Entrada
+    # --------------------------
+    def write(self, row):
+        """Agrega una fila (dict con `fields` o tupla en ese orden)."""
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_rows:
+            self._flush_buffer()
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def write_array(self, array):
+        """Agrega las filas de un arreglo estructurado, por bloques y sin copiarlo entero."""
+        self._flush_buffer()
+        # un arreglo vacío igual fija los tipos de las columnas
+        for start in range(0, max(len(array), 1), self.chunk_rows):
+            chunk = _as_plain(array[start:start + self.chunk_rows])
+            if chunk.dtype.names != tuple(self.fields):
+                chunk = chunk.copy()
+                chunk.dtype.names = self.fields
+            self._write_chunk(chunk)
+
+    def _flush_buffer(self):
+        if self._buffer:
+            rows, self._buffer = self._buffer, []
+            if self.fmt == 'csv':
+                # texto: sin pasar por arreglos
+                self._csv.writerows(
+                    [[r.get(name, '') for name in self.fields] if isinstance(r, dict) else r
+                     for r in rows])
+                self.rows_written += len(rows)
+                return
+            self._write_chunk(_chunk_from_rows(rows, self.fields))
+
+    # --------------------------
+    # Salida por formato
+    # --------------------------
+    def _write_chunk(self, chunk):
+        self.rows_written += len(chunk)
+        if self.fmt == 'csv':
+            self._csv.writerows(chunk.tolist())
+        elif self.fmt in ('npy', 'npz'):
+            self._dtypes = ([chunk.dtype[i] for i in range(len(self.fields))]
+                            if self._dtypes is None else
+                            [_unify(a, chunk.dtype[i]) for i, a in enumerate(self._dtypes)])
+            np.save(self._spool, chunk, allow_pickle=False)
+            self._chunks += 1
+        else:
+            self._write_arrow(chunk)
+
+    def _write_arrow(self, chunk):
+        import pyarrow as pa
+        table = pa.table({name: chunk[name] for name in self.fields})
+        if self._arrow is None:
+            if self.fmt == 'parquet':
+                import pyarrow.parquet as pq
+                self._arrow = pq.ParquetWriter(self.path, table.schema)
+            else:
+                self._arrow = pa.ipc.new_file(self.path, table.schema)
+            self._schema = table.schema
+        self._arrow.write_table(table.cast(self._schema))
+
+    def close(self):
+        self._flush_buffer()
+        if self.fmt == 'csv':
+            self._file.close()
+        elif self.fmt in ('npy', 'npz'):
+            self._assemble()
+            self._spool.close()
+        elif self._arrow is not None:
+            self._arrow.close()
+        else:
+            # tabla vacía: igual se crea el archivo con las columnas
+            self._write_arrow(np.empty(0, dtype=[(name, 'f8') for name in self.fields]))
+            self._arrow.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _spooled_chunks(self):
+        self._spool.seek(0)
+        for _ in range(self._chunks):
+            yield np.lib.format.read_array(self._spool, allow_pickle=False)
+
+    def _assemble(self):
+        dtypes = self._dtypes or [np.dtype('f8')] * len(self.fields)
+        n = self.rows_written
+        if self.fmt == 'npy':
+            dtype = np.dtype(list(zip(self.fields, dtypes)))
+            with open(self.path, 'wb') as out:
+                np.lib.format.write_array_header_1_0(
+                    out, {'descr': np.lib.format.dtype_to_descr(dtype),
+                          'fortran_order': False, 'shape': (n,)})
+                for chunk in self._spooled_chunks():
+                    block = np.empty(len(chunk), dtype=dtype)
+                    for name, src in zip(self.fields, chunk.dtype.names):
+                        block[name] = _cast(chunk[src], dtype[name])
+                    out.write(block.tobytes())
+            return
+        # npz: una entrada .npy por columna; se recorre el temporal una vez por columna
+        with zipfile.ZipFile(self.path, 'w', zipfile.ZIP_STORED, allowZip64=True) as zf:
+            for i, (name, dtype) in enumerate(zip(self.fields, dtypes)):
+                with zf.open(name + '.npy', 'w', force_zip64=True) as out:
+                    np.lib.format.write_array_header_1_0(
+                        out, {'descr': np.lib.format.dtype_to_descr(dtype),
+                              'fortran_order': False, 'shape': (n,)})
+                    for chunk in self._spooled_chunks():
+                        out.write(_cast(chunk[chunk.dtype.names[i]], dtype).tobytes())
+
+
+# =======================
+# 🔹 Atajos
+# =======================
+def export_history(rows, path, headers=None, fmt=None, chunk_rows=CHUNK_ROWS):
+    """Escribe un historial (History o arreglo estructurado) con los encabezados de la tabla."""
+    array = rows.array if isinstance(rows, History) else rows
+    headers = list(headers or headers_for(array.dtype.names))
+    with TableWriter(path, headers, fmt, chunk_rows) as writer:
+        writer.write_array(array)
+    return writer.rows_written
+
+
+def read_table(path, fmt=None):
+    """Lee una tabla binaria exportada: dict {columna: arreglo de NumPy}."""
+    fmt = detect_format(path, fmt)
+    if fmt == 'npy':
+        array = np.load(path, allow_pickle=False)
+        return {name: array[name] for name in array.dtype.names}
+    if fmt == 'npz':
+        with np.load(path, allow_pickle=False) as data:
+            return {name: data[name] for name in data.files}
+    if fmt in ('parquet', 'feather'):
+        if not HAS_PYARROW:
+            raise ValueError(f"El formato {fmt} necesita pyarrow (pip install pyarrow)")
+        if fmt == 'parquet':
+            import pyarrow.parquet as pq
+            table = pq.read_table(path)
+        else:
+            import pyarrow as pa
+            with pa.memory_map(path) as source:
+                table = pa.ipc.open_file(source).read_all()
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+    raise ValueError("read_table lee formatos binarios; para CSV use el módulo csv")
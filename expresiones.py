@@ -0,0 +1,352 @@
+"""
+Interpretación y compilación de ecuaciones con caché compartida.
+
+`compile_expression` normaliza el texto (forma con '=', '^' → '**') y lo
+interpreta una sola vez; el resultado queda en una caché LRU. Las entradas
+habituales las reconoce el analizador nativo (`analizador`), que compila
+directo a `math`/NumPy sin importar sympy; la forma sympy (`expr`) se arma
+recién cuando se pide (derivadas, mpmath). Lo que el analizador no maneja
+pasa por sympify; para eso la caché tiene opcionalmente un nivel en disco
+(variable de entorno METODOS_EXPR_CACHE con la ruta del archivo) para no
+repetir sympify al reiniciar la aplicación.
+
+Cada expresión compila bajo demanda un núcleo numérico por backend:
+- 'math':    escalar con el módulo math (bucles iterativos de los métodos)
+- 'numpy':   vectorizado (gráficas, escaneos, lotes)
+- 'numexpr': vectorizado multihilo para mallas muy grandes (si está instalado)
+- 'mpmath' y 'sympy': evaluación exacta/lenta, sólo como respaldo
+
+sympy y NumPy se importan recién al compilar la primera ecuación.
+
+`newton_kernel` compila f y f' juntas (con eliminación de subexpresiones
+comunes) en una sola función que devuelve (f(x), f'(x)).
+
+Los símbolos distintos de x son parámetros (`parameters`): `family_kernel`
+compila f(x, k, ...) una sola vez para resolver toda una familia de
+ecuaciones con arreglos de parámetros (barridos, ver `lotes.solve_sweep`).
+"""
+import os
+import re
+import pickle
+import shelve
+import threading
+from collections import OrderedDict
+from importlib.util import find_spec
+
+from analizador import Unsupported, compile_native, evaluate
+from perezoso import lazy_import
+
+np = lazy_import('numpy')
+sp = lazy_import('sympy')
+
+# numexpr es opcional; sólo se comprueba que exista, sin importarlo
+HAS_NUMEXPR = find_spec('numexpr') is not None
+
+BACKENDS = ('math', 'numpy', 'numexpr', 'mpmath', 'sympy')
+
+# a partir de este tamaño de malla compensa repartir el trabajo en hilos
+NUMEXPR_MIN_SIZE = 100_000
+
+_lazy = {}
+
+
+def _x():
+    """Símbolo x de sympy (se crea al primer uso)."""
+    if 'X' not in _lazy:
+        _lazy['X'] = sp.symbols('x')
+    return _lazy['X']
+
+
+def _numpy_modules():
+    if 'NUMPY_MODULES' not in _lazy:
+        _lazy['NUMPY_MODULES'] = ["numpy", {"sin": np.sin, "cos": np.cos, "tan": np.tan,
+                                            "exp": np.exp, "log": np.log, "sqrt": np.sqrt,
+                                            "Abs": np.abs}]
+    return _lazy['NUMPY_MODULES']
+
+
+def __getattr__(name):
+    # X y NUMPY_MODULES siguen disponibles como atributos del módulo
+    if name == 'X':
+        return _x()
+    if name == 'NUMPY_MODULES':
+        return _numpy_modules()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def normalize_equation(eq_text: str) -> str:
+    """Convierte 'izq = der' en '(izq)-(der)', '^' en '**' y quita espacios."""
+    if eq_text is None or not eq_text.strip():
+        raise ValueError("La ecuación está vacía")
+    eq_norm = re.sub(r'\s+', '', eq_text).replace('^', '**')
+    if '=' in eq_norm:
+        parts = eq_norm.split('=')
+        if len(parts) != 2:
+            raise ValueError("Ecuación con formato inválido (múltiples '=').")
+        left, right = parts
+        return f"({left})-({right})"
+    return eq_norm
+
+
+# =======================
+# 🔹 Expresión compilada
+# =======================
+class CompiledExpression:
+    """Expresión sympy, sus núcleos numéricos y sus derivadas (calculados a demanda)."""
+
+    def __init__(self, text, expr=None, native=None):
+        self.text = text
+        self._expr = expr
+        # árbol del analizador nativo (None si la expresión sólo la entiende sympify)
+        self.native = native
+        self._kernels = {}
+        self._derivs = {}
+
+    @property
+    def expr(self):
+        """Expresión sympy (con el analizador nativo se arma recién al pedirla)."""
+        if self._expr is None:
+            text = self.native.sympy_text if self.native is not None else self.text
+            self._expr = _sympify(text)
+        return self._expr
+
+    @property
+    def f(self):
+        """Núcleo NumPy (el que devuelve parse_equation)."""
+        return self.kernel('numpy')
+
+    def kernel(self, backend='numpy'):
+        """Función numérica de la expresión para el backend pedido (en caché)."""
+        if backend not in self._kernels:
+            native = self.native
+            if native is not None and backend in ('math', 'numpy') and not native.parameters:
+                self._kernels[backend] = (native.function('numpy') if backend == 'numpy' else
+                                          _scalar_kernel(native.function('math'),
+                                                         lambda: native.function('numpy')))
+            else:
+                self._kernels[backend] = _make_kernel(self.expr, backend)
+        return self._kernels[backend]
+
+    def grid(self, xs):
+        """Evalúa sobre una malla; usa numexpr para mallas muy grandes."""
+        xs = np.asarray(xs, dtype=float)
+        backend = 'numexpr' if HAS_NUMEXPR and xs.size >= NUMEXPR_MIN_SIZE else 'numpy'
+        ys = np.asarray(self.kernel(backend)(xs), dtype=float)
+        if ys.shape != xs.shape:
+            ys = np.broadcast_to(ys, xs.shape).copy()
+        return ys
+
+    def derivative(self, n=1, backend='numpy'):
+        """Devuelve (expr_derivada, función_numérica) de orden n, en caché (backend=None: sin función)."""
+        if n not in self._derivs:
+            self._derivs[n] = CompiledExpression(self.text, sp.diff(self.expr, _x(), n))
+        d = self._derivs[n]
+        return d.expr, (d.kernel(backend) if backend else None)
+
+    def newton_kernel(self, backend='math'):
+        """Función x → (f(x), f'(x)) en una sola llamada, con subexpresiones compartidas."""
+        key = ('newton', backend)
+        if key not in self._kernels:
+            dexpr, _ = self.derivative(1, backend=None)
+            self._kernels[key] = _make_fused_kernel((self.expr, dexpr), backend)
+        return self._kernels[key]
+
+    @property
+    def parameters(self):
+        """Nombres (ordenados) de los símbolos distintos de x."""
+        if self.native is not None:
+            return self.native.parameters
+        return tuple(sorted(s.name for s in self.expr.free_symbols if s != _x()))
+
+    def family_kernel(self, params=None, derivative=False):
+        """
+        Función vectorizada (x, *params) → f (o f' respecto de x con
+        derivative=True), compilada una sola vez (en caché) con lambdify.
+        """
+        params = self.parameters if params is None else tuple(params)
+        missing = set(self.parameters) - set(params)
+        if missing:
+            raise ValueError(f"Faltan valores para los parámetros: {', '.join(sorted(missing))}")
+        key = ('family', params, derivative)
+        if key not in self._kernels and self.native is not None and not derivative:
+            self._kernels[key] = self.native.function('numpy', params)
+        if key not in self._kernels:
+            expr = self.derivative(1, backend=None)[0] if derivative else self.expr
+            symbols = [_x(), *(sp.Symbol(p) for p in params)]
+            self._kernels[key] = sp.lambdify(symbols, expr, modules=_numpy_modules())
+        return self._kernels[key]
+
+    def __getstate__(self):
+        # los núcleos compilados no se pueden serializar; sólo el álgebra (o el texto)
+        return {'text': self.text, 'expr': self._expr,
+                'derivs': [(n, d.expr) for n, d in self._derivs.items()]}
+
+    def __setstate__(self, state):
+        self.__init__(state['text'], state['expr'], compile_native(state['text']))
+        for n, dexpr in state['derivs']:
+            self._derivs[n] = CompiledExpression(self.text, dexpr)
+
+
+def _sympify(text):
+    expr = sp.sympify(text, convert_xor=True)
+    # 1/0 da zoo, que lambdify no sabe imprimir para NumPy: vale nan, como con math
+    return expr.subs(sp.zoo, sp.nan) if expr.has(sp.zoo) else expr
+
+
+def _scalar_kernel(f_math, make_numpy):
+    """Núcleo escalar sobre math; la versión NumPy se arma sólo si math falla."""
+    fallback = []
+
+    def f_scalar(v):
+        try:
+            return f_math(v)
+        except (ValueError, OverflowError, ZeroDivisionError, TypeError):
+            # dominio/desbordamiento: mismo resultado que NumPy (nan/inf)
+            if not fallback:
+                fallback.append(make_numpy())
+            with np.errstate(all='ignore'):
+                # con un escalar de NumPy (no float) la división por cero da inf
+                return float(fallback[0](np.float64(v)))
+    return f_scalar
+
+
+def _make_kernel(expr, backend):
+    if backend == 'numpy':
+        return sp.lambdify(_x(), expr, modules=_numpy_modules())
+    if backend == 'math':
+        if expr.is_number:
+            const = float(expr)
+            return lambda v: const
+        return _scalar_kernel(sp.lambdify(_x(), expr, modules='math'),
+                              lambda: sp.lambdify(_x(), expr, modules=_numpy_modules()))
+    if backend == 'numexpr':
+        if HAS_NUMEXPR:
+            try:
+                return sp.lambdify(_x(), expr, modules='numexpr')
+            except Exception:
+                pass
+        return sp.lambdify(_x(), expr, modules=_numpy_modules())
+    if backend == 'mpmath':
+        return sp.lambdify(_x(), expr, modules='mpmath')
+    if backend == 'sympy':
+        return lambda v: float(expr.subs(_x(), v))
+    raise ValueError(f"Backend desconocido: {backend!r} (use uno de {BACKENDS})")
+
+
+def _make_fused_kernel(exprs, backend):
+    if backend == 'math':
+        f_math = sp.lambdify(_x(), exprs, modules='math', cse=True)
+        f_np = sp.lambdify(_x(), exprs, modules=_numpy_modules(), cse=True)
+
+        def f_scalar(v):
+            try:
+                return f_math(v)
+            except (ValueError, OverflowError, ZeroDivisionError, TypeError):
+                with np.errstate(all='ignore'):
+                    return tuple(float(y) for y in f_np(v))
+        return f_scalar
+    if backend in ('numpy', 'numexpr'):
+        return sp.lambdify(_x(), exprs, modules=_numpy_modules(), cse=True)
+    if backend == 'mpmath':
+        return sp.lambdify(_x(), exprs, modules='mpmath', cse=True)
+    if backend == 'sympy':
+        return lambda v: tuple(float(e.subs(_x(), v)) for e in exprs)
+    raise ValueError(f"Backend desconocido: {backend!r} (use uno de {BACKENDS})")
+
+
+# =======================
+# 🔹 Caché LRU con nivel en disco opcional
+# =======================
+class ExpressionCache:
+    def __init__(self, maxsize=256, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.native = 0
+
+    def get(self, eq_text):
+        key = normalize_equation(eq_text)
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            native = compile_native(key)
+            if native is not None:
+                # sin sympify ni disco: el analizador nativo tarda microsegundos
+                self.native += 1
+                compiled = CompiledExpression(key, native=native)
+            else:
+                compiled = self._load_from_disk(key)
+            if compiled is None:
+                compiled = CompiledExpression(key, _sympify(key))
+                self.persist(compiled)
+            self._data[key] = compiled
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return compiled
+
+    def persist(self, compiled):
+        """Guarda (o actualiza) una expresión en el nivel en disco, si existe."""
+        if not self.path:
+            return
+        with self._lock:
+            try:
+                with shelve.open(self.path) as db:
+                    db[compiled.text] = compiled
+            except (OSError, pickle.PicklingError):
+                pass
+
+    def _load_from_disk(self, key):
+        if not self.path:
+            return None
+        try:
+            with shelve.open(self.path) as db:
+                compiled = db.get(key)
+        except Exception:
+            return None
+        if compiled is not None:
+            self.disk_hits += 1
+        return compiled
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.disk_hits = self.native = 0
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'disk_hits': self.disk_hits, 'native': self.native,
+                    'size': len(self._data),
+                    'maxsize': self.maxsize}
+
+
+_cache = ExpressionCache(path=os.environ.get('METODOS_EXPR_CACHE'))
+
+
+def compile_expression(eq_text):
+    """Devuelve la CompiledExpression de eq_text usando la caché compartida."""
+    return _cache.get(eq_text)
+
+
+def compile_kernel(eq_text, backend='numpy'):
+    """Atajo: núcleo numérico de eq_text para el backend pedido."""
+    return _cache.get(eq_text).kernel(backend)
+
+
+def evaluate_number(text):
+    """Valor de una expresión constante (tolerancias como '10^-6'); sympify si hace falta."""
+    try:
+        return evaluate(text)
+    except (Unsupported, ArithmeticError, ValueError, TypeError, SyntaxError, RecursionError):
+        return float(sp.N(sp.sympify(text, convert_xor=True)))
+
+
+def cache_stats():
+    return _cache.stats()
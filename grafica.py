@@ -0,0 +1,275 @@
+"""
+Controlador de la gráfica f(x) que reutiliza los artistas de matplotlib.
+
+En lugar de `ax.clear()` + volver a crear líneas, leyenda y ejes en cada
+cálculo, `PlotController` crea una sola vez la curva, el eje y = 0 y el
+marcador de la raíz, y después sólo actualiza sus datos con `set_data`.
+Las peticiones seguidas se agrupan en un solo cuadro (temporizador del
+propio canvas) y se dibujan con `draw_idle`. Si sólo cambia la raíz y los
+límites siguen iguales, el marcador se redibuja con blitting.
+Funciona con cualquier canvas de matplotlib (TkAgg, QtAgg).
+
+`sample_function` elige los puntos de la curva: una evaluación vectorizada
+de una malla gruesa y refinamiento sólo donde la curva lo necesita.
+"""
+from perezoso import lazy_import
+
+np = lazy_import('numpy')
+
+
+# =======================
+# 🔹 Muestreo adaptativo de f(x)
+# =======================
+def _eval_samples(f, xs):
+    """Evalúa f sobre xs (vectorizado) y marca como NaN los valores no finitos."""
+    with np.errstate(all='ignore'):
+        try:
+            ys = np.asarray(f(xs), dtype=float)
+            ys = np.broadcast_to(ys, xs.shape).astype(float)
+        except Exception:
+            # funciones que no aceptan arreglos: punto a punto
+            ys = np.empty_like(xs)
+            for i, x in enumerate(xs):
+                try:
+                    ys[i] = f(x)
+                except Exception:
+                    ys[i] = np.nan
+    ys[~np.isfinite(ys)] = np.nan
+    return ys
+
+
+def sample_function(f, a, b, budget=1200, initial=200, rounds=6, tol=0.002):
+    """
+    Muestras (xs, ys) de f en [a, b] para graficar.
+
+    Empieza con una malla uniforme de `initial` puntos evaluada en una sola
+    llamada y, en hasta `rounds` pasadas, agrega el punto medio de los tramos
+    con curvatura grande (relativa al rango de y), cambio de signo o borde de
+    dominio (NaN/inf), sin pasar de `budget` puntos en total. Los tramos que
+    cruzan un polo se cortan con NaN para no unirlos con una línea vertical.
+    """
+    xs = np.linspace(a, b, initial)
+    ys = _eval_samples(f, xs)
+
+    for _ in range(rounds):
+        room = budget - len(xs)
+        if room <= 0:
+            break
+        score = _segment_scores(ys)
+        want = np.flatnonzero(score > tol)
+        if want.size == 0:
+            break
+        if want.size > room:
+            want = want[np.argsort(score[want])[-room:]]
+            want.sort()
+        mids = (xs[want] + xs[want + 1]) / 2
+        xs = np.insert(xs, want + 1, mids)
+        ys = np.insert(ys, want + 1, _eval_samples(f, mids))
+
+    return _break_poles(xs, ys)
+
+
+def _segment_scores(ys):
+    """Prioridad de refinamiento de cada tramo [i, i+1]."""
+    finite = np.isfinite(ys)
+    score = np.zeros(len(ys) - 1)
+    if finite.sum() < 3:
+        return score
+    span = np.ptp(ys[finite]) or 1.0
+    curv = np.zeros(len(ys))
+    with np.errstate(invalid='ignore'):
+        curv[1:-1] = np.abs(ys[:-2] - 2 * ys[1:-1] + ys[2:]) / span
+    curv = np.nan_to_num(curv)
+    score = np.maximum(curv[:-1], curv[1:])
+    # cambio de signo o borde de dominio: siempre vale la pena refinar
+    with np.errstate(invalid='ignore'):
+        flips = ys[:-1] * ys[1:] < 0
+    edges = finite[:-1] ^ finite[1:]
+    score[flips | edges] = np.inf
+    return score
+
+
+def _break_poles(xs, ys, factor=50.0):
+    """Inserta NaN entre dos muestras contiguas que saltan de signo con |y| muy grande."""
+    finite = np.isfinite(ys)
+    if finite.sum() < 3:
+        return xs, ys
+    scale = np.median(np.abs(ys[finite])) or 1.0
+    with np.errstate(invalid='ignore'):
+        big = np.abs(ys) > factor * scale
+        poles = np.flatnonzero((ys[:-1] * ys[1:] < 0) & big[:-1] & big[1:])
+    if poles.size:
+        xs = np.insert(xs, poles + 1, (xs[poles] + xs[poles + 1]) / 2)
+        ys = np.insert(ys, poles + 1, np.nan)
+    return xs, ys
+
+
+# =======================
+# 🔹 Controlador de la gráfica
+# =======================
+class PlotController:
+    def __init__(self, ax, canvas, root_label="Raíz", root_vline=False, grid=False,
+                 zero_color='black'):
+        """
+        - root_label: etiqueta del marcador; puede tener {root} (p. ej. 'raíz ≈ {root:.6g}')
+        - root_vline: dibujar además una línea vertical punteada en la raíz
+        - grid: cuadrícula punteada (como en a.py)
+        - zero_color: color de la línea y = 0
+        """
+        self.ax = ax
+        self.canvas = canvas
+        self.root_label = root_label
+        self.show_vline = root_vline
+        self.grid = grid
+        self.zero_color = zero_color
+
+        self._pending = {}
+        self._timer = None
+        self._background = None
+        self._spans = []
+        self._span_key = None
+        self._setup_axes()
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _setup_axes(self):
+        ax = self.ax
+        ax.set_xlabel('x'); ax.set_ylabel('f(x)')
+        self.line, = ax.plot([], [], label='f(x)')
+        self.zero_line = ax.axhline(0, color=self.zero_color, linewidth=0.7)
+        # con blitting el marcador es "animado": no entra en el dibujo normal y
+        # se pinta encima del fondo guardado
+        self._blit = getattr(self.canvas, 'supports_blit', False)
+        self.root_marker, = ax.plot([], [], 'ro', label=self.root_label,
+                                    animated=self._blit)
+        self.root_vline = ax.axvline(0, color='red', linestyle='--', linewidth=0.8,
+                                     visible=False)
+        if self.grid:
+            ax.grid(True, linestyle=':', linewidth=0.6)
+        self.zero_line.set_visible(False)
+        self._legend_state = None
+
+    # --------------------------
+    # API pública
+    # --------------------------
+    def update(self, xs=None, ys=None, root=None, root_y=None, intervals=None,
+               xlim=None):
+        """
+        Programa una actualización. Los argumentos omitidos mantienen su valor;
+        varias llamadas antes del siguiente cuadro se combinan en una.
+        Para quitar la raíz o los intervalos use clear_root()/intervals=[].
+        """
+        if xs is not None:
+            self._pending['curve'] = (np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))
+        if root is not None:
+            self._pending['root'] = (root, root_y)
+        if intervals is not None:
+            self._pending['intervals'] = [tuple(iv) for iv in intervals]
+        if xlim is not None:
+            self._pending['xlim'] = xlim
+        self._schedule()
+
+    def plot(self, xs, ys, root=None, root_y=None, intervals=(), xlim=None):
+        """Reemplaza la gráfica completa (curva, raíz e intervalos)."""
+        self._pending['clear_root'] = root is None
+        self.update(xs, ys, root, root_y, intervals, xlim)
+
+    def clear_root(self):
+        self._pending['clear_root'] = True
+        self._pending.pop('root', None)
+        self._schedule()
+
+    def reset(self):
+        """Deja los ejes vacíos (botón Reiniciar)."""
+        self._pending = {'curve': (np.empty(0), np.empty(0)), 'clear_root': True,
+                         'intervals': []}
+        self.flush()
+
+    # --------------------------
+    # Dibujo
+    # --------------------------
+    def _schedule(self):
+        if self._timer is None:
+            self._timer = self.canvas.new_timer(interval=15)
+            self._timer.single_shot = True
+            self._timer.add_callback(self.flush)
+        self._timer.start()
+
+    def flush(self):
+        """Aplica los cambios pendientes y redibuja lo mínimo necesario."""
+        if self._timer is not None:
+            self._timer.stop()
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        ax = self.ax
+        # sólo un cambio de raíz (sin cambiar límites) se resuelve con blitting
+        needs_draw = any(k in pending for k in ('curve', 'intervals', 'xlim', 'clear_root'))
+
+        if 'curve' in pending:
+            xs, ys = pending['curve']
+            self.line.set_data(xs, ys)
+            self.zero_line.set_visible(len(xs) > 0)
+            if 'xlim' not in pending:
+                ax.set_autoscalex_on(True)
+        if pending.get('clear_root'):
+            self.root_marker.set_data([], [])
+            self.root_vline.set_visible(False)
+        if 'root' in pending:
+            root, root_y = pending['root']
+            if root_y is not None and np.isfinite(root_y):
+                self.root_marker.set_data([root], [root_y])
+            else:
+                self.root_marker.set_data([], [])
+            if self.show_vline:
+                self.root_vline.set_xdata([root, root])
+                self.root_vline.set_visible(True)
+                needs_draw = True
+            if '{' in self.root_label:
+                self.root_marker.set_label(self.root_label.format(root=root))
+                self._legend_state = None
+        if 'intervals' in pending and pending['intervals'] != self._span_key:
+            for span in self._spans:
+                span.remove()
+            self._spans = [ax.axvspan(a, b, color='orange', alpha=0.3)
+                           for a, b in pending['intervals']]
+            self._span_key = pending['intervals']
+
+        limits = (ax.get_xlim(), ax.get_ylim())
+        ax.relim(visible_only=True)
+        ax.autoscale_view()
+        if 'xlim' in pending:
+            ax.set_xlim(*pending['xlim'])
+        needs_draw |= limits != (ax.get_xlim(), ax.get_ylim())
+        needs_draw |= self._update_legend()
+
+        if needs_draw or self._background is None:
+            self.canvas.draw_idle()
+        else:
+            self._blit_marker()
+
+    def _update_legend(self):
+        """Rehace la leyenda sólo si cambió lo que muestra; True si la rehízo."""
+        has_root = len(self.root_marker.get_xdata()) > 0
+        has_curve = len(self.line.get_xdata()) > 0
+        if (has_root, has_curve) == self._legend_state:
+            return False
+        self._legend_state = (has_root, has_curve)
+        legend = self.ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        handles = [h for h, show in ((self.line, has_curve), (self.root_marker, has_root)) if show]
+        if handles:
+            self.ax.legend(handles=handles)
+        return True
+
+    def _on_draw(self, event):
+        # tras cada dibujo completo: guardar el fondo y pintar el marcador encima
+        if not self._blit:
+            return
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self.root_marker)
+
+    def _blit_marker(self):
+        self.canvas.restore_region(self._background)
+        self.ax.draw_artist(self.root_marker)
+        self.canvas.blit(self.ax.bbox)
@@ -0,0 +1,276 @@
+"""
+Historial compacto de iteraciones.
+
+En lugar de una lista de tuplas (8 floats "empaquetados" por fila) las
+iteraciones se guardan en un arreglo estructurado de NumPy reservado de
+antemano, que crece al doble cuando se llena. `SolveResult` envuelve el
+historial y lee root/error/iterations/f_root de la última fila sin copiar.
+
+Los métodos aceptan `history` para elegir cuánto guardar (`make_history`):
+'full' (todas las filas), un entero N (sólo las últimas N, en un buffer
+circular) o None (sólo la última fila; el bucle no arma filas intermedias).
+
+NumPy se importa recién al crear el primer historial: las columnas se
+describen con listas (`BRACKET_FIELDS`, `NEWTON_FIELDS`) y `BRACKET_DTYPE` /
+`NEWTON_DTYPE` se construyen al pedirlos.
+"""
+import math
+
+from perezoso import lazy_import
+
+np = lazy_import('numpy')
+
+# columnas de los métodos con intervalo (bisección, falsa posición, Brent, ITP)
+BRACKET_FIELDS = [('it', 'i4'), ('a', 'f8'), ('b', 'f8'), ('c', 'f8'),
+                  ('fa', 'f8'), ('fb', 'f8'), ('fc', 'f8'), ('error', 'f8')]
+# columnas de Newton-Raphson
+NEWTON_FIELDS = [('it', 'i4'), ('x', 'f8'), ('fx', 'f8'), ('dfx', 'f8'),
+                 ('x_new', 'f8'), ('error', 'f8')]
+
+# encabezados de la tabla de las interfaces (y de los archivos exportados)
+BRACKET_HEADERS = ['Iter', 'a', 'b', 'c', 'f(a)', 'f(b)', 'f(c)', 'Error']
+NEWTON_HEADERS = ['Iter', 'x', 'f(x)', "f'(x)", 'x_new', 'Error']
+
+_DTYPES = {}
+
+
+def as_dtype(spec):
+    """dtype de NumPy para una lista de columnas (en caché) o un dtype ya hecho."""
+    if isinstance(spec, list):
+        key = tuple(spec)
+        if key not in _DTYPES:
+            _DTYPES[key] = np.dtype(spec)
+        return _DTYPES[key]
+    return np.dtype(spec)
+
+
+def __getattr__(name):
+    # BRACKET_DTYPE / NEWTON_DTYPE sin importar NumPy al importar el módulo
+    if name in ('BRACKET_DTYPE', 'NEWTON_DTYPE'):
+        return as_dtype(BRACKET_FIELDS if name == 'BRACKET_DTYPE' else NEWTON_FIELDS)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def headers_for(columns):
+    """Encabezados de la tabla para las columnas de un historial (las mismas si no se conocen)."""
+    columns = list(columns)
+    for fields, headers in ((BRACKET_FIELDS, BRACKET_HEADERS), (NEWTON_FIELDS, NEWTON_HEADERS)):
+        if columns == [name for name, _ in fields]:
+            return list(headers)
+    return columns
+
+
+def object_dtype(dtype):
+    """Mismas columnas con los valores como objetos (para guardar números mpmath)."""
+    return np.dtype([(name, 'i4' if name == 'it' else 'O') for name in as_dtype(dtype).names])
+
+
+def as_history(history, dtype, extra=8):
+    """Copia `history` a un History nuevo con `dtype` y lugar para `extra` filas más."""
+    out = History(dtype, len(history) + extra)
+    out.data[:len(history)] = history.array.astype(dtype)
+    out.size = len(history)
+    return out
+
+
+def continue_history(mode, history, dtype, extra=8):
+    """
+    Historial de `mode` con `dtype` que continúa a `history`: copia sólo las
+    filas que ese modo conserva (todas, las últimas N o la última).
+    """
+    if mode in ('full', True):
+        return as_history(history, dtype, extra)
+    out = make_history(mode, dtype)
+    rows = history.array
+    for row in rows[max(0, len(rows) - len(out.data)):].astype(out.data.dtype):
+        out.append(row)
+    return out
+
+
+def bisection_capacity(a, b, tol, max_iter):
+    """Iteraciones que necesita la bisección: log2((b - a) / tol), acotado por max_iter."""
+    try:
+        n = math.ceil(math.log2(abs(b - a) / tol)) + 1
+    except (ValueError, ZeroDivisionError, OverflowError, TypeError):
+        return min(max_iter, 64)
+    return max(1, min(max_iter, n))
+
+
+class History:
+    """Filas de iteración en un arreglo estructurado con crecimiento geométrico."""
+    __slots__ = ('data', 'size')
+    # False: el método sólo registra la última fila (ver NoHistory)
+    record_each = True
+
+    def __init__(self, dtype=BRACKET_FIELDS, capacity=32):
+        self.data = np.empty(max(1, capacity), dtype=as_dtype(dtype))
+        self.size = 0
+
+    @classmethod
+    def from_array(cls, array):
+        """Historial completo con las filas de un arreglo estructurado (sin copiarlo)."""
+        history = cls.__new__(cls)
+        history.data = array
+        history.size = len(array)
+        return history
+
+    def append(self, row):
+        if self.size == len(self.data):
+            grown = np.empty(2 * len(self.data), dtype=self.data.dtype)
+            grown[:self.size] = self.data
+            self.data = grown
+        self.data[self.size] = row
+        self.size += 1
+
+    @property
+    def array(self):
+        """Vista (sin copia) de las filas ocupadas."""
+        return self.data[:self.size]
+
+    @property
+    def columns(self):
+        return self.data.dtype.names
+
+    def last(self):
+        return self.data[self.size - 1]
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [r.item() for r in self.array[i]]
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError(i)
+        return self.data[i].item()
+
+    def __iter__(self):
+        for i in range(self.size):
+            yield self.data[i].item()
+
+
+class RingHistory(History):
+    """Sólo las últimas N filas, sobrescribiendo en un buffer circular."""
+    __slots__ = ()
+
+    def __init__(self, dtype=BRACKET_FIELDS, capacity=100):
+        super().__init__(dtype, capacity)
+
+    def append(self, row):
+        self.data[self.size % len(self.data)] = row
+        self.size += 1
+
+    def _start(self):
+        return self.size - len(self)
+
+    @property
+    def array(self):
+        """Copia ordenada de las filas guardadas (de la más vieja a la última)."""
+        n = len(self.data)
+        if self.size <= n:
+            return self.data[:self.size]
+        k = self.size % n
+        return np.concatenate((self.data[k:], self.data[:k]))
+
+    def last(self):
+        return self.data[(self.size - 1) % len(self.data)]
+
+    def __len__(self):
+        return min(self.size, len(self.data))
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [r.item() for r in self.array[i]]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(i)
+        return self.data[(self._start() + i) % len(self.data)].item()
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class NoHistory(History):
+    """Sin historial: el método registra únicamente la fila final."""
+    __slots__ = ()
+    record_each = False
+
+    def __init__(self, dtype=BRACKET_FIELDS, capacity=1):
+        super().__init__(dtype, 1)
+
+    def append(self, row):
+        self.data[0] = row
+        self.size = 1
+
+
+def make_history(mode, dtype, capacity=32):
+    """'full' → History, entero N → RingHistory(N), None/'none'/0 → NoHistory."""
+    if mode in ('full', True):
+        return History(dtype, capacity)
+    if mode in (None, 'none', False, 0):
+        return NoHistory(dtype)
+    if isinstance(mode, int) and mode > 0:
+        return RingHistory(dtype, mode)
+    raise ValueError(f"Modo de historial inválido: {mode!r} (use 'full', N o None)")
+
+
+def _scalar(v):
+    # float64 → float de Python; los números mpmath se devuelven tal cual
+    return v.item() if isinstance(v, np.generic) else v
+
+
+class SolveResult:
+    """
+    Resultado de un método: historial + valores finales leídos de la última fila.
+    Se puede desempaquetar como antes: `rows, final = bisection(...)`.
+    `stats` (ver instrumentacion.SolveStats) se agrega a `final` si existe.
+    """
+    __slots__ = ('history', '_root', '_f_root', 'stats')
+
+    def __init__(self, history, root_field, f_root_field):
+        self.history = history
+        self._root = root_field
+        self._f_root = f_root_field
+        self.stats = None
+
+    @property
+    def root_field(self):
+        """Columna del historial con la aproximación de cada iteración."""
+        return self._root
+
+    @property
+    def root(self):
+        return _scalar(self.history.last()[self._root])
+
+    @property
+    def error(self):
+        return _scalar(self.history.last()['error'])
+
+    @property
+    def iterations(self):
+        return int(self.history.last()['it'])
+
+    @property
+    def f_root(self):
+        return _scalar(self.history.last()[self._f_root])
+
+    @property
+    def final(self):
+        final = {'root': self.root, 'error': self.error,
+                 'iterations': self.iterations, 'f_root': self.f_root}
+        if self.stats is not None:
+            final['stats'] = self.stats
+        return final
+
+    def __iter__(self):
+        yield self.history
+        yield self.final
+
+    def __getitem__(self, i):
+        # compatibilidad con la tupla (rows, final) que se devolvía antes
+        return (self.history, self.final)[i]
@@ -0,0 +1,177 @@
+"""
+Instrumentación de los métodos: cuántas veces se evalúa f (y f'), en qué se
+va el tiempo y cómo converge la iteración.
+
+`SolveStats` mide fases con `phase(nombre)` (interpretar, compilar,
+resolver), envuelve las funciones con `count(nombre, func)` para contar
+llamadas y medir el tiempo de evaluación, y al terminar (`finish`) agrega a
+`final` el dict `stats`:
+
+- f_evals / df_evals: evaluaciones de f y de f' (la función fusionada cuenta
+  en ambas)
+- time_parse, time_compile, time_eval, time_overhead, time_total (segundos);
+  time_overhead es el tiempo del método que no fue evaluar f: tabla, bucle
+- orders: orden de convergencia observado en cada iteración,
+  q_k = log(e_{k+1}/e_k) / log(e_k/e_{k-1}) con e_k = |x_k - x_final|
+  (sólo donde el error baja estrictamente y q > 0)
+- order: estimación del orden (mediana de los últimos valores válidos; None
+  si hay muy pocos)
+- wasted_iterations: iteraciones hechas después de alcanzar en la práctica
+  la tolerancia (x_k ya a distancia ≤ tol de la aproximación final, o pasos
+  que no mueven x_k más que la resolución de float64)
+"""
+import math
+import sys
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+
+# columnas escalares de `stats` (salida CSV de los lotes; `orders` es una lista)
+STATS_FIELDS = ['f_evals', 'df_evals', 'time_parse', 'time_compile', 'time_eval',
+                'time_overhead', 'time_total', 'order', 'wasted_iterations']
+
+# funciones que cuentan como evaluaciones de f y de f'
+F_NAMES = ('f', 'fdf', 'f_mp')
+DF_NAMES = ('df', 'fdf', 'df_mp')
+
+EPS = sys.float_info.epsilon
+
+
+class CountedFunction:
+    """Función envuelta: cuenta llamadas, suma su tiempo y (opcional) guarda los x."""
+    __slots__ = ('func', 'calls', 'time', 'points')
+
+    def __init__(self, func, points=None):
+        self.func = func
+        self.calls = 0
+        self.time = 0.0
+        self.points = points
+
+    def __call__(self, x):
+        t0 = time.perf_counter()
+        y = self.func(x)
+        self.time += time.perf_counter() - t0
+        self.calls += 1
+        if self.points is not None:
+            self.points.append(x)
+        return y
+
+
+class SolveStats:
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
+        self.points = []
+        self.result = {}
+
+    @contextmanager
+    def phase(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - t0
+
+    def count(self, name, func, trace=False):
+        """Envuelve func; con trace=True sus argumentos son los iterados del método."""
+        if func is None:
+            return None
+        counted = CountedFunction(func, self.points if trace else None)
+        self.counters[name] = counted
+        return counted
+
+    def finish(self, result, tol, root_field=None):
+        """Calcula las estadísticas, las guarda en `result.stats` y devuelve result."""
+        calls = {name: c.calls for name, c in self.counters.items()}
+        t_eval = sum(c.time for c in self.counters.values())
+        t_solve = self.phases.get('solve', t_eval)
+        stats = {
+            'f_evals': sum(calls.get(n, 0) for n in F_NAMES),
+            'df_evals': sum(calls.get(n, 0) for n in DF_NAMES),
+            'time_parse': self.phases.get('parse', 0.0),
+            'time_compile': self.phases.get('compile', 0.0),
+            'time_eval': t_eval,
+            'time_overhead': max(t_solve - t_eval, 0.0),
+            'time_total': sum(self.phases.values()),
+        }
+        iterates = _iterates(result, self.points, root_field)
+        stats['orders'] = convergence_orders(iterates)
+        stats['order'] = order_estimate(stats['orders'])
+        stats['wasted_iterations'] = wasted_iterations(iterates, tol)
+        result.stats = self.result = stats
+        return result
+
+
+def _iterates(result, points, root_field=None):
+    """Aproximaciones x_k de cada iteración (del historial completo o de la traza)."""
+    history = result.history
+    n = result.iterations
+    field = root_field or result.root_field
+    if len(history) == n and field in history.columns:
+        xs = list(history.array[field])
+    else:
+        xs = points[-n:]
+    # en modo de precisión las filas mpmath son Decimal: no mezclar con float
+    if any(isinstance(v, Decimal) for v in xs):
+        return [v if isinstance(v, Decimal) else Decimal(float(v)) for v in xs]
+    return [float(v) for v in xs]
+
+
+def convergence_orders(xs):
+    """q_k por iteración (None donde no se puede estimar o no tiene sentido)."""
+    if not xs:
+        return []
+    final = xs[-1]
+    errors = [abs(x - final) for x in xs]
+    orders = [None] * len(xs)
+    for k in range(1, len(xs) - 1):
+        e0, e1, e2 = errors[k - 1], errors[k], errors[k + 1]
+        # sólo tramos donde el error baja estrictamente: si no, q no mide el orden
+        if e0 > e1 > e2 > 0:
+            q = math.log(e2 / e1) / math.log(e1 / e0)
+            if math.isfinite(q) and q > 0:
+                orders[k] = q
+    return orders
+
+
+def order_estimate(orders, last=5, skip_end=2, min_valid=2):
+    """Mediana de los últimos valores válidos; los del final se descartan si sobran
+    (allí x_final todavía no es la raíz y el cociente se degrada). None si
+    quedan menos de `min_valid`."""
+    valid = [q for q in orders if q is not None and math.isfinite(q) and q > 0]
+    if len(valid) > last + skip_end:
+        valid = valid[:-skip_end]
+    if len(valid) < min_valid:
+        return None
+    tail = sorted(valid[-last:])
+    return tail[len(tail) // 2]
+
+
+def wasted_iterations(xs, tol):
+    """
+    Iteraciones posteriores a la primera que ya cumplía la tolerancia: x_k a
+    distancia ≤ tol de la aproximación final, o un paso |x_k - x_{k-1}| del
+    orden de la resolución de float64 (de ahí en más el método no mejora).
+    Con iterados Decimal (precisión extendida) sólo cuenta la tolerancia.
+    """
+    if len(xs) < 2:
+        return 0
+    final = xs[-1]
+    for k, x in enumerate(xs):
+        if abs(x - final) <= tol:
+            return len(xs) - 1 - k
+        if k and isinstance(x, float) and abs(x - xs[k - 1]) <= 4 * EPS * max(1.0, abs(x)):
+            # x_{k-1} ya era el resultado: desde x_k todo sobra
+            return len(xs) - k
+    return 0
+
+
+def format_stats(stats):
+    """Resumen de una línea para las interfaces."""
+    ms = lambda s: f"{s * 1e3:.2f} ms"
+    order = stats.get('order')
+    return (f"Evaluaciones: f={stats['f_evals']}, f'={stats['df_evals']} | "
+            f"interpretar {ms(stats['time_parse'])}, compilar {ms(stats['time_compile'])}, "
+            f"evaluar {ms(stats['time_eval'])}, resto {ms(stats['time_overhead'])} | "
+            f"orden ≈ {'-' if order is None else f'{order:.2f}'} | "
+            f"iteraciones tras alcanzar la tolerancia: {stats['wasted_iterations']}")
@@ -0,0 +1,185 @@
+"""
+Resolución por lotes de muchas ecuaciones distintas repartidas entre núcleos.
+
+Las funciones de lambdify no se pueden serializar, así que a cada proceso se
+le envía el texto de la ecuación con su intervalo (o x0); el proceso compila
+con su propia caché (`expresiones`) y llama al método pedido (`METHODS`). Los problemas se despachan en bloques y los resultados vuelven
+en el mismo orden de entrada, a medida que terminan.
+
+`solve_sweep` resuelve una familia de ecuaciones con un parámetro (p. ej.
+x^3 - k*x - 5 para miles de k): compila una sola vez y resuelve todos los
+valores juntos con continuación (`metodos.sweep`).
+
+Antes de resolver se consulta la caché de resultados (`cache_resultados`,
+en disco si se activa con METODOS_RESULT_CACHE); los problemas ya resueltos
+vuelven con cached=True.
+"""
+import os
+from collections import deque
+from contextlib import nullcontext
+from decimal import Decimal
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from cache_resultados import lookup, result_key, store
+from expresiones import compile_expression
+from instrumentacion import SolveStats
+from metodos import bisection, brent, false_position, itp, newton, required_digits, sweep
+
+METHODS = {
+    'bisection': bisection,
+    'false_position': false_position,
+    'brent': brent,
+    'itp': itp,
+    'newton': newton,
+}
+
+
+def solve_problem(problem):
+    """
+    Resuelve un problema descrito por un dict:
+    equation, method ('bisection' por defecto), a y b (o x0 para newton),
+    tol (1e-6 por defecto), max_iter (1000 por defecto) y digits (dígitos
+    mpmath; por defecto sólo si tol está por debajo de float64).
+    Con stats verdadero se agregan las estadísticas de `instrumentacion` (y
+    se resuelve siempre); con cache falso no se usa la caché de resultados.
+
+    Devuelve los campos de `final` (root, error, iterations, f_root) más
+    status ('ok' o 'error') y message cuando falla.
+    """
+    stats = SolveStats() if _truthy(problem.get('stats')) else None
+    count = stats.count if stats else (lambda name, func, trace=False: func)
+    try:
+        method = problem.get('method') or 'bisection'
+        if method not in METHODS:
+            raise ValueError(f"Método desconocido: {method}")
+        tol = float(problem.get('tol') or 1e-6)
+        max_iter = int(problem.get('max_iter') or 1000)
+        digits = problem.get('digits')
+        digits = int(digits) if digits not in (None, '') else required_digits(tol)
+        if method == 'newton':
+            x0 = problem.get('x0')
+            if x0 is None or x0 == '':
+                x0 = problem['a']
+            a = b = None
+            x0 = float(x0)
+        else:
+            a, b, x0 = float(problem['a']), float(problem['b']), None
+        key = None
+        if stats is None and _truthy(problem.get('cache', True)):
+            key = result_key(problem['equation'], method, a, b, x0, tol, max_iter, digits)
+            hit = lookup(key)
+            if hit is not None:
+                return {**_plain_final(hit.final), 'status': 'ok', 'cached': True}
+        with _phase(stats, 'parse'):
+            compiled = compile_expression(problem['equation'])
+        with _phase(stats, 'compile'):
+            f = compiled.kernel('math')
+            fdf = compiled.newton_kernel('math') if method == 'newton' else None
+            mp = {}
+            if digits is not None:
+                mp = {'precision': digits,
+                      'f_mp': count('f_mp', compiled.kernel('mpmath'), trace=True)}
+                if method == 'newton':
+                    mp['df_mp'] = count('df_mp', compiled.derivative(backend='mpmath')[1])
+        f, fdf = count('f', f, trace=True), count('fdf', fdf, trace=True)
+        with _phase(stats, 'solve'):
+            if method == 'newton':
+                # sólo interesa la raíz: sin historial de iteraciones
+                result = newton(f, None, x0, tol, max_iter, history=None, fdf=fdf, **mp)
+            else:
+                result = METHODS[method](f, a, b, tol, max_iter, history=None, **mp)
+        if stats:
+            stats.finish(result, tol)
+        final = result.final
+        if key is not None:
+            store(key, final)
+    except Exception as e:
+        return {'root': None, 'error': None, 'iterations': None, 'f_root': None,
+                'status': 'error', 'message': str(e)}
+    extra = final.pop('stats', {})
+    final = _plain_final(final)
+    final.update(extra)
+    final['status'] = 'ok'
+    return final
+
+
+def solve_sweep(equation, values, param=None, a=None, b=None, x0=None, tol=1e-10,
+                max_iter=1000, fixed=None):
+    """
+    Raíces de `equation` para cada valor del parámetro `param` en `values`.
+
+    Los símbolos distintos de x son parámetros; los que no se barren van en
+    `fixed` ({nombre: valor}). Si hay uno solo sin fijar, `param` se puede
+    omitir. Con a y b se usa bisección; con x0, Newton. Devuelve el dict de
+    `metodos.sweep` (arreglos en el orden de `values`) más 'param', el
+    nombre del parámetro barrido.
+    """
+    compiled = compile_expression(equation)
+    fixed = dict(fixed or {})
+    if param is None:
+        free = [p for p in compiled.parameters if p not in fixed]
+        if len(free) != 1:
+            raise ValueError("Indique el parámetro del barrido (la ecuación tiene "
+                             f"{len(free)} sin valor: {', '.join(free) or 'ninguno'})")
+        param = free[0]
+    names = (param, *fixed)
+    f = compiled.family_kernel(names)
+    df = compiled.family_kernel(names, derivative=True) if x0 is not None else None
+    if fixed:
+        consts = [float(v) for v in fixed.values()]
+        f_k, df_k = f, df
+        f = lambda x, k: f_k(x, k, *consts)
+        df = (lambda x, k: df_k(x, k, *consts)) if df_k is not None else None
+    if x0 is not None:
+        a = b = None
+    return {**sweep(f, values, a, b, x0, tol, max_iter, df), 'param': param}
+
+
+def _truthy(v):
+    return v not in (None, '', 0, False) and str(v).lower() not in ('0', 'false', 'no')
+
+
+def _phase(stats, name):
+    return stats.phase(name) if stats else nullcontext()
+
+
+def _plain_final(final):
+    return {k: _plain(v) if k != 'iterations' else int(v) for k, v in final.items()}
+
+
+def _plain(v):
+    # precisión extendida como texto para no perder dígitos en CSV/JSON
+    return str(v) if isinstance(v, Decimal) else float(v)
+
+
+def _solve_chunk(chunk):
+    return [solve_problem(p) for p in chunk]
+
+
+def solve_many(problems, workers=None, chunksize=64):
+    """
+    Genera los resultados de `problems` (cualquier iterable de dicts) en orden.
+
+    Con workers=1 se resuelve en este mismo proceso. Como mucho hay
+    2 * workers bloques en vuelo, de modo que la memoria no depende del
+    tamaño de la entrada.
+    """
+    workers = workers or os.cpu_count() or 1
+    it = iter(problems)
+    if workers == 1:
+        for p in it:
+            yield solve_problem(p)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        while True:
+            while len(pending) < 2 * workers:
+                chunk = list(islice(it, chunksize))
+                if not chunk:
+                    break
+                pending.append(pool.submit(_solve_chunk, chunk))
+            if not pending:
+                break
+            yield from pending.popleft().result()
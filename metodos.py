@@ -0,0 +1,838 @@
+"""
+Métodos numéricos compartidos por las interfaces (ahg.py, yanose.py, otro.py,
+a.py y aja.py). Este módulo no crea ventanas: se puede importar desde scripts
+o procesos por lotes.
+
+`bisection`, `false_position`, `brent`, `itp` y `newton` aceptan `progress`: una función que
+se llama con el número de iteración al inicio de cada vuelta (las interfaces
+la usan para mostrar el avance y cancelar lanzando una excepción).
+Devuelven un `SolveResult`, que se desempaqueta como `rows, final`: `rows`
+es el historial compacto (`historial.History`) y `final` el dict de siempre.
+Con `history` se elige qué se guarda: 'full', las últimas N filas o None.
+
+Importar este módulo no carga NumPy ni sympy (ver `perezoso`).
+
+Con `resume` (el SolveResult anterior de la misma f) el método continúa
+donde quedó en lugar de empezar de cero: con una tolerancia más estricta o
+más iteraciones sólo se calculan las filas nuevas, que se agregan al
+historial anterior; con una tolerancia más laxa alcanza con una parte del
+historial (bisección, falsa posición y Newton), y un intervalo nuevo dentro
+del intervalo final anterior también lo reutiliza (ver `_warm_bracket`). `f_bounds` = (f(a), f(b)) evita
+evaluar de nuevo los extremos cuando ya se conocen.
+
+Con `precision` (dígitos) y las funciones mpmath (`f_mp`, y `df_mp` en Newton)
+el método converge primero en float64 y sólo las últimas iteraciones se
+hacen con mpmath; esas filas guardan Decimal con todos los dígitos.
+
+`sweep` resuelve una familia f(x, k) para miles de valores de k a la vez,
+usando la raíz de cada k como punto de partida de sus vecinos.
+
+`iter_bisection`, `iter_false_position` e `iter_newton` son las versiones
+generadoras: producen cada fila a medida que se calcula, para procesarlas en
+flujo o detenerse antes.
+"""
+import math
+import sys
+from decimal import Decimal
+
+from historial import (BRACKET_FIELDS, NEWTON_FIELDS, History, SolveResult, bisection_capacity,
+                       continue_history, make_history, object_dtype)
+from perezoso import lazy_import
+
+# NumPy se importa al primer uso (historial o versiones vectorizadas)
+np = lazy_import('numpy')
+
+EPS = sys.float_info.epsilon
+
+
+# =======================
+# 🔹 Métodos Numéricos
+# =======================
+def bisection(f, a, b, tol, max_iter=1000, progress=None, history='full',
+              precision=None, f_mp=None, resume=None, f_bounds=None):
+    if precision is not None:
+        return _bisection_mp(f, f_mp, a, b, tol, max_iter, progress, history, precision)
+    if resume is not None:
+        warm = _warm_bracket(bisection, f, resume, a, b, tol, max_iter, progress, history)
+        if warm is not None:
+            return warm
+    fa, fb = f_bounds or (f(a), f(b))
+    if fa * fb > 0:
+        raise ValueError("f(a) y f(b) deben tener signos opuestos.")
+    rows = make_history(history, BRACKET_FIELDS, bisection_capacity(a, b, tol, max_iter))
+    record = rows.record_each
+    for it in range(1, max_iter + 1):
+        if progress is not None:
+            progress(it)
+        c = (a + b) / 2
+        fc = f(c)
+        error = abs(b - a) / 2
+        done = abs(fc) < tol or error < tol
+        if record or done or it == max_iter:
+            rows.append((it, a, b, c, fa, fb, fc, error))
+        if done:
+            break
+        if fa * fc < 0:
+            b = c
+            fb = fc
+        else:
+            a = c
+            fa = fc
+    return SolveResult(rows, 'c', 'fc')
+
+
+def false_position(f, a, b, tol, max_iter=1000, progress=None, history='full',
+                   precision=None, f_mp=None, resume=None, f_bounds=None):
+    if precision is not None:
+        return _false_position_mp(f, f_mp, a, b, tol, max_iter, progress, history, precision)
+    if resume is not None:
+        warm = _warm_bracket(false_position, f, resume, a, b, tol, max_iter, progress, history)
+        if warm is not None:
+            return warm
+    fa, fb = f_bounds or (f(a), f(b))
+    if fa * fb > 0:
+        raise ValueError("f(a) y f(b) deben tener signos opuestos.")
+    rows = make_history(history, BRACKET_FIELDS)
+    record = rows.record_each
+    for it in range(1, max_iter + 1):
+        if progress is not None:
+            progress(it)
+        c = (a * fb - b * fa) / (fb - fa)
+        fc = f(c)
+        error = abs(fc)
+        done = abs(fc) < tol or error < tol
+        if record or done or it == max_iter:
+            rows.append((it, a, b, c, fa, fb, fc, error))
+        if done:
+            break
+        if fa * fc < 0:
+            b, fb = c, fc
+        else:
+            a, fa = c, fc
+    return SolveResult(rows, 'c', 'fc')
+
+
+def newton(f, df, x0, tol, max_iter=1000, progress=None, history='full',
+           precision=None, f_mp=None, df_mp=None, fdf=None, resume=None):
+    """
+    Newton-Raphson. Con `fdf` (x → (f(x), f'(x)), p. ej.
+    `CompiledExpression.newton_kernel()`) cada iteración evalúa f y f' en una
+    sola llamada y `f`/`df` pueden ser None.
+    """
+    if precision is not None:
+        return _newton_mp(f, df, f_mp, df_mp, x0, tol, max_iter, progress, history, precision,
+                          fdf)
+    if resume is not None:
+        warm = _warm_newton(f, df, fdf, resume, x0, tol, max_iter, progress, history)
+        if warm is not None:
+            return warm
+    if fdf is None:
+        fdf = lambda v: (f(v), df(v))
+    rows = make_history(history, NEWTON_FIELDS)
+    record = rows.record_each
+    x = x0
+    for it in range(1, max_iter + 1):
+        if progress is not None:
+            progress(it)
+        fx, dfx = fdf(x)
+        if dfx == 0:
+            raise ValueError("Derivada cero, no se puede continuar")
+        x_new = x - fx / dfx
+        error = abs(x_new - x)
+        done = error < tol
+        if record or done or it == max_iter:
+            rows.append((it, x, fx, dfx, x_new, error))
+        if done:
+            break
+        x = x_new
+    # root es la última x evaluada y f_root su f(x), ya guardada en el historial
+    return SolveResult(rows, 'x', 'fx')
+
+
+# Brent e ITP: mismas columnas que la bisección. En cada fila a y b son el
+# intervalo antes del paso, c el punto nuevo y error la mitad del intervalo
+# que queda después del paso (que sigue encerrando la raíz).
+def brent(f, a, b, tol, max_iter=1000, progress=None, history='full',
+          precision=None, f_mp=None, resume=None, f_bounds=None):
+    """Método de Brent: interpolación cuadrática inversa/secante con respaldo de bisección."""
+    if precision is not None:
+        return _bisection_mp(f, f_mp, a, b, tol, max_iter, progress, history, precision,
+                             solver=brent)
+    if resume is not None:
+        warm = _warm_bracket(brent, f, resume, a, b, tol, max_iter, progress, history)
+        if warm is not None:
+            return warm
+    fa, fb = f_bounds or (f(a), f(b))
+    if fa * fb > 0:
+        raise ValueError("f(a) y f(b) deben tener signos opuestos.")
+    rows = make_history(history, BRACKET_FIELDS)
+    record = rows.record_each
+    # b: mejor aproximación; c: contrapunto (la raíz está entre b y c);
+    # a: aproximación anterior (para la interpolación)
+    c, fc = a, fa
+    d = e = b - a
+    for it in range(1, max_iter + 1):
+        if progress is not None:
+            progress(it)
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        if fb == 0:
+            # raíz exacta (también si era un extremo inicial): no hace falta otro paso
+            lo, hi, flo, fhi = (b, c, fb, fc) if b < c else (c, b, fc, fb)
+            rows.append((it, lo, hi, b, flo, fhi, fb, 0.0))
+            break
+        tol1 = 2 * EPS * abs(b) + 0.5 * tol
+        xm = 0.5 * (c - b)
+        if abs(e) >= tol1 and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:  # secante
+                p, q = 2 * xm * s, 1 - s
+            else:       # interpolación cuadrática inversa
+                q, r = fa / fc, fb / fc
+                p = s * (2 * xm * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * xm * q - abs(tol1 * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = xm
+        else:
+            d = e = xm
+        lo, hi, flo, fhi = (b, c, fb, fc) if b < c else (c, b, fc, fb)
+        a, fa = b, fb
+        b += d if abs(d) > tol1 else math.copysign(tol1, xm)
+        fb = f(b)
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        error = abs(c - b) / 2
+        done = abs(fb) < tol or error < tol
+        if record or done or it == max_iter:
+            rows.append((it, lo, hi, b, flo, fhi, fb, error))
+        if done:
+            break
+    return SolveResult(rows, 'c', 'fc')
+
+
+def itp(f, a, b, tol, max_iter=1000, progress=None, history='full',
+        precision=None, f_mp=None, k1=None, k2=2.0, n0=1, resume=None, f_bounds=None):
+    """
+    Método ITP (Interpolate-Truncate-Project, Oliveira y Takahashi 2020):
+    punto de falsa posición truncado hacia el punto medio y proyectado sobre
+    una bola alrededor de él, de modo que nunca usa más de
+    log2((b - a) / (2 tol)) + n0 iteraciones, como mucho n0 más que la bisección.
+    """
+    if precision is not None:
+        return _bisection_mp(f, f_mp, a, b, tol, max_iter, progress, history, precision,
+                             solver=itp)
+    if resume is not None:
+        warm = _warm_bracket(itp, f, resume, a, b, tol, max_iter, progress, history)
+        if warm is not None:
+            return warm
+    fa, fb = f_bounds or (f(a), f(b))
+    if fa * fb > 0:
+        raise ValueError("f(a) y f(b) deben tener signos opuestos.")
+    if a > b:
+        a, b, fa, fb = b, a, fb, fa
+    rows = make_history(history, BRACKET_FIELDS, bisection_capacity(a, b, tol, max_iter) + n0)
+    record = rows.record_each
+    if k1 is None:
+        k1 = 0.2 / (b - a) if b > a else 0.0
+    n_max = max(0, math.ceil(math.log2(max((b - a) / (2 * tol), 1.0)))) + n0
+    for it in range(1, max_iter + 1):
+        if progress is not None:
+            progress(it)
+        width = b - a
+        x_half = (a + b) / 2
+        r = max(tol * 2.0 ** (n_max - it + 1) - width / 2, 0.0)
+        delta = k1 * width ** k2
+        # interpolación (falsa posición)
+        x_f = (fb * a - fa * b) / (fb - fa) if fb != fa else x_half
+        # truncamiento hacia el punto medio
+        sigma = math.copysign(1.0, x_half - x_f)
+        x_t = x_f + sigma * delta if delta <= abs(x_half - x_f) else x_half
+        # proyección sobre la bola de radio r alrededor del punto medio
+        c = x_t if abs(x_t - x_half) <= r else x_half - sigma * r
+        fc = f(c)
+        row_a, row_b, row_fa, row_fb = a, b, fa, fb
+        if fa * fc < 0:
+            b, fb = c, fc
+        elif fc == 0:
+            a = b = c
+            fa = fb = fc
+        else:
+            a, fa = c, fc
+        error = (b - a) / 2
+        done = abs(fc) < tol or error < tol
+        if record or done or it == max_iter:
+            rows.append((it, row_a, row_b, c, row_fa, row_fb, fc, error))
+        if done:
+            break
+    return SolveResult(rows, 'c', 'fc')
+
+
+# =======================
+# 🔹 Precisión arbitraria (float64 primero, mpmath al final)
+# =======================
+def required_digits(tol):
+    """Dígitos mpmath necesarios para una tolerancia que float64 no alcanza (None si alcanza)."""
+    if tol >= 1e-14:
+        return None
+    return math.ceil(-math.log10(tol)) + 5
+
+
+def _float_floor(*xs):
+    """
+    Tolerancia más chica que float64 resuelve cerca de xs (unos ulp de la
+    magnitud, 4·eps para |x| ≤ 1): por debajo siguen las iteraciones mpmath.
+    """
+    return 4 * EPS * max(1.0, *(abs(float(x)) for x in xs))
+
+
+def _mp_setup(digits, *kernels):
+    if any(k is None for k in kernels):
+        raise ValueError("El modo de precisión necesita las funciones mpmath (f_mp/df_mp).")
+    import mpmath
+    to_dec = lambda v: Decimal(mpmath.nstr(v, digits, min_fixed=-1, max_fixed=1))
+    return mpmath, to_dec
+
+
+def _bisection_mp(f, f_mp, a, b, tol, max_iter, progress, history, digits,
+                  solver=None):
+    mpmath, to_dec = _mp_setup(digits, f_mp)
+    # fase float64 (con `solver`, por defecto bisección) hasta donde float64
+    # puede distinguir el intervalo; el resto se biseca con mpmath
+    floor = _float_floor(a, b)
+    result = (solver or bisection)(f, a, b, max(tol, floor), max_iter, progress, history)
+    last = result.history.last()
+    it = int(last['it'])
+    if tol >= floor or it >= max_iter:
+        return result
+    a, b, c = float(last['a']), float(last['b']), float(last['c'])
+    if last['fc'] == 0:
+        # cero exacto en float64: se refina alrededor de c
+        a, b = c - 2 * math.ulp(c), c + 2 * math.ulp(c)
+    elif last['fa'] * last['fc'] < 0:
+        b = c
+    else:
+        a = c
+
+    rows = continue_history(history, result.history, object_dtype(BRACKET_FIELDS))
+    record = rows.record_each
+    with mpmath.workdps(digits + 5):
+        a, b, tol = mpmath.mpf(a), mpmath.mpf(b), mpmath.mpf(tol)
+        fa, fb = f_mp(a), f_mp(b)
+        if fa * fb > 0:
+            return result
+        for it in range(it + 1, max_iter + 1):
+            if progress is not None:
+                progress(it)
+            c = (a + b) / 2
+            fc = f_mp(c)
+            error = abs(b - a) / 2
+            done = abs(fc) < tol or error < tol
+            if record or done or it == max_iter:
+                rows.append((it, *map(to_dec, (a, b, c, fa, fb, fc, error))))
+            if done:
+                break
+            if fa * fc < 0:
+                b, fb = c, fc
+            else:
+                a, fa = c, fc
+    return SolveResult(rows, 'c', 'fc')
+
+
+def _false_position_mp(f, f_mp, a, b, tol, max_iter, progress, history, digits):
+    mpmath, to_dec = _mp_setup(digits, f_mp)
+    # el error de falsa posición es |f(c)|: el mismo piso en x, llevado a
+    # unidades de f con la pendiente de la secante inicial
+    fa, fb = f(a), f(b)
+    slope = abs(fb - fa) / abs(b - a) if b != a else 1.0
+    floor = _float_floor(a, b) * max(1.0, slope)
+    result = false_position(f, a, b, max(tol, floor), max_iter, progress, history,
+                            f_bounds=(fa, fb))
+    last = result.history.last()
+    it = int(last['it'])
+    if tol >= floor or it >= max_iter or last['fc'] == 0:
+        return result
+    a, b, c = float(last['a']), float(last['b']), float(last['c'])
+    if last['fa'] * last['fc'] < 0:
+        b = c
+    else:
+        a = c
+
+    rows = continue_history(history, result.history, object_dtype(BRACKET_FIELDS))
+    record = rows.record_each
+    with mpmath.workdps(digits + 5):
+        a, b, tol = mpmath.mpf(a), mpmath.mpf(b), mpmath.mpf(tol)
+        fa, fb = f_mp(a), f_mp(b)
+        for it in range(it + 1, max_iter + 1):
+            if progress is not None:
+                progress(it)
+            c = (a * fb - b * fa) / (fb - fa)
+            fc = f_mp(c)
+            error = abs(fc)
+            done = error < tol
+            if record or done or it == max_iter:
+                rows.append((it, *map(to_dec, (a, b, c, fa, fb, fc, error))))
+            if done:
+                break
+            if fa * fc < 0:
+                b, fb = c, fc
+            else:
+                a, fa = c, fc
+    return SolveResult(rows, 'c', 'fc')
+
+
+def _newton_mp(f, df, f_mp, df_mp, x0, tol, max_iter, progress, history, digits,
+               fdf=None):
+    mpmath, to_dec = _mp_setup(digits, f_mp, df_mp)
+    floor = _float_floor(x0)
+    result = newton(f, df, x0, max(tol, floor), max_iter, progress, history, fdf=fdf)
+    last = result.history.last()
+    it = int(last['it'])
+    if tol >= floor or it >= max_iter:
+        return result
+
+    rows = continue_history(history, result.history, object_dtype(NEWTON_FIELDS))
+    record = rows.record_each
+    with mpmath.workdps(digits + 5):
+        x, tol = mpmath.mpf(float(last['x_new'])), mpmath.mpf(tol)
+        for it in range(it + 1, max_iter + 1):
+            if progress is not None:
+                progress(it)
+            fx = f_mp(x)
+            dfx = df_mp(x)
+            if dfx == 0:
+                raise ValueError("Derivada cero, no se puede continuar")
+            x_new = x - fx / dfx
+            error = abs(x_new - x)
+            done = error < tol
+            if record or done or it == max_iter:
+                rows.append((it, *map(to_dec, (x, fx, dfx, x_new, error))))
+            if done:
+                break
+            x = x_new
+    return SolveResult(rows, 'x', 'fx')
+
+
+# =======================
+# 🔹 Arranque en caliente (continuar una resolución anterior)
+# =======================
+def _resumable(previous, fields):
+    """True si `previous` tiene el historial completo en float64 con estas columnas."""
+    rows = getattr(previous, 'history', None)
+    return (type(rows) is History and len(rows) > 0
+            and len(rows) == int(rows.last()['it'])
+            and rows.columns == tuple(name for name, _ in fields)
+            and not rows.data.dtype.hasobject)
+
+
+def _prefix(array, done, max_iter, root_field, f_root_field):
+    """
+    Si la resolución anterior ya pasó por una fila que cumple la tolerancia
+    nueva (o por la iteración max_iter), el resultado es el historial hasta ahí.
+    """
+    stop = np.flatnonzero(done)
+    n = min(int(stop[0]) + 1 if stop.size else len(array), max_iter)
+    if stop.size or len(array) >= max_iter:
+        return SolveResult(History.from_array(array[:n].copy()), root_field, f_root_field)
+    return None
+
+
+def _extend(array, more, it0):
+    """Historial anterior + filas nuevas numeradas a continuación."""
+    tail = more.history.array.copy()
+    tail['it'] += it0
+    return History.from_array(np.concatenate((array, tail)))
+
+
+def _shift(progress, it0):
+    return None if progress is None else (lambda it: progress(it + it0))
+
+
+def _warm_bracket(solver, f, previous, a, b, tol, max_iter, progress, history):
+    """
+    Continúa una resolución con intervalo. Se reutiliza `previous` sólo si:
+
+    - [a, b] es el mismo intervalo inicial: con una tolerancia más laxa (o
+      menos iteraciones) el resultado es una parte del historial (sólo
+      bisección y falsa posición: en Brent e ITP los pasos dependen de tol);
+      si no, se sigue desde el intervalo final con sus f ya conocidas.
+    - [a, b] está dentro del intervalo final de `previous` (el subintervalo
+      con cambio de signo que dejó la última fila): se resuelve [a, b] y sus
+      filas se agregan a continuación del historial anterior.
+
+    Siempre se comprueba el cambio de signo en [a, b]. Devuelve None si no se
+    puede reutilizar (el método resuelve entonces en frío, con sus errores).
+    """
+    if history != 'full' or not _resumable(previous, BRACKET_FIELDS):
+        return None
+    array = previous.history.array
+    first, last = array[0], array[-1]
+    it0 = int(last['it'])
+    if (float(first['a']), float(first['b'])) == (float(a), float(b)):
+        if first['fa'] * first['fb'] > 0:
+            return None
+        if solver in (bisection, false_position):
+            done = (np.abs(array['fc']) < tol) | (array['error'] < tol)
+            result = _prefix(array, done, max_iter, 'c', 'fc')
+            if result is not None:
+                return result
+        elif it0 >= max_iter or abs(last['fc']) < tol or last['error'] < tol:
+            # Brent/ITP con tolerancia más laxa: el historial no sirve, en frío
+            return None
+        if last['fa'] * last['fc'] < 0:
+            lo, hi, flo, fhi = last['a'], last['c'], last['fa'], last['fc']
+        else:
+            lo, hi, flo, fhi = last['c'], last['b'], last['fc'], last['fb']
+        (lo, flo), (hi, fhi) = sorted([(float(lo), float(flo)), (float(hi), float(fhi))])
+    else:
+        if last['fa'] * last['fc'] < 0:
+            inner = sorted((float(last['a']), float(last['c'])))
+        else:
+            inner = sorted((float(last['c']), float(last['b'])))
+        if not inner[0] <= min(a, b) <= max(a, b) <= inner[1] or it0 >= max_iter:
+            return None
+        lo, hi = a, b
+        flo, fhi = f(a), f(b)
+        if flo * fhi > 0:
+            return None
+    more = solver(f, lo, hi, tol, max_iter - it0, _shift(progress, it0), f_bounds=(flo, fhi))
+    return SolveResult(_extend(array, more, it0), 'c', 'fc')
+
+
+def _warm_newton(f, df, fdf, previous, x0, tol, max_iter, progress, history):
+    """Continúa Newton desde la última x_new si `previous` empezó en el mismo x0."""
+    if history != 'full' or not _resumable(previous, NEWTON_FIELDS):
+        return None
+    array = previous.history.array
+    if float(array[0]['x']) != float(x0):
+        return None
+    result = _prefix(array, array['error'] < tol, max_iter, 'x', 'fx')
+    if result is not None:
+        return result
+    it0 = int(array[-1]['it'])
+    more = newton(f, df, float(array[-1]['x_new']), tol, max_iter - it0,
+                  _shift(progress, it0), fdf=fdf)
+    return SolveResult(_extend(array, more, it0), 'x', 'fx')
+
+
+# =======================
+# 🔹 Versiones generadoras (una fila por iteración)
+# =======================
+def iter_bisection(f, a, b, tol, max_iter=1000):
+    """Produce (it, a, b, c, f(a), f(b), f(c), error) en cada iteración."""
+    fa, fb = f(a), f(b)
+    if fa * fb > 0:
+        raise ValueError("f(a) y f(b) deben tener signos opuestos.")
+    for it in range(1, max_iter + 1):
+        c = (a + b) / 2
+        fc = f(c)
+        error = abs(b - a) / 2
+        yield (it, a, b, c, fa, fb, fc, error)
+        if abs(fc) < tol or error < tol:
+            return
+        if fa * fc < 0:
+            b, fb = c, fc
+        else:
+            a, fa = c, fc
+
+
+def iter_false_position(f, a, b, tol, max_iter=1000):
+    """Produce (it, a, b, c, f(a), f(b), f(c), error) en cada iteración."""
+    fa, fb = f(a), f(b)
+    if fa * fb > 0:
+        raise ValueError("f(a) y f(b) deben tener signos opuestos.")
+    for it in range(1, max_iter + 1):
+        c = (a * fb - b * fa) / (fb - fa)
+        fc = f(c)
+        error = abs(fc)
+        yield (it, a, b, c, fa, fb, fc, error)
+        if error < tol:
+            return
+        if fa * fc < 0:
+            b, fb = c, fc
+        else:
+            a, fa = c, fc
+
+
+def iter_newton(f, df, x0, tol, max_iter=1000):
+    """Produce (it, x, f(x), f'(x), x_new, error) en cada iteración."""
+    x = x0
+    for it in range(1, max_iter + 1):
+        fx = f(x)
+        dfx = df(x)
+        if dfx == 0:
+            raise ValueError("Derivada cero, no se puede continuar")
+        x_new = x - fx / dfx
+        error = abs(x_new - x)
+        yield (it, x, fx, dfx, x_new, error)
+        if error < tol:
+            return
+        x = x_new
+
+
+# =======================
+# 🔹 Bisección vectorizada (varios intervalos a la vez)
+# =======================
+def _eval_vector(f, xs, *params):
+    """Evalúa f sobre un arreglo y garantiza un arreglo float de la misma forma."""
+    ys = np.asarray(f(xs, *params), dtype=float)
+    if ys.shape != xs.shape:
+        # lambdify devuelve un escalar para expresiones constantes
+        ys = np.broadcast_to(ys, xs.shape).copy()
+    return ys
+
+
+def bisection_batch(f, a, b, tol, max_iter=1000, params=()):
+    """
+    Bisección sobre muchos intervalos [a_i, b_i] avanzando todos a la vez.
+
+    `f` debe aceptar arreglos de NumPy (como las funciones de `parse_equation`).
+    `a`, `b` y `tol` pueden ser escalares o arreglos (se aplanan a 1-D).
+    Con `params` (arreglos alineados con los intervalos) se evalúa
+    f(x, *params): cada intervalo resuelve su propia ecuación de la familia.
+    Cada intervalo se detiene con el mismo criterio que `bisection`
+    (|f(c)| < tol o error < tol); en cada vuelta sólo se evalúan los activos.
+
+    Devuelve un dict como `final` pero con arreglos:
+    root, error, iterations, f_root y converged (False si f(a) y f(b) no
+    tenían signos opuestos o si se agotó max_iter).
+    """
+    a = np.array(a, dtype=float, ndmin=1)
+    b = np.array(b, dtype=float, ndmin=1)
+    a, b, *params = np.broadcast_arrays(a, b, *(np.asarray(p, dtype=float) for p in params))
+    tol = np.broadcast_to(np.asarray(tol, dtype=float), a.shape)
+    a, b, tol = a.ravel().copy(), b.ravel().copy(), tol.ravel()
+    params = [p.ravel() for p in params]
+
+    n = a.size
+    root = np.full(n, np.nan)
+    error = np.full(n, np.nan)
+    f_root = np.full(n, np.nan)
+    iterations = np.zeros(n, dtype=int)
+    converged = np.zeros(n, dtype=bool)
+
+    with np.errstate(all='ignore'):
+        fa = _eval_vector(f, a, *params)
+        fb = _eval_vector(f, b, *params)
+        # los intervalos sin cambio de signo quedan como NaN desde el inicio
+        idx = np.flatnonzero(~(fa * fb > 0))
+        a, b, fa, tol = a[idx], b[idx], fa[idx], tol[idx]
+        params = [p[idx] for p in params]
+
+        for it in range(1, max_iter + 1):
+            if idx.size == 0:
+                break
+            c = (a + b) / 2
+            fc = _eval_vector(f, c, *params)
+            err = np.abs(b - a) / 2
+
+            root[idx] = c
+            error[idx] = err
+            f_root[idx] = fc
+            iterations[idx] = it
+
+            done = (np.abs(fc) < tol) | (err < tol)
+            converged[idx[done]] = True
+
+            left = fa * fc < 0
+            b = np.where(left, c, b)
+            a = np.where(left, a, c)
+            fa = np.where(left, fa, fc)
+
+            keep = ~done
+            idx, a, b, fa, tol = idx[keep], a[keep], b[keep], fa[keep], tol[keep]
+            params = [p[keep] for p in params]
+
+    return {'root': root, 'error': error, 'iterations': iterations,
+            'f_root': f_root, 'converged': converged}
+
+
+def newton_batch(f, df, x0, tol, max_iter=50, params=()):
+    """
+    Newton-Raphson sobre muchos puntos iniciales a la vez (mismo criterio que
+    `newton`: |x_new - x| < tol). `f` y `df` aceptan arreglos y, con
+    `params`, se evalúan como f(x, *params). Devuelve el mismo dict que
+    `bisection_batch`; converged es False si f' se anuló, el iterado dejó de
+    ser finito o se agotó max_iter.
+    """
+    x, *params = np.broadcast_arrays(np.array(x0, dtype=float, ndmin=1),
+                                     *(np.asarray(p, dtype=float) for p in params))
+    x, params = x.ravel().copy(), [p.ravel() for p in params]
+    tol = np.broadcast_to(np.asarray(tol, dtype=float), x.shape).ravel()
+
+    n = x.size
+    root = np.full(n, np.nan)
+    error = np.full(n, np.nan)
+    f_root = np.full(n, np.nan)
+    iterations = np.zeros(n, dtype=int)
+    converged = np.zeros(n, dtype=bool)
+    idx = np.arange(n)
+
+    with np.errstate(all='ignore'):
+        for it in range(1, max_iter + 1):
+            if idx.size == 0:
+                break
+            fx = _eval_vector(f, x, *params)
+            dfx = _eval_vector(df, x, *params)
+            x_new = x - fx / dfx
+            err = np.abs(x_new - x)
+
+            root[idx] = x
+            error[idx] = err
+            f_root[idx] = fx
+            iterations[idx] = it
+
+            ok = np.isfinite(x_new) & (dfx != 0)
+            done = ok & (err < tol)
+            converged[idx[done]] = True
+
+            keep = ok & ~done
+            idx, x, tol = idx[keep], x_new[keep], tol[keep]
+            params = [p[keep] for p in params]
+
+    return {'root': root, 'error': error, 'iterations': iterations,
+            'f_root': f_root, 'converged': converged}
+
+
+# =======================
+# 🔹 Barridos de parámetros con continuación
+# =======================
+def sweep(f, values, a=None, b=None, x0=None, tol=1e-10, max_iter=1000, df=None,
+          anchors=8):
+    """
+    Raíz de f(x, k) para cada k de `values`, todas a la vez.
+
+    `f` (y `df`, derivada respecto de x) aceptan arreglos: f(xs, ks), p. ej.
+    `CompiledExpression.family_kernel()`. Con a y b se usa bisección; sin
+    ellos, Newton desde x0 (hace falta df).
+
+    Continuación: se resuelven en frío sólo ~`anchors` valores de k
+    repartidos en el rango; después, por niveles, cada k sin resolver entre
+    dos vecinos ya resueltos arranca de la interpolación de sus raíces: un
+    intervalo chico alrededor (bisección) o x0 (Newton). Cada nivel es una
+    sola pasada vectorizada y duplica los k resueltos, así que n valores
+    cuestan unos log2(n / anchors) pasadas de pocas iteraciones cada una. Los
+    que no convergen así se resuelven en frío.
+
+    Devuelve el dict de `bisection_batch` en el orden de `values`, más
+    'cold' (cuántos valores se resolvieron en frío).
+    """
+    bracket = a is not None and b is not None
+    if not bracket and (x0 is None or df is None):
+        raise ValueError("El barrido necesita a y b, o x0 y la derivada df.")
+    values = np.array(values, dtype=float, ndmin=1).ravel()
+    n = values.size
+    if n == 0:
+        return {**bisection_batch(f, [], [], tol, params=([],)), 'cold': 0}
+    order = np.argsort(values, kind='stable')
+    k = values[order]
+    out = {'root': np.full(n, np.nan), 'error': np.full(n, np.nan),
+           'f_root': np.full(n, np.nan), 'iterations': np.zeros(n, dtype=int),
+           'converged': np.zeros(n, dtype=bool)}
+
+    def cold(idx):
+        if bracket:
+            res = bisection_batch(f, a, b, tol, max_iter, params=(k[idx],))
+        else:
+            res = newton_batch(f, df, x0, tol, min(max_iter, 100), params=(k[idx],))
+        for name, arr in out.items():
+            arr[idx] = res[name]
+        return idx.size
+
+    # nivel 0: anclas equiespaciadas (con la última) resueltas en frío
+    stride = 1 << max(0, math.ceil(math.log2(max(n - 1, 1) / max(anchors, 1))))
+    seeds = np.union1d(np.arange(0, n, stride), [n - 1])
+    n_cold = cold(seeds)
+    solved = np.zeros(n, dtype=bool)
+    solved[seeds] = True
+
+    while stride > 1:
+        stride //= 2
+        idx = np.arange(stride, n, 2 * stride)
+        idx = idx[~solved[idx]]
+        if idx.size:
+            left, right = idx - stride, np.minimum(idx + stride, n - 1)
+            r_l, r_r = out['root'][left], out['root'][right]
+            ok = out['converged'][left] & out['converged'][right]
+            # predicción: interpolación lineal en k de las raíces vecinas
+            span = np.where(k[right] > k[left], k[right] - k[left], 1.0)
+            t = np.clip((k[idx] - k[left]) / span, 0.0, 1.0)
+            guess = r_l + t * (r_r - r_l)
+            if bracket:
+                # intervalo alrededor de la predicción, del orden del salto entre vecinas
+                h = np.abs(r_r - r_l) + 64 * tol
+                lo = np.maximum(guess - h, min(a, b))
+                hi = np.minimum(guess + h, max(a, b))
+                res = bisection_batch(f, lo, hi, tol, max_iter, params=(k[idx],))
+            else:
+                res = newton_batch(f, df, guess, tol, min(max_iter, 50), params=(k[idx],))
+            for name, arr in out.items():
+                arr[idx] = res[name]
+            retry = idx[~(ok & res['converged'])]
+            if retry.size:
+                n_cold += cold(retry)
+            solved[idx] = True
+
+    result = {name: np.empty_like(arr) for name, arr in out.items()}
+    for name, arr in out.items():
+        result[name][order] = arr
+    result['cold'] = n_cold
+    return result
+
+
+# =======================
+# 🔹 Búsqueda de cambios de signo (vectorizada, multirresolución)
+# =======================
+def scan_sign_changes(f, xmin=-100, xmax=100, n=200, subdiv=16, levels=2):
+    """
+    Busca subintervalos [a, b] donde f cambia de signo.
+
+    Evalúa una malla de `n` celdas en una sola llamada vectorizada y detecta
+    los cambios de signo con operaciones de arreglos. Después refina `levels`
+    veces, dividiendo en `subdiv` partes sólo las celdas con cambio de signo
+    o con un extremo no finito (borde de dominio o polo), así que el ancho
+    final de cada intervalo es (xmax - xmin) / (n * subdiv**levels).
+
+    Devuelve una lista ordenada de tuplas (a, b); un cero exacto en la malla
+    se devuelve como (x, x).
+    """
+    xs = np.linspace(xmin, xmax, int(n) + 1)
+    with np.errstate(all='ignore'):
+        ys = _eval_vector(f, xs)
+    zeros = list(xs[ys == 0])
+    lo_x, hi_x, lo_y, hi_y = xs[:-1], xs[1:], ys[:-1], ys[1:]
+
+    t = np.linspace(0.0, 1.0, subdiv + 1)
+    for _ in range(levels):
+        sel = _candidate_cells(lo_y, hi_y)
+        if not sel.any():
+            break
+        lo, width = lo_x[sel], (hi_x - lo_x)[sel]
+        # (celdas, subdiv + 1) puntos; los extremos ya se conocen
+        px = lo[:, None] + width[:, None] * t[None, :]
+        py = np.empty_like(px)
+        py[:, 0], py[:, -1] = lo_y[sel], hi_y[sel]
+        with np.errstate(all='ignore'):
+            py[:, 1:-1] = _eval_vector(f, px[:, 1:-1].ravel()).reshape(px.shape[0], -1)
+        zeros.extend(px[:, 1:-1][py[:, 1:-1] == 0])
+        lo_x, hi_x = px[:, :-1].ravel(), px[:, 1:].ravel()
+        lo_y, hi_y = py[:, :-1].ravel(), py[:, 1:].ravel()
+
+    flips = _candidate_cells(lo_y, hi_y, only_sign=True)
+    cells = [(float(a), float(b)) for a, b in zip(lo_x[flips], hi_x[flips])]
+    cells.extend((float(z), float(z)) for z in zeros)
+    return sorted(cells)
+
+
+def _candidate_cells(lo_y, hi_y, only_sign=False):
+    finite_lo, finite_hi = np.isfinite(lo_y), np.isfinite(hi_y)
+    flips = finite_lo & finite_hi & (np.sign(lo_y) * np.sign(hi_y) < 0)
+    if only_sign:
+        return flips
+    return flips | (finite_lo ^ finite_hi)
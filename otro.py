@@ -4,18 +4,22 @@ import sys
 import tkinter as tk
 from tkinter import messagebox
 
-import numpy as np
-import pandas as pd
-import matplotlib
-matplotlib.use('TkAgg')
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-import sympy as sp
 from ttkbootstrap import Style
 from ttkbootstrap.constants import *
 from tkinter import ttk
 
+from perezoso import import_all
+from cache_resultados import lookup, result_key, store
+from expresiones import compile_expression, compile_kernel, evaluate_number
+from grafica import PlotController, sample_function
+from historial import BRACKET_FIELDS, History, SolveResult, bisection_capacity
+from metodos import scan_sign_changes
+from tabla_virtual import VirtualTable
+from tareas import BackgroundTask
+
+# dependencias pesadas: se cargan en segundo plano al abrir la ventana
+WARM_UP_MODULES = ('numpy', 'sympy', 'matplotlib.figure', 'matplotlib.backends.backend_tkagg')
+
 
 # =======================
 # 🔹 Clase Teclado Matemático
@@ -75,53 +79,37 @@ class MathKeyboard(tk.Toplevel):
 # 🔹 Funciones base
 # =======================
 def parse_equation(eq_text: str):
-    if not eq_text or not eq_text.strip():
-        raise ValueError("La ecuación está vacía")
-
-    eq_norm = eq_text.replace('^', '**')
-    if '=' in eq_norm:
-        parts = eq_norm.split('=')
-        if len(parts) != 2:
-            raise ValueError("Ecuación con formato inválido (múltiples '=').")
-        left, right = parts
-        expr_text = f"({left})-({right})"
-    else:
-        expr_text = eq_norm
-
-    x = sp.symbols('x')
-    expr = sp.sympify(expr_text, convert_xor=True)
-    f_num = sp.lambdify(
-        x, expr,
-        modules=["numpy", {"sin": np.sin, "cos": np.cos, "tan": np.tan,
-                           "exp": np.exp, "log": np.log, "sqrt": np.sqrt}]
-    )
-    return expr, f_num
+    compiled = compile_expression(eq_text)
+    return compiled.expr, compiled.f
 
 
 def parse_tolerance(tol_text: str) -> float:
     if tol_text is None or tol_text.strip() == '':
         raise ValueError('La tolerancia está vacía')
     txt = tol_text.strip().replace('^', '**').replace(',', '.')
-    return float(sp.N(sp.sympify(txt)))
+    return evaluate_number(txt)
 
 
-def bisection(f, a, b, tol, max_iter=1000):
+def bisection(f, a, b, tol, max_iter=1000, progress=None):
     fa, fb = f(a), f(b)
     if fa * fb > 0:
         raise ValueError('f(a) y f(b) deben tener signos opuestos.')
-    rows = []
+    rows = History(BRACKET_FIELDS, bisection_capacity(a, b, tol, max_iter))
     for it in range(1, max_iter + 1):
+        if progress is not None:
+            progress(it)
         c = (a + b) / 2.0
         fc = f(c)
         error = abs(b - a) / 2.0
-        rows.append((it, a, b, c, f(a), f(b), fc, error))
+        rows.append((it, a, b, c, fa, fb, fc, error))
         if abs(fc) < tol or error < tol:
             break
-        if f(a) * fc < 0:
-            b = c
+        # los signos de los extremos se arrastran: una sola evaluación por vuelta
+        if fa * fc < 0:
+            b, fb = c, fc
         else:
-            a = c
-    return rows, {'root': c, 'error': error, 'iterations': it, 'f_root': fc}
+            a, fa = c, fc
+    return SolveResult(rows, 'c', 'fc')
 
 
 # =======================
@@ -178,19 +166,17 @@ class BisectionApp:
         # 🔹 Botón para abrir el teclado matemático
         tk.Button(self.frm_top, text='🧮 Teclado', bg='#9C27B0', fg='white',
                   command=self.open_math_keyboard).grid(row=0, column=10, rowspan=2, padx=4, pady=2, sticky='ns')
+        tk.Button(self.frm_top, text='Cancelar', command=self.on_cancel,
+                  bg='#607D8B', fg='white').grid(row=0, column=11, rowspan=2, padx=4, pady=2, sticky='ns')
 
         # --------- Tabla de iteraciones ---------
         self.frm_table = tk.LabelFrame(self.frm_left, text='Iteraciones')
         self.frm_table.pack(fill=tk.BOTH, expand=True, padx=6, pady=6)
         cols = ('Iter', 'a', 'b', 'c', 'f(a)', 'f(b)', 'f(c)', 'Error')
-        self.tree = ttk.Treeview(self.frm_table, columns=cols, show='headings', height=15)
-        for c in cols:
-            self.tree.heading(c, text=c)
-            self.tree.column(c, anchor='center', width=100)
-        self.tree.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
-        scrollbar = tk.Scrollbar(self.frm_table, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # sólo se crean/formatean las filas visibles
+        self.table = VirtualTable(self.frm_table, cols, height=15, format_row=self._format_row)
+        self.table.pack(fill=tk.BOTH, expand=True)
+        self.tree = self.table.tree
 
         # --------- Resultados ---------
         self.frm_results = tk.LabelFrame(self.frm_left, text='Resultados')
@@ -199,15 +185,43 @@ class BisectionApp:
         self.lbl_error = tk.Label(self.frm_results, text='Error final: -'); self.lbl_error.pack(anchor='w')
         self.lbl_tol_used = tk.Label(self.frm_results, text='Tolerancia usada: -'); self.lbl_tol_used.pack(anchor='w')
         self.lbl_iters = tk.Label(self.frm_results, text='Iteraciones: -'); self.lbl_iters.pack(anchor='w')
+        self.lbl_status = tk.Label(self.frm_results, text=''); self.lbl_status.pack(anchor='w')
+        self.progress = ttk.Progressbar(self.frm_results, mode='indeterminate', length=160)
+        self.progress.pack(anchor='w', pady=(2, 4))
 
         # --------- Gráfica ---------
         self.frm_plot = tk.LabelFrame(self.frm_right, text='Gráfica')
         self.frm_plot.pack(fill=tk.BOTH, expand=True, padx=6, pady=6)
+        # la figura se crea cuando matplotlib termina de cargar (ver _warm_up)
+        self.lbl_plot_loading = tk.Label(self.frm_plot, text='Cargando gráfica…')
+        self.lbl_plot_loading.pack(expand=True)
+        self.fig = self.ax = self.canvas = self.plotter = None
+        self._pending_plot = None
+
+        # Tarea en segundo plano en curso (sólo una a la vez)
+        self.task = None
+
+        self._warm_up()
+
+    def _warm_up(self):
+        """Importa sympy y matplotlib en un hilo; la ventana ya está visible mientras tanto."""
+        BackgroundTask(self.master, lambda task: import_all(*WARM_UP_MODULES),
+                       lambda loaded: self._build_plot()).start()
+
+    def _build_plot(self):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        self.lbl_plot_loading.destroy()
         self.fig = Figure(figsize=(5, 4), dpi=100)
         self.ax = self.fig.add_subplot(111)
         self.ax.set_xlabel('x'); self.ax.set_ylabel('f(x)')
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.frm_plot)
         self.canvas.draw(); self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # curva e intervalos se crean una vez y se actualizan con set_data
+        self.plotter = PlotController(self.ax, self.canvas)
+        if self._pending_plot is not None:
+            self._pending_plot()
+            self._pending_plot = None
 
     # --------------------------
     # 🔹 Métodos de interfaz
@@ -215,9 +229,36 @@ class BisectionApp:
     def open_math_keyboard(self):
         MathKeyboard(self.master, self.entry_eq)
 
+    def run_in_background(self, work, on_done):
+        """Ejecuta work(task) fuera del hilo de Tk y entrega el resultado a on_done."""
+        if self.task is not None:
+            self.task.cancel()
+        task = BackgroundTask(self.master, work, on_done,
+                              on_error=lambda e: messagebox.showerror('Error', str(e)),
+                              on_progress=self._show_progress,
+                              on_finish=lambda: self._task_finished(task))
+        self.task = task
+        self.lbl_status.config(text='Calculando…')
+        self.progress.start(10)
+        task.start()
+
+    def _show_progress(self, it):
+        if it:
+            self.lbl_status.config(text=f'Calculando… iteración {it}')
+
+    def _task_finished(self, task):
+        # una tarea cancelada puede terminar después de que empezó otra
+        if self.task is task:
+            self.task = None
+            self.progress.stop()
+            self.lbl_status.config(text='Cancelado' if task.cancelled else '')
+
+    def on_cancel(self):
+        if self.task is not None:
+            self.task.cancel()
+
     def clear_table(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.table.clear()
 
     def on_reset(self):
         self.var_eq.set(''); self.var_a.set(''); self.var_b.set('')
@@ -227,16 +268,18 @@ class BisectionApp:
         self.lbl_error.config(text='Error final: -')
         self.lbl_tol_used.config(text='Tolerancia usada: -')
         self.lbl_iters.config(text='Iteraciones: -')
-        self.ax.clear(); self.ax.set_xlabel('x'); self.ax.set_ylabel('f(x)')
-        self.canvas.draw()
+        self._pending_plot = None
+        if self.plotter is not None:
+            self.plotter.reset()
+
+    @staticmethod
+    def _format_row(r):
+        it, a, b, c, fa, fb, fc, err = r
+        return (it, f"{a:.6g}", f"{b:.6g}", f"{c:.6g}", f"{fa:.6g}", f"{fb:.6g}",
+                f"{fc:.6g}", f"{err:.6g}")
 
     def update_table(self, rows):
-        self.clear_table()
-        for r in rows:
-            it, a, b, c, fa, fb, fc, err = r
-            self.tree.insert('', 'end', values=(it, f"{a:.6g}", f"{b:.6g}",
-                                                f"{c:.6g}", f"{fa:.6g}", f"{fb:.6g}",
-                                                f"{fc:.6g}", f"{err:.6g}"))
+        self.table.set_rows(rows)
 
     def update_results(self, final, tol):
         self.lbl_root.config(text=f"Raíz aproximada: {final['root']:.12g}")
@@ -244,62 +287,69 @@ class BisectionApp:
         self.lbl_tol_used.config(text=f"Tolerancia usada: {tol:.12g}")
         self.lbl_iters.config(text=f"Iteraciones: {final['iterations']}")
 
-    def plot_function(self, f, a, b):
-        self.ax.clear(); self.ax.set_xlabel('x'); self.ax.set_ylabel('f(x)')
-        xs = np.linspace(a, b, 400)
-        ys = [f(x) if not np.isnan(f(x)) else np.nan for x in xs]
-        self.ax.plot(xs, ys, label='f(x)')
-        self.ax.axhline(0, color='black', linewidth=0.7)
-        self.ax.legend(); self.canvas.draw()
+    def plot_function(self, f, a, b, intervals=()):
+        if self.plotter is None:
+            # matplotlib todavía está cargando: se dibuja al terminar
+            self._pending_plot = lambda: self.plot_function(f, a, b, intervals)
+            return
+        xs, ys = sample_function(f, a, b)
+        self.plotter.plot(xs, ys, intervals=intervals)
 
     def find_sign_change_intervals(self, f, xmin=-100, xmax=100, step=1.0):
-        points = np.arange(xmin, xmax + step, step)
-        sign_changes = []
-        prev_x, prev_y = points[0], f(points[0])
-        for x in points[1:]:
-            y = f(x)
-            if not (np.isnan(prev_y) or np.isnan(y)):
-                if prev_y * y < 0:
-                    sign_changes.append((prev_x, x))
-            prev_x, prev_y = x, y
-        return sign_changes
+        # malla gruesa de paso `step`, refinada sólo donde hay cambio de signo
+        return scan_sign_changes(f, xmin, xmax, n=round((xmax - xmin) / step))
 
     def on_scan_intervals(self):
         eq_text = self.var_eq.get().strip()
         if not eq_text:
             messagebox.showerror('Error', 'Por favor, ingrese una ecuación antes de buscar intervalos.')
             return
-        expr, f = parse_equation(eq_text)
-        sign_changes = self.find_sign_change_intervals(f, -100, 100, 1.0)
-        if not sign_changes:
-            messagebox.showinfo('Sin resultados', 'No se encontraron intervalos con cambio de signo.')
-            return
-        text = "Posibles intervalos donde f(x) cambia de signo:\n\n" + "\n".join(
-            [f"[{a:.2f}, {b:.2f}]" for a, b in sign_changes])
-        messagebox.showinfo('Intervalos detectados', text)
-        self.plot_function(f, -100, 100)
-        for (a, b) in sign_changes:
-            self.ax.axvspan(a, b, color='orange', alpha=0.3)
-        self.canvas.draw()
+
+        def work(task):
+            f = compile_kernel(eq_text)
+            return f, self.find_sign_change_intervals(f, -100, 100, 1.0)
+
+        def done(result):
+            f, sign_changes = result
+            if not sign_changes:
+                messagebox.showinfo('Sin resultados', 'No se encontraron intervalos con cambio de signo.')
+                return
+            text = "Posibles intervalos donde f(x) cambia de signo:\n\n" + "\n".join(
+                [f"[{a:.6g}, {b:.6g}]" for a, b in sign_changes])
+            messagebox.showinfo('Intervalos detectados', text)
+            self.plot_function(f, -100, 100, intervals=sign_changes)
+
+        self.run_in_background(work, done)
 
     def on_calculate(self):
-        try:
-            expr, f = parse_equation(self.var_eq.get())
-            a, b = float(self.var_a.get()), float(self.var_b.get())
-            tol = parse_tolerance(self.var_tol.get())
-        except Exception as e:
-            messagebox.showerror('Error', str(e))
-            return
-        rows, final = bisection(f, a, b, tol)
-        self.update_table(rows); self.update_results(final, tol)
-        self.plot_function(f, a, b)
+        # leer los widgets aquí: el hilo de trabajo no debe tocar Tk
+        eq_text, tol_text = self.var_eq.get(), self.var_tol.get()
+        a_text, b_text = self.var_a.get(), self.var_b.get()
+
+        def work(task):
+            f = compile_kernel(eq_text)
+            a, b = float(a_text), float(b_text)
+            tol = parse_tolerance(tol_text)
+            key = result_key(eq_text, 'otro.bisection', a, b, tol=tol)
+            hit = lookup(key, history=True)
+            if hit is not None:
+                return (f, a, b, tol, *hit)
+            f_scalar = compile_expression(eq_text).kernel('math')
+            rows, final = bisection(f_scalar, a, b, tol, progress=task.check)
+            store(key, final, rows)
+            return f, a, b, tol, rows, final
+
+        def done(result):
+            f, a, b, tol, rows, final = result
+            self.update_table(rows); self.update_results(final, tol)
+            self.plot_function(f, a, b)
+
+        self.run_in_background(work, done)
 
     def on_plot(self):
-        try:
-            expr, f = parse_equation(self.var_eq.get())
-            self.plot_function(f, -10, 10)
-        except Exception as e:
-            messagebox.showerror('Error', str(e))
+        eq_text = self.var_eq.get()
+        self.run_in_background(lambda task: compile_kernel(eq_text),
+                               lambda f: self.plot_function(f, -10, 10))
 
 
 # =======================
@@ -0,0 +1,65 @@
+"""
+Importación diferida de las dependencias pesadas.
+
+numpy, sympy, matplotlib y pandas tardan de décimas de segundo a más de un
+segundo en importarse. `lazy_import` devuelve un sustituto del módulo que
+lo importa de verdad en el primer acceso a un atributo, así que importar el
+núcleo numérico (metodos, expresiones, historial) no paga ese costo hasta
+que se usa.
+
+`preload` importa módulos en un hilo de fondo: las interfaces muestran su
+ventana de inmediato y calientan sympy/matplotlib mientras el usuario
+escribe.
+"""
+import importlib
+import sys
+import threading
+
+
+class LazyModule:
+    """Sustituto de un módulo que se importa al primer acceso a un atributo."""
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        # atributos especiales (copy, pickle, inspect) no fuerzan la importación
+        if attr.startswith('__'):
+            raise AttributeError(attr)
+        value = getattr(importlib.import_module(self._name), attr)
+        # los siguientes accesos ya no pasan por __getattr__
+        setattr(self, attr, value)
+        return value
+
+    def __repr__(self):
+        state = 'cargado' if self._name in sys.modules else 'sin cargar'
+        return f"<módulo diferido {self._name!r} ({state})>"
+
+
+def lazy_import(name):
+    """El módulo si ya está importado; si no, un LazyModule."""
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
+
+
+def is_loaded(name):
+    return name in sys.modules
+
+
+def import_all(*names):
+    """Importa `names` en orden; los que fallen se ignoran. Devuelve los cargados."""
+    loaded = []
+    for name in names:
+        try:
+            importlib.import_module(name)
+            loaded.append(name)
+        except Exception:
+            pass
+    return loaded
+
+
+def preload(*names):
+    """Importa `names` en un hilo de fondo; devuelve el hilo."""
+    thread = threading.Thread(target=import_all, args=names, name='precarga', daemon=True)
+    thread.start()
+    return thread
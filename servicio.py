@@ -0,0 +1,333 @@
+"""
+Servicio HTTP/JSON local para resolver ecuaciones desde otros procesos.
+
+Sólo biblioteca estándar (http.server) y sólo en localhost. Endpoints
+(POST con un objeto JSON; la respuesta también es JSON):
+
+- /solve  {equation, method, a, b | x0, tol, max_iter, digits}
+          → root, error, iterations, f_root, status (como `lotes.solve_problem`)
+- /scan   {equation, xmin, xmax, n, tol}
+          → intervals (cambios de signo) y roots (una raíz por intervalo)
+- /sweep  {equation, values | start, stop, num, param, fixed, a, b | x0, tol}
+          → arreglos de `lotes.solve_sweep`
+- GET /stats → aciertos de las cachés y lotes agrupados; GET /health
+
+Todas las solicitudes comparten la caché de expresiones compiladas del
+proceso (`expresiones`) y la caché de resultados (`cache_resultados`), y el
+trabajo corre en un pool de hilos. Las solicitudes /solve que llegan casi a
+la vez para la misma ecuación y método (bisección o Newton) se agrupan
+durante unos milisegundos y se resuelven en una sola pasada vectorizada
+(`bisection_batch` / `newton_batch`).
+
+    python servicio.py --port 8765 --workers 4
+    curl -s localhost:8765/solve -d '{"equation": "x^2 - 2", "a": 0, "b": 2}'
+"""
+import argparse
+import json
+import math
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cache_resultados import cache_stats, lookup, result_key, store
+from expresiones import cache_stats as expression_cache_stats
+from expresiones import compile_expression, normalize_equation
+from lotes import solve_problem, solve_sweep
+from metodos import bisection_batch, newton_batch, required_digits, scan_sign_changes
+from perezoso import lazy_import
+
+np = lazy_import('numpy')
+
+LOCAL_HOSTS = ('127.0.0.1', 'localhost', '::1')
+MAX_BODY = 10 << 20
+# métodos que se pueden resolver en lote vectorizado
+BATCHED = ('bisection', 'newton')
+
+
+# =======================
+# 🔹 Agrupación de solicitudes
+# =======================
+class Coalescer:
+    """
+    Junta las solicitudes /solve de la misma (ecuación, método, max_iter)
+    que llegan dentro de `window` segundos y las resuelve juntas en el pool.
+    """
+
+    def __init__(self, pool, window=0.002, max_batch=1024):
+        self.pool = pool
+        self.window = window
+        self.max_batch = max_batch
+        self._groups = {}
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.batched_requests = 0
+
+    def submit(self, group, item):
+        future = Future()
+        with self._lock:
+            pending = self._groups.get(group)
+            if pending is None:
+                pending = self._groups[group] = []
+                timer = threading.Timer(self.window, self._flush, (group, pending))
+                timer.daemon = True
+                timer.start()
+            pending.append((item, future))
+            if len(pending) >= self.max_batch:
+                self._flush_locked(group, pending)
+        return future
+
+    def _flush(self, group, pending):
+        with self._lock:
+            self._flush_locked(group, pending)
+
+    def _flush_locked(self, group, pending):
+        # el temporizador puede llegar después de que el grupo se despachó por tamaño
+        if self._groups.get(group) is not pending:
+            return
+        del self._groups[group]
+        self.batches += 1
+        self.batched_requests += len(pending)
+        self.pool.submit(_solve_group, group, pending)
+
+    def stats(self):
+        with self._lock:
+            return {'batches': self.batches, 'requests': self.batched_requests}
+
+
+def _solve_group(group, pending):
+    """Resuelve un grupo de la misma ecuación en una sola llamada vectorizada."""
+    equation, method, max_iter = group
+    try:
+        compiled = compile_expression(equation)
+        items = [item for item, _ in pending]
+        tol = [item['tol'] for item in items]
+        if method == 'bisection':
+            res = bisection_batch(compiled.kernel('numpy'), [item['a'] for item in items],
+                                  [item['b'] for item in items], tol, max_iter)
+        else:
+            res = newton_batch(compiled.kernel('numpy'), compiled.derivative(backend='numpy')[1],
+                               [item['x0'] for item in items], tol, max_iter)
+    except Exception as e:
+        for _, future in pending:
+            future.set_result(_error(str(e)))
+        return
+    for i, (item, future) in enumerate(pending):
+        iterations = int(res['iterations'][i])
+        if not math.isfinite(res['f_root'][i]):
+            # NaN/inf en f: fuera del dominio (sqrt, log de negativos) o desbordamiento
+            future.set_result(_error("f(x) no es finita: fuera del dominio de f o desbordamiento"
+                                     if iterations else
+                                     "f(a) y f(b) deben tener signos opuestos."))
+            continue
+        if not res['converged'][i] and iterations < max_iter:
+            if method == 'bisection':
+                message = "f(a) y f(b) deben tener signos opuestos."
+            else:
+                message = _newton_failure(compiled, float(res['root'][i]))
+            future.set_result(_error(message))
+            continue
+        final = {'root': float(res['root'][i]), 'error': float(res['error'][i]),
+                 'iterations': iterations, 'f_root': float(res['f_root'][i])}
+        store(item['key'], final)
+        future.set_result({**final, 'status': 'ok'})
+
+
+def _newton_failure(compiled, x):
+    """Por qué se detuvo Newton en x sin converger (mismos mensajes que `newton` si aplica)."""
+    with np.errstate(all='ignore'):
+        dfx = float(compiled.derivative(backend='numpy')[1](np.float64(x)))
+    if dfx == 0:
+        return "Derivada cero, no se puede continuar"
+    if not math.isfinite(dfx):
+        return "f'(x) no es finita: fuera del dominio de f o desbordamiento"
+    return "La iteración diverge (el siguiente x no es finito)"
+
+
+def _error(message):
+    return {'root': None, 'error': None, 'iterations': None, 'f_root': None,
+            'status': 'error', 'message': message}
+
+
+# =======================
+# 🔹 Endpoints
+# =======================
+class SolveService:
+    def __init__(self, workers=4, window=0.002):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='resolver')
+        self.coalescer = Coalescer(self.pool, window)
+
+    def solve(self, req):
+        method = req.get('method') or 'bisection'
+        tol = float(req.get('tol') or 1e-6)
+        max_iter = int(req.get('max_iter') or 1000)
+        digits = req.get('digits')
+        digits = int(digits) if digits not in (None, '') else required_digits(tol)
+        if method not in BATCHED or digits is not None or req.get('stats'):
+            # falsa posición, Brent, ITP o precisión extendida: uno por uno
+            return self.pool.submit(solve_problem, req).result()
+        if method == 'newton':
+            x0 = req.get('x0')
+            item = {'x0': float(req['a'] if x0 in (None, '') else x0)}
+            a = b = None
+        else:
+            item = {'a': float(req['a']), 'b': float(req['b'])}
+            a, b = item['a'], item['b']
+        item['tol'] = tol
+        # el lote evalúa con NumPy y `solve_problem` con math: claves distintas
+        item['key'] = result_key(req['equation'], method, a, b, item.get('x0'), tol,
+                                 max_iter, digits, backend='numpy')
+        hit = lookup(item['key'])
+        if hit is not None:
+            return {**hit.final, 'status': 'ok', 'cached': True}
+        group = (normalize_equation(req['equation']), method, max_iter)
+        return self.coalescer.submit(group, item).result()
+
+    def scan(self, req):
+        def work():
+            compiled = compile_expression(req['equation'])
+            f = compiled.kernel('numpy')
+            xmin, xmax = float(req.get('xmin', -100)), float(req.get('xmax', 100))
+            cells = scan_sign_changes(f, xmin, xmax, n=int(req.get('n', 200)))
+            roots = []
+            if cells:
+                starts, ends = zip(*cells)
+                roots = bisection_batch(f, starts, ends, float(req.get('tol') or 1e-6))['root']
+            return {'intervals': [list(c) for c in cells],
+                    'roots': [float(r) for r in roots], 'status': 'ok'}
+        return self.pool.submit(work).result()
+
+    def sweep(self, req):
+        if 'values' in req:
+            values = [float(v) for v in req['values']]
+        else:
+            start, stop, num = float(req['start']), float(req['stop']), int(req['num'])
+            step = (stop - start) / (num - 1) if num > 1 else 0.0
+            values = [start + i * step for i in range(num)]
+
+        def work():
+            res = solve_sweep(req['equation'], values, req.get('param'), req.get('a'),
+                              req.get('b'), req.get('x0'), float(req.get('tol') or 1e-10),
+                              int(req.get('max_iter') or 1000), req.get('fixed'))
+            # los NaN (valores que no convergieron) salen como null (ver _reply)
+            out = {name: v.tolist() for name, v in res.items() if name not in ('cold', 'param')}
+            return {'param': res['param'], 'values': values, **out, 'cold': res['cold'],
+                    'status': 'ok'}
+        return self.pool.submit(work).result()
+
+    def stats(self):
+        return {'result_cache': cache_stats(), 'expression_cache': expression_cache_stats(),
+                'coalesced': self.coalescer.stats()}
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _finite(value):
+    """Copia de `value` con los float no finitos (NaN, ±inf) como None."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {k: _finite(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(v) for v in value]
+    return value
+
+
+class Handler(BaseHTTPRequestHandler):
+    service = None
+    routes = {'/solve': 'solve', '/scan': 'scan', '/sweep': 'sweep'}
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._reply(200, {'status': 'ok'})
+        elif self.path == '/stats':
+            self._reply(200, self.service.stats())
+        else:
+            self._reply(404, {'status': 'error', 'message': f"Ruta desconocida: {self.path}"})
+
+    def do_POST(self):
+        name = self.routes.get(self.path)
+        if name is None:
+            self._reply(404, {'status': 'error', 'message': f"Ruta desconocida: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            if length > MAX_BODY:
+                raise ValueError("Solicitud demasiado grande")
+            req = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(req, dict) or 'equation' not in req:
+                raise ValueError("Se espera un objeto JSON con 'equation'")
+        except (ValueError, UnicodeDecodeError) as e:
+            self._reply(400, {'status': 'error', 'message': str(e)})
+            return
+        try:
+            result = getattr(self.service, name)(req)
+        except (KeyError, TypeError, ValueError) as e:
+            message = f"Falta el campo {e}" if isinstance(e, KeyError) else str(e)
+            self._reply(400, {'status': 'error', 'message': message})
+            return
+        except ArithmeticError as e:
+            # la ecuación no se puede evaluar (división por cero, desbordamiento)
+            self._reply(422, {'status': 'error', 'message': f"{type(e).__name__}: {e}"})
+            return
+        except Exception as e:
+            # nunca cortar la conexión sin respuesta
+            self._reply(500, {'status': 'error', 'message': f"{type(e).__name__}: {e}"})
+            return
+        self._reply(200 if result.get('status') == 'ok' else 422, result)
+
+    def _reply(self, code, payload):
+        # NaN/inf no son JSON válido: se envían como null
+        body = json.dumps(_finite(payload), ensure_ascii=False, allow_nan=False).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        # sin una línea por solicitud (pruebas de carga)
+        pass
+
+
+class LocalServer(ThreadingHTTPServer):
+    # cola de conexiones amplia: muchos clientes a la vez en pruebas de carga
+    request_queue_size = 256
+    daemon_threads = True
+
+
+def make_server(host='127.0.0.1', port=8765, workers=4, window=0.002):
+    """Servidor listo para serve_forever(); sólo acepta direcciones locales."""
+    if host not in LOCAL_HOSTS:
+        raise ValueError(f"El servicio sólo escucha en localhost ({', '.join(LOCAL_HOSTS)})")
+    service = SolveService(workers, window)
+    handler = type('BoundHandler', (Handler,), {'service': service})
+    server = LocalServer((host, port), handler)
+    server.service = service
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Servicio HTTP/JSON local de búsqueda de raíces.')
+    parser.add_argument('--host', default='127.0.0.1', choices=LOCAL_HOSTS)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=4, help='hilos del pool de resolución')
+    parser.add_argument('--window-ms', type=float, default=2.0,
+                        help='espera para agrupar solicitudes de la misma ecuación')
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.workers, args.window_ms / 1000)
+    print(f"Escuchando en http://{args.host}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
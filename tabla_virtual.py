@@ -0,0 +1,113 @@
+"""
+Tabla de iteraciones virtualizada para Tk.
+
+Un `ttk.Treeview` normal crea un ítem por fila; con miles de iteraciones eso
+tarda segundos. `VirtualTable` sólo crea tantos ítems como filas caben en
+pantalla y, al desplazarse, vuelve a llenar esos mismos ítems con las filas
+visibles. Los datos se leen directamente de cualquier secuencia (lista de
+tuplas, arreglo de NumPy, historial del método) y se formatean a demanda.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+
+def format_value(v):
+    """Formato por defecto de una celda (igual al de las tablas originales)."""
+    return f"{v:.6g}" if isinstance(v, (int, float)) else str(v)
+
+
+class VirtualTable:
+    def __init__(self, master, columns=(), height=20, col_width=100,
+                 format_row=None):
+        """
+        - columns: encabezados de las columnas
+        - height: filas visibles iniciales (se ajusta al redimensionar)
+        - format_row(row): tupla de textos para una fila; por defecto
+          `format_value` en cada celda
+        """
+        self.frame = tk.Frame(master)
+        self.tree = ttk.Treeview(self.frame, columns=(), show='headings', height=height)
+        self.tree.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
+        self.scrollbar = tk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.col_width = col_width
+        self.format_row = format_row or (lambda row: tuple(format_value(v) for v in row))
+        self.rows = ()
+        self.first = 0
+        self.visible = height
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', self._on_wheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll_to(self.first - 3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll_to(self.first + 3))
+        if columns:
+            self.set_columns(columns)
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def set_columns(self, columns, width=None):
+        self.tree.config(columns=columns)
+        for c in columns:
+            self.tree.heading(c, text=c)
+            self.tree.column(c, anchor='center', width=width or self.col_width)
+
+    def set_rows(self, rows):
+        """Muestra `rows` (cualquier secuencia con len() e índices) desde el inicio."""
+        self.rows = rows if rows is not None else ()
+        self.first = 0
+        self._refresh()
+
+    def append_rows(self, rows):
+        """Vuelve a dibujar tras agregar filas a la misma secuencia (o a una nueva)."""
+        self.rows = rows
+        self._refresh()
+
+    def clear(self):
+        self.set_rows(())
+
+    def scroll_to(self, first):
+        last_start = max(0, len(self.rows) - self.visible)
+        first = min(max(0, int(first)), last_start)
+        if first != self.first:
+            self.first = first
+            self._refresh()
+
+    # --- eventos ---
+    def _on_scroll(self, *args):
+        if args[0] == 'moveto':
+            self.scroll_to(float(args[1]) * len(self.rows))
+        elif args[0] == 'scroll':
+            step = self.visible if args[2] == 'pages' else 1
+            self.scroll_to(self.first + int(args[1]) * step)
+
+    def _on_wheel(self, event):
+        self.scroll_to(self.first - int(event.delta / 120) * 3)
+
+    def _on_resize(self, event):
+        rowheight = ttk.Style().lookup('Treeview', 'rowheight') or 20
+        # se descuenta el alto aproximado del encabezado
+        visible = max(1, (event.height - 25) // int(rowheight))
+        if visible != self.visible:
+            self.visible = visible
+            self._refresh()
+
+    def _refresh(self):
+        total = len(self.rows)
+        self.first = min(self.first, max(0, total - self.visible))
+        count = min(self.visible, total - self.first)
+        items = self.tree.get_children()
+        # reutilizar los ítems existentes; crear o borrar sólo la diferencia
+        if len(items) > count:
+            self.tree.delete(*items[count:])
+            items = items[:count]
+        for i in range(count):
+            values = self.format_row(self.rows[self.first + i])
+            if i < len(items):
+                self.tree.item(items[i], values=values)
+            else:
+                self.tree.insert('', 'end', values=values)
+        if total:
+            self.scrollbar.set(self.first / total, (self.first + count) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
@@ -0,0 +1,87 @@
+"""
+Tareas en segundo plano para las interfaces Tk.
+
+Tk no es seguro entre hilos: el trabajo (interpretar, resolver, escanear) se
+ejecuta en un hilo y los resultados vuelven al hilo de la interfaz mediante
+`after()`. La cancelación es cooperativa: los métodos numéricos llaman a
+`task.check(it)` entre iteraciones (parámetro `progress`), y esa llamada
+lanza `Cancelled` cuando el usuario pulsó Cancelar.
+"""
+import queue
+import threading
+
+
+class Cancelled(Exception):
+    """La tarea fue cancelada por el usuario."""
+
+
+class BackgroundTask:
+    def __init__(self, widget, func, on_done, on_error=None, on_progress=None,
+                 on_finish=None, poll_ms=50):
+        """
+        - widget: cualquier widget Tk (para usar `after`)
+        - func(task): trabajo a ejecutar en el hilo; su resultado va a on_done
+        - on_error(exc): se llama si func lanza una excepción (no si se cancela)
+        - on_progress(it): última iteración reportada con task.check(it)
+        - on_finish(): se llama siempre al terminar (hecha, cancelada o con error)
+        """
+        self.widget = widget
+        self.func = func
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_finish = on_finish
+        self.poll_ms = poll_ms
+        self._cancel = threading.Event()
+        self._results = queue.Queue()
+        self._progress = None
+        self._reported = None
+        self._thread = None
+
+    # --- lado del hilo de trabajo ---
+    def check(self, it=None, *_):
+        """Punto de control entre iteraciones: guarda el progreso o cancela."""
+        if self._cancel.is_set():
+            raise Cancelled()
+        self._progress = it
+
+    def _run(self):
+        try:
+            self._results.put(('done', self.func(self)))
+        except Cancelled:
+            self._results.put(('cancelled', None))
+        except Exception as e:
+            self._results.put(('error', e))
+
+    # --- lado de la interfaz ---
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.widget.after(self.poll_ms, self._poll)
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _poll(self):
+        if self.on_progress and self._progress != self._reported:
+            self._reported = self._progress
+            self.on_progress(self._reported)
+        try:
+            kind, value = self._results.get_nowait()
+        except queue.Empty:
+            self.widget.after(self.poll_ms, self._poll)
+            return
+        if self.on_finish:
+            self.on_finish()
+        if kind == 'done' and not self.cancelled:
+            self.on_done(value)
+        elif kind == 'error' and self.on_error and not self.cancelled:
+            self.on_error(value)
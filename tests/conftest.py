@@ -0,0 +1,8 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# las pruebas no leen ni escriben la caché de resultados del usuario
+os.environ['METODOS_RESULT_CACHE'] = 'off'
+os.environ.pop('METODOS_EXPR_CACHE', None)
@@ -0,0 +1,29 @@
+import math
+
+import pytest
+import sympy as sp
+
+import a
+
+
+def test_biseccion_matches_symbolic_evaluation():
+    historial, raiz, error = a.biseccion('cos(x) = x', 0, 1, 1e-8)
+    tabla = historial.array
+    expr = sp.cos(sp.Symbol('x')) - sp.Symbol('x')
+    for c, fc in zip(tabla['c'], tabla['f(c)']):
+        assert fc == pytest.approx(float(expr.subs('x', c)), abs=1e-15)
+    assert raiz == pytest.approx(0.7390851332151607, abs=1e-7)
+    assert error == abs(tabla['f(c)'][-1]) < 1e-8
+
+
+def test_biseccion_requires_sign_change():
+    with pytest.raises(ValueError):
+        a.biseccion('x^2 + 1', -1, 1, 1e-6)
+
+
+def test_biseccion_reports_progress():
+    seen = []
+    historial, _, _ = a.biseccion('x^3 - 2*x - 5', 2, 3, 1e-6, progress=seen.append)
+    tabla = historial.array
+    assert seen == list(range(len(tabla)))
+    assert math.isclose(tabla['f(a)*f(c)'][0], tabla['f(a)'][0] * tabla['f(c)'][0])
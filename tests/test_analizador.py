@@ -0,0 +1,99 @@
+import math
+
+import numpy as np
+import pytest
+import sympy as sp
+
+from analizador import Unsupported, compile_native, parse
+from expresiones import (CompiledExpression, _sympify, compile_expression, compile_kernel,
+                         evaluate_number)
+
+EXPRESSIONS = [
+    'x**3-2*x-5', '(cos(x))-(x)', 'exp(-x)-x', '2**-1*x', 'x**-1', 'x**2/3',
+    '-x**2+1', '2**3**2-x', 'x%3-1', 'sqrt(x)-1', 'log(x,2)-3', 'ln(x)', 'atan2(x,2)', 'abs(x)-floor(x)+ceiling(x)', 'pi*x-E',
+    'sinh(x)/cosh(x)-tanh(x)', '1/2*x', '7/2-x', '-(2**-1)**2*x', '(-2)**2-x',
+]
+# sintaxis del teclado matemático que sympify no lee: se compara con su equivalente
+KEYBOARD = {'√(x+1)-2': 'sqrt(x+1)-2', 'sp.sin(x)**2': 'sin(x)**2',
+            'log10(x)+ln(x)': 'log(x,10)+log(x)'}
+POINTS = [-2.5, -1.0, 0.0, 0.5, 1.0, 3.0, 10.0]
+
+
+def values(f, xs):
+    out = []
+    for x in xs:
+        try:
+            out.append(complex(f(x)))
+        except (ArithmeticError, ValueError, TypeError):
+            out.append('error')
+    return out
+
+
+def same(a, b):
+    if 'error' in (a, b):
+        return a == b
+    if any(map(np.isnan, (a.real, a.imag, b.real, b.imag))):
+        return np.isnan(a) == np.isnan(b)
+    return np.isclose(a, b, rtol=1e-12, atol=1e-15)
+
+
+@pytest.mark.parametrize('text, plain', [(t, t) for t in EXPRESSIONS] + list(KEYBOARD.items()))
+@pytest.mark.parametrize('backend', ['math', 'numpy'])
+def test_native_matches_sympify(text, plain, backend):
+    native = CompiledExpression(text, native=compile_native(text))
+    assert native.native is not None
+    reference = CompiledExpression(plain, _sympify(plain))
+    with np.errstate(all='ignore'):
+        got = values(native.kernel(backend), POINTS)
+        expected = values(reference.kernel(backend), POINTS)
+    assert all(same(a, b) for a, b in zip(got, expected)), (got, expected)
+    assert sp.simplify(native.expr - reference.expr) == 0
+
+
+@pytest.mark.parametrize('text', ['1/0*x', 'x/0', 'x/(1-1)', 'sqrt(-1)+x', '1e999*x',
+                                  '(-8)**(1/3)+x', 'log(0)+x'])
+def test_constants_without_real_value_use_sympify(text):
+    assert compile_native(text) is None
+    compiled = compile_expression(text)
+    assert compiled.native is None
+    # como con sympify: sin excepciones al evaluar
+    compiled.f(2.0)
+    compiled.kernel('math')(2.0)
+
+
+def test_zero_over_zero_is_nan_in_every_backend():
+    compiled = compile_expression('1/0*x')
+    assert math.isnan(compiled.f(2.0)) and math.isnan(compiled.kernel('math')(2.0))
+
+
+def test_literals_are_floats():
+    assert parse('2**-1').function('math')(0.0) == 0.5
+    assert type(parse('x+1').function('math')(1)) is float
+    assert parse('7/2*x').function('numpy')(np.ones(2)).tolist() == [3.5, 3.5]
+
+
+@pytest.mark.parametrize('text', ['2x', 'x!', 'f(x)', 'x+', 'x**2 y'])
+def test_unsupported(text):
+    with pytest.raises(Unsupported):
+        parse(text)
+
+
+def test_parameters_and_e_as_symbol():
+    native = parse('e*x-k1+E')
+    assert native.parameters == ('e', 'k1')
+    assert native.function('math', native.parameters)(2.0, 3.0, 1.0) == pytest.approx(5 + math.e)
+    assert sp.sympify(native.sympy_text).free_symbols == set(sp.symbols('e k1 x'))
+
+
+@pytest.mark.parametrize('text, value', [('10^-6', 1e-6), ('1e-8', 1e-8), ('2**-1', 0.5),
+                                         ('sqrt(4)/1000', 2e-3), ('1/3', 1 / 3)])
+def test_evaluate_number(text, value):
+    assert evaluate_number(text.replace('^', '**')) == pytest.approx(value)
+
+
+def test_parse_equation_keeps_sympy_expression():
+    import otro
+    expr, f = otro.parse_equation('x^2 = 2')
+    assert isinstance(expr, sp.Expr) and expr.free_symbols == {sp.Symbol('x')}
+    assert f(2.0) == pytest.approx(2.0)
+    assert compile_kernel('x^2 = 2') is f
@@ -0,0 +1,64 @@
+from decimal import Decimal
+
+import pytest
+
+import cache_resultados
+from cache_resultados import DEFAULT_PATH, ResultCache, cache_path, result_key
+from metodos import bisection
+
+FINAL = {'root': 1.5, 'error': 1e-7, 'iterations': 20, 'f_root': 2e-7}
+
+
+def test_round_trip_with_history(tmp_path):
+    path = str(tmp_path / 'r.sqlite3')
+    rows, final = bisection(lambda x: x * x - 2, 0, 2, 1e-8)
+    key = result_key('x^2 - 2', 'bisection', 0, 2, tol=1e-8)
+    ResultCache(path).put(key, final, rows)
+    hit = ResultCache(path).get(key, history=True)
+    assert hit.final == final
+    assert (hit.history.array == rows.array).all()
+
+
+def test_decimal_values_survive(tmp_path):
+    cache = ResultCache(str(tmp_path / 'r.sqlite3'))
+    cache.put('k', {**FINAL, 'root': Decimal('1.41421356237309504880168872')})
+    cache._memory.clear()
+    assert cache.get('k').root == Decimal('1.41421356237309504880168872')
+
+
+def test_key_depends_on_solver_version(monkeypatch):
+    key = result_key('x^2-2', 'bisection', 0, 2)
+    monkeypatch.setattr(cache_resultados, 'SOLVER_VERSION', cache_resultados.SOLVER_VERSION + 1)
+    assert result_key('x^2-2', 'bisection', 0, 2) != key
+    # el mismo problema escrito distinto sigue siendo la misma clave
+    assert result_key('x ^ 2 - 2', 'bisection', 0, 2) == result_key('x^2-2', 'bisection', 0, 2)
+
+
+def test_file_from_another_solver_version_is_cleared(tmp_path, monkeypatch):
+    path = str(tmp_path / 'r.sqlite3')
+    cache = ResultCache(path)
+    cache.put('k', FINAL)
+    cache.close()
+    assert ResultCache(path).get('k') is not None
+    monkeypatch.setattr(cache_resultados, 'SOLVER_VERSION', cache_resultados.SOLVER_VERSION + 1)
+    reopened = ResultCache(path)
+    assert reopened.get('k') is None
+    assert reopened.stats()['entries'] == 0
+
+
+def test_eviction_keeps_recent_entries(tmp_path):
+    cache = ResultCache(str(tmp_path / 'r.sqlite3'), max_entries=10, memory_size=0)
+    for i in range(25):
+        cache.put(f'k{i}', FINAL)
+    assert cache.stats()['entries'] <= 10
+    assert cache.get('k24') is not None and cache.get('k0') is None
+
+
+@pytest.mark.parametrize('value, expected', [(None, ':memory:'), ('off', None), ('0', None),
+                                             ('on', DEFAULT_PATH), ('/tmp/x.db', '/tmp/x.db')])
+def test_disk_tier_is_opt_in(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv('METODOS_RESULT_CACHE', raising=False)
+    else:
+        monkeypatch.setenv('METODOS_RESULT_CACHE', value)
+    assert cache_path() == expected
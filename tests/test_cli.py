@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+import math
+
+import pytest
+
+import cli
+
+PROBLEMS = [
+    {'equation': 'x^2 - 2', 'a': 0, 'b': 2},
+    {'equation': 'cos(x) = x', 'method': 'newton', 'x0': 1, 'tol': 1e-12},
+    {'equation': 'x^2 + 1', 'a': -1, 'b': 1},
+]
+
+
+def write_input(path, fmt):
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        if fmt == 'csv':
+            writer = csv.DictWriter(fh, fieldnames=['equation', 'method', 'a', 'b', 'x0', 'tol'])
+            writer.writeheader()
+            writer.writerows(PROBLEMS)
+        else:
+            fh.writelines(json.dumps(p) + '\n' for p in PROBLEMS)
+
+
+def read_output(path, fmt):
+    with open(path, newline='', encoding='utf-8') as fh:
+        if fmt == 'csv':
+            return list(csv.DictReader(fh))
+        return [json.loads(line) for line in fh]
+
+
+@pytest.mark.parametrize('in_fmt', ['csv', 'jsonl'])
+@pytest.mark.parametrize('out_fmt', ['csv', 'jsonl'])
+def test_round_trip(tmp_path, in_fmt, out_fmt):
+    src, dst = tmp_path / f'problemas.{in_fmt}', tmp_path / f'resultados.{out_fmt}'
+    write_input(src, in_fmt)
+    assert cli.main([str(src), '-o', str(dst), '--tol', '1e-10']) == 0
+    rows = read_output(dst, out_fmt)
+    assert [r['equation'] for r in rows] == [p['equation'] for p in PROBLEMS]
+    assert [r['method'] for r in rows] == ['bisection', 'newton', 'bisection']
+    assert [r['status'] for r in rows] == ['ok', 'ok', 'error']
+    assert float(rows[0]['root']) == pytest.approx(math.sqrt(2), abs=1e-9)
+    assert float(rows[1]['root']) == pytest.approx(0.7390851332151607, abs=1e-12)
+    assert 'signos opuestos' in rows[2]['message']
+    if out_fmt == 'csv':
+        assert list(rows[0]) == cli.OUTPUT_FIELDS
+
+
+def test_read_problems_fills_defaults():
+    stream = io.StringIO('{"equation": "x", "a": 0, "b": 1}\n\n{"equation": "x", "tol": 0.5}\n')
+    problems = list(cli.read_problems(stream, 'jsonl', {'tol': 1e-6, 'method': 'bisection'}))
+    assert problems == [{'tol': 1e-6, 'method': 'bisection', 'equation': 'x', 'a': 0, 'b': 1},
+                        {'tol': 0.5, 'method': 'bisection', 'equation': 'x'}]
+
+
+
+@pytest.mark.parametrize('text, expected', [('0:1:5', [0, 0.25, 0.5, 0.75, 1]),
+                                            ('1, 2,3', [1, 2, 3]), ('4:4:1', [4])])
+def test_parse_values(text, expected):
+    assert cli.parse_values(text) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('extra, column', [([], 'c'), (['--param', 'c'], 'c')])
+def test_sweep_labels_the_detected_parameter(tmp_path, extra, column):
+    out = tmp_path / 'barrido.csv'
+    argv = ['--sweep', 'x^2 - c', '--values', '1,4', '-a', '0', '-b', '5', '-o', str(out)]
+    assert cli.main(argv + extra) == 0
+    rows = read_output(out, 'csv')
+    assert list(rows[0])[0] == column
+    assert [float(r[column]) for r in rows] == [1.0, 4.0]
+    assert [float(r['root']) for r in rows] == pytest.approx([1.0, 2.0], abs=1e-5)
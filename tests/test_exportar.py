@@ -0,0 +1,68 @@
+import csv
+import math
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from exportar import TableWriter, export_history, read_table
+from historial import headers_for
+from metodos import bisection
+
+FIELDS = ['problema', 'raiz', 'iteraciones', 'convergio']
+# el segundo bloque trae Decimal y None; el tercero, texto
+ROWS = [('p0', 1.5, 3, True), ('p1', 2.0, 4, False),
+        ('p2', Decimal('1.41421356237309504880168872'), 5, True), ('p3', None, 6, True),
+        ('p4', 0.25, 7, False)]
+
+
+@pytest.mark.parametrize('ext', ['.npy', '.npz'])
+def test_mixed_chunks_keep_numeric_columns(tmp_path, ext):
+    path = str(tmp_path / ('tabla' + ext))
+    with TableWriter(path, FIELDS, chunk_rows=2) as writer:
+        writer.write_rows(ROWS)
+    table = read_table(path)
+    assert table['raiz'].dtype == np.float64
+    assert table['iteraciones'].dtype == np.int64
+    assert table['convergio'].dtype == np.bool_
+    assert table['problema'].dtype.kind == 'U'
+    assert list(table['problema']) == [r[0] for r in ROWS]
+    assert table['raiz'][2] == pytest.approx(math.sqrt(2))
+    assert math.isnan(table['raiz'][3])
+    assert list(table['iteraciones']) == [3, 4, 5, 6, 7]
+
+
+def test_csv_keeps_all_decimal_digits(tmp_path):
+    path = str(tmp_path / 'tabla.csv')
+    with TableWriter(path, FIELDS, chunk_rows=2) as writer:
+        writer.write_rows(ROWS)
+    with open(path, newline='', encoding='utf-8') as fh:
+        rows = list(csv.reader(fh))
+    assert rows[0] == FIELDS
+    assert rows[3][1] == '1.41421356237309504880168872'
+    assert len(rows) == len(ROWS) + 1
+
+
+@pytest.mark.parametrize('ext', ['.npy', '.npz'])
+def test_extended_precision_history_round_trip(tmp_path, ext):
+    f = lambda x: x * x - 2
+    result = bisection(f, 1, 2, 1e-25, precision=35, f_mp=f)
+    rows, _ = result
+    path = str(tmp_path / ('historial' + ext))
+    assert export_history(rows, path, chunk_rows=16) == len(rows)
+    table = read_table(path)
+    headers = headers_for(rows.array.dtype.names)
+    assert list(table) == list(headers)
+    for header, name in zip(headers, rows.array.dtype.names):
+        column = table[header]
+        assert column.dtype.kind in 'if'
+        expected = np.array([float(v) for v in rows.array[name]])
+        np.testing.assert_allclose(column, expected, rtol=0, atol=0)
+
+
+def test_empty_history_keeps_columns(tmp_path):
+    path = str(tmp_path / 'vacio.npz')
+    empty = np.empty(0, dtype=[('it', 'i8'), ('x', object)])
+    export_history(empty, path, headers=['it', 'x'])
+    table = read_table(path)
+    assert table['it'].shape == (0,) and table['x'].dtype == np.float64
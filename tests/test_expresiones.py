@@ -0,0 +1,98 @@
+import math
+
+import pytest
+
+from expresiones import ExpressionCache, compile_expression, normalize_equation
+from metodos import newton
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ExpressionCache(maxsize=2)
+    first = cache.get('x^2 - 2')
+    cache.get('x - 1')
+    assert cache.get('x**2-2') is first      # mismo texto normalizado: acierto
+    cache.get('x + 3')                       # desaloja 'x - 1', el menos usado
+    assert list(cache._data) == [normalize_equation('x^2-2'), normalize_equation('x+3')]
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 3, 2)
+    cache.get('x - 1')
+    assert cache.stats()['misses'] == 4
+
+
+def test_disk_tier_round_trip(tmp_path):
+    path = str(tmp_path / 'expresiones')
+    cache = ExpressionCache(path=path)
+    # gamma no la maneja el analizador nativo: pasa por sympify y se guarda en disco
+    compiled = cache.get('gamma(x) - 2')
+    assert compiled.native is None
+    dexpr, _ = compiled.derivative(1)
+    cache.persist(compiled)
+
+    fresh = ExpressionCache(path=path)
+    loaded = fresh.get('gamma(x) - 2')
+    assert fresh.stats()['disk_hits'] == 1
+    assert loaded.expr == compiled.expr
+    assert loaded.derivative(1, backend=None)[0] == dexpr
+    assert loaded.kernel('math')(3.0) == pytest.approx(math.gamma(3.0) - 2)
+
+
+def test_native_expressions_skip_the_disk_tier(tmp_path):
+    cache = ExpressionCache(path=str(tmp_path / 'expresiones'))
+    assert cache.get('x^3 - 2*x - 5').native is not None
+    assert cache.stats()['native'] == 1
+    assert ExpressionCache(path=str(tmp_path / 'expresiones'))._load_from_disk('x**3-2*x-5') is None
+
+
+@pytest.mark.parametrize('text, expected', [('x^2 = 2', '(x**2)-(2)'), (' x ^ 3 ', 'x**3')])
+def test_normalize_equation(text, expected):
+    assert normalize_equation(text) == expected
+
+
+@pytest.mark.parametrize('text', ['', '   ', 'x = 1 = 2'])
+def test_normalize_equation_rejects(text):
+    with pytest.raises(ValueError):
+        normalize_equation(text)
+
+
+@pytest.mark.parametrize('text', ['x^3 - 2*x - 5', 'cos(x) = x', 'sign(x)*x**2 - 2'])
+def test_backends_agree(text):
+    compiled = compile_expression(text)
+    xs = [0.5, 1.25, 2.0, 3.5]
+    expected = [float(compiled.expr.subs('x', v)) for v in xs]
+    for backend in ('math', 'numpy', 'mpmath', 'sympy'):
+        f = compiled.kernel(backend)
+        assert [float(f(v)) for v in xs] == pytest.approx(expected, rel=1e-12), backend
+    assert compiled.grid(xs).tolist() == pytest.approx(expected, rel=1e-12)
+
+
+def test_math_kernel_falls_back_to_numpy_semantics():
+    f = compile_expression('log(x) + 1/x').kernel('math')
+    assert math.isnan(f(-1.0))
+    assert f(0.0) == math.inf or math.isnan(f(0.0))
+    assert f(1.0) == 1.0
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        compile_expression('x + 1').kernel('fortran')
+
+
+@pytest.mark.parametrize('text', ['x^3 - 2*x - 5', 'exp(-x)*sin(x) - x/4', 'sqrt(x^2+1) = 2'])
+@pytest.mark.parametrize('backend', ['math', 'numpy'])
+def test_newton_kernel_equals_f_and_derivative(text, backend):
+    compiled = compile_expression(text)
+    fdf = compiled.newton_kernel(backend)
+    f, df = compiled.kernel(backend), compiled.derivative(1, backend)[1]
+    for x in (-1.5, 0.25, 2.0):
+        fx, dfx = fdf(x)
+        assert fx == pytest.approx(f(x), rel=1e-14, abs=1e-15)
+        assert dfx == pytest.approx(df(x), rel=1e-14, abs=1e-15)
+    assert compiled.newton_kernel(backend) is fdf
+
+
+def test_newton_with_fused_kernel_matches_separate_calls():
+    compiled = compile_expression('x^3 - 2*x - 5')
+    f, df = compiled.kernel('math'), compiled.derivative(1, 'math')[1]
+    fused = newton(None, None, 2.0, 1e-12, fdf=compiled.newton_kernel('math'))
+    separate = newton(f, df, 2.0, 1e-12)
+    assert list(fused.history) == list(separate.history)
@@ -0,0 +1,46 @@
+import math
+
+import numpy as np
+
+from grafica import sample_function
+
+
+def test_samples_are_sorted_within_budget_and_exact():
+    calls = []
+
+    def f(xs):
+        calls.append(np.size(xs))
+        return np.sin(xs)
+
+    xs, ys = sample_function(f, -10, 10, budget=500, initial=100)
+    assert xs[0] == -10 and xs[-1] == 10
+    assert np.all(np.diff(xs) > 0) and len(xs) <= 500
+    np.testing.assert_array_equal(ys, np.sin(xs))
+    # una llamada vectorizada por pasada, no una por punto
+    assert len(calls) <= 1 + 6 and calls[0] == 100
+
+
+def test_refines_where_the_curve_bends():
+    xs, _ = sample_function(lambda x: np.abs(x), -1, 1, initial=21)
+    near_kink = np.sum(np.abs(xs) < 0.1)
+    far = np.sum(np.abs(xs - 0.75) < 0.1)
+    assert near_kink > far
+    # una recta no necesita puntos extra
+    xs, _ = sample_function(lambda x: 2 * x + 1, 1, 5, initial=50)
+    assert len(xs) == 50
+
+
+def test_poles_and_domain_edges_become_gaps():
+    xs, ys = sample_function(lambda x: 1 / x, -1, 1, initial=50)
+    i = np.flatnonzero(np.isnan(ys))
+    assert i.size and all(xs[j - 1] < 0 < xs[j + 1] for j in i)
+    xs, ys = sample_function(np.sqrt, -1, 1, initial=50)
+    assert np.isnan(ys[xs < 0]).all() and np.isfinite(ys[xs >= 0]).all()
+    # el borde del dominio queda refinado
+    assert np.min(xs[xs >= 0]) < 2 / 49 / 8
+
+
+def test_scalar_functions_are_sampled_point_by_point():
+    xs, ys = sample_function(lambda x: math.log(x), -1, 2, initial=31)
+    assert np.isnan(ys[xs <= 0]).all()
+    assert np.allclose(ys[xs > 0], np.log(xs[xs > 0]))
@@ -0,0 +1,78 @@
+import pytest
+
+from historial import (BRACKET_FIELDS, History, NoHistory, RingHistory, SolveResult,
+                       bisection_capacity, make_history)
+from metodos import bisection
+
+
+def reference_bisection(f, a, b, tol, max_iter=1000):
+    """La versión de siempre: una lista de tuplas."""
+    rows, fa, fb = [], f(a), f(b)
+    for it in range(1, max_iter + 1):
+        c = (a + b) / 2
+        fc = f(c)
+        error = abs(b - a) / 2
+        rows.append((it, a, b, c, fa, fb, fc, error))
+        if abs(fc) < tol or error < tol:
+            break
+        if fa * fc < 0:
+            b, fb = c, fc
+        else:
+            a, fa = c, fc
+    return rows
+
+
+def test_history_grows_and_behaves_like_a_list():
+    rows = History(BRACKET_FIELDS, capacity=2)
+    data = [(i, i, i + 1.0, i + 0.5, -1.0, 1.0, 0.5, 1.0 / (i + 1)) for i in range(1, 12)]
+    for row in data:
+        rows.append(row)
+    assert len(rows) == 11 and len(rows.data) == 16
+    assert list(rows) == data
+    assert rows[0] == data[0] and rows[-1] == data[-1] and rows[2:4] == data[2:4]
+    with pytest.raises(IndexError):
+        rows[11]
+    assert rows.array['c'].tolist() == [r[3] for r in data]
+
+
+def test_bisection_history_matches_list_of_tuples():
+    f = lambda x: x ** 3 - 2 * x - 5
+    result = bisection(f, 2, 3, 1e-12)
+    expected = reference_bisection(f, 2, 3, 1e-12)
+    rows, final = result
+    assert list(rows) == expected
+    assert final == {'root': expected[-1][3], 'error': expected[-1][7],
+                     'iterations': len(expected), 'f_root': expected[-1][6]}
+    # la capacidad reservada alcanza sin crecer
+    assert len(rows.data) == bisection_capacity(2, 3, 1e-12, 1000) >= len(rows)
+
+
+def test_solve_result_reads_the_last_row():
+    rows = History(BRACKET_FIELDS)
+    rows.append((1, 0.0, 2.0, 1.0, -2.0, 2.0, -1.0, 1.0))
+    rows.append((2, 1.0, 2.0, 1.5, -1.0, 2.0, 0.25, 0.5))
+    result = SolveResult(rows, 'c', 'fc')
+    assert (result.root, result.f_root, result.error, result.iterations) == (1.5, 0.25, 0.5, 2)
+    assert result[0] is rows and result[1] == result.final
+    assert type(result.root) is float
+
+
+
+def test_ring_history_keeps_the_last_rows_in_order():
+    rows = make_history(4, BRACKET_FIELDS)
+    data = [(i, 0.0, 1.0, 0.5, -1.0, 1.0, float(i), 0.0) for i in range(1, 11)]
+    for row in data:
+        rows.append(row)
+    assert len(rows) == 4
+    assert list(rows) == data[-4:] and rows[0] == data[6] and rows[-1] == data[-1]
+    assert rows.array['it'].tolist() == [7, 8, 9, 10]
+    assert SolveResult(rows, 'c', 'fc').iterations == 10
+
+
+def test_make_history_modes():
+    assert type(make_history('full', BRACKET_FIELDS)) is History
+    assert type(make_history(5, BRACKET_FIELDS)) is RingHistory
+    none = make_history(None, BRACKET_FIELDS)
+    assert type(none) is NoHistory and not none.record_each
+    with pytest.raises(ValueError):
+        make_history('algunas', BRACKET_FIELDS)
@@ -0,0 +1,72 @@
+import math
+
+import pytest
+
+from instrumentacion import (SolveStats, convergence_orders, format_stats, order_estimate,
+                             wasted_iterations)
+from metodos import bisection, brent, itp, newton
+
+
+def _stats(solver, f, *args):
+    stats = SolveStats()
+    result = solver(stats.count('f', f, trace=True), *args)
+    return stats.finish(result, args[-1]).stats
+
+
+@pytest.mark.parametrize('f', [lambda x: x * x - 2, lambda x: math.cos(x) - x])
+def test_itp_order_is_positive_or_unknown(f):
+    stats = _stats(itp, f, 0, 2, 1e-10)
+    assert all(q is None or q > 0 for q in stats['orders'])
+    assert stats['order'] is None or stats['order'] > 0
+
+
+def test_newton_order_is_quadratic():
+    stats = SolveStats()
+    result = newton(stats.count('f', lambda x: x * x - 2, trace=True), lambda x: 2 * x,
+                    1.0, 1e-14)
+    order = stats.finish(result, 1e-14).stats['order']
+    assert order == pytest.approx(2, abs=0.3)
+
+
+def test_orders_skip_triples_where_error_grows():
+    xs = [1.0, 0.5, 0.6, 0.1, 0.01, 0.0]
+    orders = convergence_orders(xs)
+    assert orders[1] is None and orders[2] is None
+    assert all(q is None or q > 0 for q in orders)
+
+
+def test_order_estimate_needs_enough_values():
+    assert order_estimate([None, 1.5, None]) is None
+    assert order_estimate([-24.0, float('nan'), 0.0]) is None
+    assert order_estimate([1.0, 2.0, 3.0]) == 2.0
+
+
+def test_wasted_iterations_count_only_steps_after_the_tolerance():
+    assert wasted_iterations([1.0, 0.5, 0.25, 0.0], 0.1) == 0
+    # alejarse al principio no es desperdicio
+    assert wasted_iterations([1.0, 0.5, 0.7, 0.1, 0.0], 1e-3) == 0
+    # x_2 ya estaba a 1e-4 del final: las dos últimas sobraban
+    assert wasted_iterations([1.0, 0.5, 1e-4, 1e-5, 0.0], 1e-3) == 2
+    # pasos del tamaño de la resolución de float64 (estancamiento)
+    x = 1.4142135623730951
+    assert wasted_iterations([1.0, 1.5, x, x + 2.2e-16, x + 4.4e-16, x + 1e-15], 1e-20) == 3
+    assert wasted_iterations([1.0], 1e-3) == 0
+
+
+@pytest.mark.parametrize('solver', [bisection, brent, itp])
+def test_wasted_iterations_of_bracket_solvers(solver):
+    f = lambda x: x * x - 2
+    stats = _stats(solver, f, 0, 2, 1e-10)
+    result = solver(f, 0, 2, 1e-10)
+    xs = list(result.history.array['c'])
+    wasted = stats['wasted_iterations']
+    assert 0 <= wasted < result.iterations
+    # la primera iteración "útil de más" ya estaba dentro de la tolerancia
+    k = len(xs) - 1 - wasted
+    assert abs(xs[k] - xs[-1]) <= 1e-10
+    assert all(abs(x - xs[-1]) > 1e-10 for x in xs[:k])
+
+
+def test_stats_line_names_the_metric():
+    stats = _stats(bisection, lambda x: x * x - 2, 0, 2, 1e-10)
+    assert 'iteraciones tras alcanzar la tolerancia' in format_stats(stats)
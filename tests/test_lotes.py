@@ -0,0 +1,56 @@
+import math
+
+import pytest
+
+from lotes import solve_many, solve_problem, solve_sweep
+from metodos import bisection, newton
+
+PROBLEMS = [
+    {'equation': f'x^2 - {k}', 'a': 0, 'b': 10, 'tol': 1e-10} for k in range(1, 9)
+] + [
+    {'equation': 'cos(x) = x', 'method': 'newton', 'x0': 1, 'tol': 1e-12},
+    {'equation': 'x^3 - 2*x - 5', 'method': 'brent', 'a': 2, 'b': 3, 'tol': 1e-12},
+    {'equation': 'x^2 + 1', 'a': -1, 'b': 1},
+    {'equation': 'x +', 'a': 0, 'b': 1},
+]
+
+
+def test_solve_problem_matches_scalar_solvers():
+    got = solve_problem({'equation': 'x^2 - 2', 'a': 0, 'b': 2, 'tol': 1e-10})
+    expected = bisection(lambda x: x * x - 2, 0.0, 2.0, 1e-10)
+    assert got['status'] == 'ok'
+    assert (got['root'], got['iterations']) == (expected.root, expected.iterations)
+    got = solve_problem({'equation': 'x^2 - 2', 'method': 'newton', 'x0': 1, 'tol': 1e-12})
+    expected = newton(lambda x: x * x - 2, lambda x: 2 * x, 1.0, 1e-12)
+    assert got['root'] == pytest.approx(expected.root, abs=1e-15)
+
+
+def test_solve_problem_reports_errors():
+    got = solve_problem({'equation': 'x^2 + 1', 'a': -1, 'b': 1})
+    assert got['status'] == 'error' and 'signos opuestos' in got['message']
+    assert solve_problem({'equation': 'x', 'method': 'secante', 'a': 0, 'b': 1})['status'] == 'error'
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_solve_many_keeps_input_order(workers):
+    results = list(solve_many(iter(PROBLEMS), workers=workers, chunksize=3))
+    assert len(results) == len(PROBLEMS)
+    for k, res in enumerate(results[:8], start=1):
+        assert res['status'] == 'ok'
+        assert res['root'] == pytest.approx(math.sqrt(k), abs=1e-9)
+    assert results[8]['root'] == pytest.approx(0.7390851332151607, abs=1e-12)
+    assert results[9]['root'] == pytest.approx(2.0945514815423265, abs=1e-12)
+    assert [r['status'] for r in results[10:]] == ['error', 'error']
+    assert results == [solve_problem(p) for p in PROBLEMS]
+
+
+def test_solve_sweep_detects_and_reports_the_parameter():
+    res = solve_sweep('x^2 - c', [1, 4, 9], a=0, b=5, tol=1e-12)
+    assert res['param'] == 'c'
+    assert res['root'].tolist() == pytest.approx([1, 2, 3], abs=1e-11)
+    res = solve_sweep('x^3 - k*x - c', [1, 2], param='k', x0=2, fixed={'c': 5}, tol=1e-12)
+    assert res['param'] == 'k'
+    for k, root in zip([1, 2], res['root']):
+        assert root ** 3 - k * root - 5 == pytest.approx(0, abs=1e-9)
+    with pytest.raises(ValueError):
+        solve_sweep('x^3 - k*x - c', [1, 2], a=0, b=5)
@@ -0,0 +1,157 @@
+import math
+
+import numpy as np
+import pytest
+
+from metodos import (bisection, bisection_batch, false_position, iter_bisection,
+                     iter_false_position, iter_newton, newton, newton_batch, scan_sign_changes,
+                     sweep)
+
+F = lambda x: x * x - 2e6
+F_MP = lambda x: x * x - 2 * 10 ** 6
+ROOT = math.sqrt(2e6)
+
+
+@pytest.mark.parametrize('solver', [bisection, false_position])
+def test_precision_far_from_one_bracket(solver):
+    result = solver(F, 1000, 2000, 1e-20, precision=30, f_mp=F_MP)
+    assert result.iterations < 1000
+    assert abs(float(result.root) - ROOT) < 1e-9
+
+
+def test_precision_far_from_one_newton():
+    result = newton(F, lambda x: 2 * x, 1500, 1e-20, precision=30, f_mp=F_MP,
+                    df_mp=lambda x: 2 * x)
+    assert abs(float(result.root) - ROOT) < 1e-9
+    assert result.error < 1e-20
+
+
+@pytest.mark.parametrize('mode, expected', [(None, 1), (5, 5)])
+@pytest.mark.parametrize('solver', [bisection, false_position])
+def test_precision_tail_respects_history_mode(solver, mode, expected):
+    result = solver(lambda x: x * x - 2, 1, 2, 1e-25, history=mode, precision=35,
+                    f_mp=lambda x: x * x - 2)
+    assert len(result.history) == expected
+    assert result.history.data.dtype.hasobject
+    assert abs(float(result.root) - math.sqrt(2)) < 1e-15
+
+
+@pytest.mark.parametrize('mode, expected', [(None, 1), (2, 2)])
+def test_precision_newton_tail_respects_history_mode(mode, expected):
+    result = newton(lambda x: x * x - 2, lambda x: 2 * x, 1.5, 1e-25, history=mode,
+                    precision=35, f_mp=lambda x: x * x - 2, df_mp=lambda x: 2 * x)
+    assert len(result.history) == expected
+    assert result.error < 1e-25
+
+
+def test_precision_full_history_keeps_every_row():
+    result = bisection(lambda x: x * x - 2, 1, 2, 1e-25, precision=35,
+                       f_mp=lambda x: x * x - 2)
+    assert len(result.history) == result.iterations
+
+
+@pytest.mark.parametrize('a, b', [(0, 3), (3, 6)])
+def test_brent_stops_at_exact_root_endpoint(a, b):
+    from metodos import brent
+    result = brent(lambda x: x - 3, a, b, 1e-12)
+    assert result.iterations == 1
+    assert result.root == 3 and result.f_root == 0
+
+
+def test_bisection_batch_matches_scalar_bisection():
+    f = lambda x: x ** 3 - 2 * x - 5
+    a, b = [2.0, 1.5, 0.0, -3.0], [3.0, 2.5, 4.0, 3.0]
+    res = bisection_batch(f, a, b, 1e-10)
+    for i, (ai, bi) in enumerate(zip(a, b)):
+        scalar = bisection(f, ai, bi, 1e-10)
+        assert res['root'][i] == scalar.root
+        assert res['f_root'][i] == scalar.f_root
+        assert res['iterations'][i] == scalar.iterations
+        assert res['converged'][i]
+    # sin cambio de signo: NaN y sin convergencia, sin afectar al resto
+    res = bisection_batch(f, [3.0, 2.0], [4.0, 3.0], 1e-10)
+    assert np.isnan(res['root'][0]) and not res['converged'][0]
+    assert res['converged'][1]
+
+
+def test_bisection_batch_params_solve_each_family_member():
+    ks = np.array([1.0, 2.0, 9.0])
+    res = bisection_batch(lambda x, k: x * x - k, 0, 4, 1e-12, params=(ks,))
+    np.testing.assert_allclose(res['root'], np.sqrt(ks), atol=1e-11)
+    assert res['converged'].all()
+
+
+def test_scan_finds_every_sign_change_of_a_polynomial():
+    roots = [-7.31, -0.23, 2.57, 41.71]
+    f = lambda x: (x + 7.31) * (x + 0.23) * (x - 2.57) * (x - 41.71)
+    cells = scan_sign_changes(f, -100, 100, n=200, subdiv=16, levels=2)
+    assert len(cells) == len(roots)
+    width = 200 / (200 * 16 ** 2)
+    for (lo, hi), root in zip(cells, roots):
+        assert lo <= root <= hi
+        assert hi - lo == pytest.approx(width)
+
+
+def test_scan_reports_grid_zeros_and_skips_poles():
+    # raíz exacta en x = 0 (nodo de la malla) y polo doble en x = 1 (no cambia de signo); 1/x cambia de signo en un polo, no en una raíz
+    cells = scan_sign_changes(lambda x: x / (x - 1) ** 2, -10, 10, n=20)
+    assert cells == [(0.0, 0.0)]
+    cells = scan_sign_changes(lambda x: 1 / x, -10, 10, n=21)
+    assert cells == []
+
+
+G = lambda x: x ** 3 - 2 * x - 5
+DG = lambda x: 3 * x ** 2 - 2
+
+
+@pytest.mark.parametrize('solver, generator, args', [
+    (bisection, iter_bisection, (G, 2, 3, 1e-12)),
+    (false_position, iter_false_position, (G, 2, 3, 1e-12)),
+    (newton, iter_newton, (G, DG, 2.5, 1e-12)),
+])
+def test_generators_and_history_modes_match_full_history(solver, generator, args):
+    full = solver(*args)
+    assert list(generator(*args)) == list(full.history)
+    for mode, kept in ((3, 3), (None, 1), (10 ** 6, len(full.history))):
+        result = solver(*args, history=mode)
+        assert result.final == full.final
+        assert list(result.history) == list(full.history)[-kept:]
+
+
+def test_generator_can_stop_early():
+    rows = iter_bisection(G, 2, 3, 1e-12)
+    first = [next(rows) for _ in range(3)]
+    assert first == list(bisection(G, 2, 3, 1e-12).history)[:3]
+
+
+def test_newton_batch_matches_scalar_newton():
+    x0 = [1.0, 2.0, 3.0]
+    res = newton_batch(G, DG, x0, 1e-12)
+    for i, x in enumerate(x0):
+        scalar = newton(G, DG, x, 1e-12)
+        assert res['root'][i] == scalar.root
+        assert res['iterations'][i] == scalar.iterations
+        assert res['converged'][i]
+    # f' = 0 en el punto inicial: esa raíz no converge y las demás sí
+    res = newton_batch(lambda x: x * x - 2, lambda x: 2 * x, [0.0, 1.0], 1e-12)
+    assert list(res['converged']) == [False, True]
+
+
+@pytest.mark.parametrize('use_newton', [False, True])
+def test_sweep_matches_scalar_solves(use_newton):
+    f = lambda x, k: x ** 3 - k * x - 5
+    df = lambda x, k: 3 * x ** 2 - k
+    ks = np.linspace(0, 10, 257)[::-1]      # el orden de entrada se respeta
+    if use_newton:
+        res = sweep(f, ks, x0=3.0, df=df, tol=1e-12)
+    else:
+        res = sweep(f, ks, a=0, b=5, tol=1e-12)
+    assert res['converged'].all()
+    assert res['cold'] < len(ks)
+    for i in (0, 1, 100, 200, 256):
+        k = ks[i]
+        if use_newton:
+            expected = newton(lambda x: f(x, k), lambda x: df(x, k), 3.0, 1e-12).root
+        else:
+            expected = bisection(lambda x: f(x, k), 0, 5, 1e-12).root
+        assert res['root'][i] == pytest.approx(expected, abs=1e-11)
@@ -0,0 +1,14 @@
+import metodos
+import otro
+
+
+def test_bisection_evaluates_f_once_per_iteration():
+    calls = []
+
+    def f(x):
+        calls.append(x)
+        return x ** 3 - 2 * x - 5
+
+    result = otro.bisection(f, 2, 3, 1e-12)
+    assert len(calls) == result.iterations + 2
+    assert list(result.history) == list(metodos.bisection(f, 2, 3, 1e-12).history)
@@ -0,0 +1,49 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from perezoso import LazyModule, is_loaded, lazy_import
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ('numpy', 'sympy', 'matplotlib', 'pandas', 'ttkbootstrap', 'PIL')
+
+
+def loaded_after(statement):
+    """Módulos pesados cargados tras ejecutar `statement` en un proceso nuevo."""
+    code = (f"import sys; {statement}; import json; "
+            f"print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))")
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+@pytest.mark.parametrize('statement', ['import metodos', 'import expresiones', 'import historial',
+                                       'import lotes', 'from metodos import bisection'])
+def test_core_imports_do_not_load_heavy_modules(statement):
+    assert loaded_after(statement) == []
+
+
+@pytest.mark.parametrize('module', ['ahg', 'yanose'])
+def test_gui_modules_do_not_load_heavy_modules_at_import(module):
+    pytest.importorskip('tkinter')
+    assert loaded_after(f'from {module} import bisection') == []
+
+
+def test_lazy_module_imports_on_first_attribute():
+    assert loaded_after("from perezoso import lazy_import; lazy_import('numpy')") == []
+    assert loaded_after("from perezoso import lazy_import; lazy_import('numpy').pi") == ['numpy']
+
+
+def test_lazy_import_returns_loaded_modules_directly():
+    import math
+    assert lazy_import('math') is math
+    proxy = LazyModule('json')
+    assert proxy.dumps([1]) == '[1]'
+    assert 'dumps' in vars(proxy)          # el atributo queda en caché
+    with pytest.raises(AttributeError):
+        proxy.__wrapped__
+    assert is_loaded('json')
+
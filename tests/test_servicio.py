@@ -0,0 +1,93 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from cache_resultados import result_key
+from servicio import make_server
+
+
+def _reject(constant):
+    raise ValueError(f"JSON inválido: {constant}")
+
+
+@pytest.fixture(scope='module')
+def server():
+    server = make_server(port=0, workers=2, window=0.001)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    server.service.close()
+
+
+def post(server, path, payload):
+    url = f"http://127.0.0.1:{server.server_address[1]}{path}"
+    data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    try:
+        with urllib.request.urlopen(url, data, timeout=10) as resp:
+            code, body = resp.status, resp.read()
+    except urllib.error.HTTPError as e:
+        code, body = e.code, e.read()
+    # NaN/Infinity no son JSON estándar: el servicio no debe enviarlos
+    return code, json.loads(body, parse_constant=_reject)
+
+
+def test_solve_bisection(server):
+    code, body = post(server, '/solve', {'equation': 'x^2 - 2', 'a': 0, 'b': 2, 'tol': 1e-10})
+    assert code == 200 and body['status'] == 'ok'
+    assert body['root'] == pytest.approx(2 ** 0.5, abs=1e-9)
+
+
+def test_solve_outside_domain_is_an_error_not_nan(server):
+    code, body = post(server, '/solve', {'equation': 'sqrt(x)', 'a': -2, 'b': -1})
+    assert code == 422 and body['status'] == 'error'
+    assert 'dominio' in body['message']
+
+
+def test_newton_failures_are_told_apart(server):
+    code, body = post(server, '/solve', {'equation': 'x^2 + 1', 'x0': 0, 'method': 'newton'})
+    assert code == 422 and body['message'] == "Derivada cero, no se puede continuar"
+    code, body = post(server, '/solve', {'equation': 'log(x)', 'x0': 3, 'method': 'newton'})
+    assert code == 422 and 'dominio' in body['message']
+
+
+def test_scan_with_division_by_zero_gets_a_response(server):
+    code, body = post(server, '/scan', {'equation': '1/0*x'})
+    assert code in (200, 422)
+
+
+@pytest.mark.parametrize('exc, code', [(ZeroDivisionError('division by zero'), 422),
+                                       (RuntimeError('boom'), 500)])
+def test_unexpected_errors_become_json(server, monkeypatch, exc, code):
+    def fail(req):
+        raise exc
+    monkeypatch.setattr(server.service, 'scan', fail)
+    got, body = post(server, '/scan', {'equation': 'x'})
+    assert got == code and body['status'] == 'error' and str(exc) in body['message']
+
+
+def test_bad_requests(server):
+    assert post(server, '/solve', b'{no es json')[0] == 400
+    assert post(server, '/solve', {'a': 1})[0] == 400
+    assert post(server, '/nada', {'equation': 'x'})[0] == 404
+
+
+def test_sweep_nan_is_null(server):
+    code, body = post(server, '/sweep', {'equation': 'x^2 - k', 'values': [-1, 4],
+                                         'a': 0, 'b': 3})
+    assert code == 200
+    assert body['root'][0] is None and body['root'][1] == pytest.approx(2, abs=1e-8)
+
+
+def test_batched_and_scalar_results_use_different_keys():
+    args = ('x^2-2', 'bisection', 0, 2, None, 1e-6, 1000, None)
+    assert result_key(*args) != result_key(*args, backend='numpy')
+
+
+def test_sweep_reports_the_parameter(server):
+    code, body = post(server, '/sweep', {'equation': 'x^2 - c', 'values': [1, 4], 'a': 0, 'b': 3})
+    assert code == 200 and body['param'] == 'c'
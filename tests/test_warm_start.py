@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from metodos import bisection, brent, false_position, itp, newton
+
+# tres raíces: 0.5, 1.7 y 2.6
+F = lambda x: (x - 0.5) * (x - 1.7) * (x - 2.6)
+BRACKET_SOLVERS = [bisection, false_position, brent, itp]
+
+
+def _cold_or_error(solver, *args):
+    try:
+        return solver(F, *args)
+    except ValueError as e:
+        return e
+
+
+@pytest.mark.parametrize('solver', BRACKET_SOLVERS)
+@pytest.mark.parametrize('a, b, tol', [(0, 2, 1e-6), (0, 3, 1e-9), (0, 2, 1e-9),
+                                       (1, 2, 1e-12), (1, 2, 1e-3), (1.6, 1.8, 1e-10)])
+def test_warm_bracket_matches_cold_solve(solver, a, b, tol):
+    previous = solver(F, 1, 2, 1e-6)
+    cold = _cold_or_error(solver, a, b, tol)
+    if isinstance(cold, ValueError):
+        with pytest.raises(ValueError, match='signos opuestos'):
+            solver(F, a, b, tol, resume=previous)
+        return
+    warm = solver(F, a, b, tol, resume=previous)
+    assert warm.root == pytest.approx(cold.root, abs=10 * tol)
+    assert warm.error < tol or abs(warm.f_root) < tol
+
+
+@pytest.mark.parametrize('solver', [bisection, false_position])
+@pytest.mark.parametrize('tol', [1e-3, 1e-12])
+def test_same_bracket_reproduces_cold_history(solver, tol):
+    previous = solver(F, 1, 2, 1e-6)
+    warm = solver(F, 1, 2, tol, resume=previous)
+    cold = solver(F, 1, 2, tol)
+    np.testing.assert_array_equal(warm.history.array, cold.history.array)
+
+
+def test_tighter_tolerance_only_computes_new_rows():
+    calls = []
+    f = lambda x: calls.append(x) or F(x)
+    previous = bisection(f, 1, 2, 1e-6)
+    calls.clear()
+    warm = bisection(f, 1, 2, 1e-12, resume=previous)
+    assert len(calls) == warm.iterations - previous.iterations
+
+
+def test_bracket_outside_previous_final_bracket_is_solved_cold():
+    previous = bisection(F, 1, 2, 1e-6)
+    warm = bisection(F, 0, 3, 1e-9, resume=previous)
+    np.testing.assert_array_equal(warm.history.array, bisection(F, 0, 3, 1e-9).history.array)
+
+
+def test_bracket_inside_final_bracket_continues_history():
+    previous = bisection(F, 1, 2, 1e-3)
+    last = previous.history.array[-1]
+    lo, hi = sorted((float(last['c']), float(last['b'] if last['fc'] * last['fb'] < 0
+                                               else last['a'])))
+    warm = bisection(F, lo, hi, 1e-12, resume=previous)
+    assert warm.iterations > previous.iterations
+    np.testing.assert_array_equal(warm.history.array[:previous.iterations],
+                                  previous.history.array)
+    assert warm.root == pytest.approx(1.7, abs=1e-11)
+
+
+@pytest.mark.parametrize('solver', [brent, itp])
+def test_brent_itp_do_not_reuse_prefix_for_looser_tolerance(solver):
+    previous = solver(F, 1, 2, 1e-12)
+    warm = solver(F, 1, 2, 1e-3, resume=previous)
+    np.testing.assert_array_equal(warm.history.array, solver(F, 1, 2, 1e-3).history.array)
+
+
+def test_newton_warm_start_matches_cold():
+    df = lambda x: 3 * x * x - 9.6 * x + 6.57
+    previous = newton(F, df, 2.0, 1e-4)
+    for tol in (1e-2, 1e-12):
+        warm = newton(F, df, 2.0, tol, resume=previous)
+        np.testing.assert_array_equal(warm.history.array, newton(F, df, 2.0, tol).history.array)
@@ -0,0 +1,9 @@
+import pytest
+
+
+def test_yanose_is_the_ahg_application():
+    pytest.importorskip('tkinter')
+    import ahg
+    import yanose
+    assert yanose.RootFinderApp is ahg.RootFinderApp
+    assert yanose.parse_equation is ahg.parse_equation